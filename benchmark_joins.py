@@ -0,0 +1,248 @@
+"""
+Fan-Out Join Benchmark
+Checks the pre-aggregated trainer performance (QUERY 2) and user engagement
+(QUERY 8) queries in fitness_queries.sql, and fitness.py's QUERY2_SQL,
+against per-table aggregates, and
+times them against the original single LEFT JOIN chain, whose intermediate
+result grows with the product of each parent's child rows.
+Runs on a synthetic in-memory SQLite copy of the relevant tables; the FK
+columns are indexed as InnoDB would index them.
+Usage: python benchmark_joins.py [users] [max_children_per_parent]
+"""
+
+import os
+import sqlite3
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+# fitness_queries.sql and fitness.py are parsed by the shared query catalog
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "dma_python_application"))
+from query_catalog import analytics_queries, sql_file_queries  # noqa: E402
+
+TRAINERS = 50
+
+# Original query texts: one LEFT JOIN chain over every child table
+FANOUT_TRAINER_SQL = """
+SELECT
+    t.trainer_id,
+    t.full_name AS trainer_name,
+    t.specialization,
+    t.experience_years,
+    t.rating AS overall_rating,
+    c.certification_name,
+    c.issued_by,
+    COUNT(DISTINCT cl.class_id) AS total_classes,
+    COUNT(DISTINCT f.feedback_id) AS feedback_count,
+    AVG(f.rating) AS avg_feedback_rating,
+    SUM(cl.max_participants) AS total_capacity
+FROM Trainers t
+LEFT JOIN Certifications c ON t.certification_id = c.certification_id
+LEFT JOIN Classes cl ON t.trainer_id = cl.trainer_id
+LEFT JOIN Feedback f ON t.trainer_id = f.trainer_id
+GROUP BY t.trainer_id, t.full_name, t.specialization, t.experience_years,
+         t.rating, c.certification_name, c.issued_by
+HAVING total_classes > 0
+ORDER BY avg_feedback_rating DESC, total_classes DESC;
+"""
+
+FANOUT_ENGAGEMENT_SQL = """
+SELECT
+    u.user_id,
+    u.full_name,
+    u.email,
+    COUNT(DISTINCT uc.class_id) AS classes_enrolled,
+    SUM(CASE WHEN uc.attendance_status = 'Attended' THEN 1 ELSE 0 END) AS classes_attended,
+    COUNT(DISTINCT p.payment_id) AS total_payments,
+    SUM(CASE WHEN p.status = 'Completed' THEN 1 ELSE 0 END) AS successful_payments,
+    COUNT(DISTINCT pt.progress_id) AS progress_entries,
+    COUNT(DISTINCT d.device_id) AS synced_devices,
+    (COUNT(DISTINCT uc.class_id) * 2 +
+     SUM(CASE WHEN uc.attendance_status = 'Attended' THEN 1 ELSE 0 END) * 5 +
+     COUNT(DISTINCT pt.progress_id) * 3 +
+     COUNT(DISTINCT d.device_id) * 2) AS engagement_score
+FROM Users u
+LEFT JOIN User_Class uc ON u.user_id = uc.user_id
+LEFT JOIN Payments p ON u.user_id = p.user_id
+LEFT JOIN Progress_Tracking pt ON u.user_id = pt.user_id
+LEFT JOIN Devices d ON u.user_id = d.user_id
+GROUP BY u.user_id, u.full_name, u.email
+ORDER BY engagement_score DESC
+LIMIT 20;
+"""
+
+FK_INDEXES = [
+    ("Classes", "trainer_id"), ("Feedback", "trainer_id"), ("User_Class", "user_id"),
+    ("Payments", "user_id"), ("Progress_Tracking", "user_id"), ("Devices", "user_id"),
+]
+
+def load_query(number):
+    """SQL text of one numbered query in fitness_queries.sql"""
+    return next(sql for name, sql in sql_file_queries() if name.startswith(f"QUERY {number}:"))
+
+def load_analytics_query(name):
+    """SQL text of one QUERYn_SQL constant in fitness.py, read without importing it"""
+    return dict(analytics_queries())[f"fitness.py {name}"]
+
+def make_tables(users, children, seed=14):
+    """Synthetic fact tables where every parent has 1..children rows per child table"""
+    rng = np.random.default_rng(seed)
+    user_ids = np.arange(1, users + 1)
+    classes_total = max(children * 4, TRAINERS)
+
+    def per_user(high):
+        counts = rng.integers(1, high + 1, users)
+        return np.repeat(user_ids, counts), counts
+
+    tables = {
+        "Trainers": pd.DataFrame({
+            "trainer_id": np.arange(1, TRAINERS + 1),
+            "full_name": [f"Trainer {i}" for i in range(1, TRAINERS + 1)],
+            "specialization": rng.choice(["Yoga", "HIIT", "Strength", "Pilates"], TRAINERS),
+            "experience_years": rng.integers(1, 20, TRAINERS).astype(float),
+            "certification_id": np.arange(1, TRAINERS + 1),
+            "rating": rng.integers(30, 51, TRAINERS) / 10,
+        }),
+        "Certifications": pd.DataFrame({
+            "certification_id": np.arange(1, TRAINERS + 1),
+            "trainer_id": np.arange(1, TRAINERS + 1),
+            "certification_name": "Certified Trainer",
+            "issued_by": "ACE",
+        }),
+        "Classes": pd.DataFrame({
+            "class_id": np.arange(1, classes_total + 1),
+            "trainer_id": rng.integers(1, TRAINERS + 1, classes_total),
+            "max_participants": rng.integers(5, 40, classes_total),
+        }),
+        "Users": pd.DataFrame({
+            "user_id": user_ids,
+            "full_name": [f"User {i}" for i in user_ids],
+            "email": [f"user{i}@levelup.fit" for i in user_ids],
+        }),
+    }
+
+    # (user_id, class_id) is the User_Class key: consecutive distinct classes per user
+    enrolled, counts = per_user(children)
+    offsets = np.arange(len(enrolled)) - np.repeat(np.cumsum(counts) - counts, counts)
+    tables["User_Class"] = pd.DataFrame({
+        "user_id": enrolled,
+        "class_id": (enrolled * 7 + offsets) % classes_total + 1,
+        "attendance_status": rng.choice(["Attended", "Missed", "Registered"], len(enrolled)),
+    })
+    paid, _ = per_user(children)
+    tables["Payments"] = pd.DataFrame({
+        "payment_id": np.arange(1, len(paid) + 1), "user_id": paid,
+        "status": rng.choice(["Completed", "Failed", "Pending"], len(paid)),
+    })
+    tracked, _ = per_user(children)
+    tables["Progress_Tracking"] = pd.DataFrame({"progress_id": np.arange(1, len(tracked) + 1), "user_id": tracked})
+    synced, _ = per_user(max(children // 4, 1))
+    tables["Devices"] = pd.DataFrame({"device_id": np.arange(1, len(synced) + 1), "user_id": synced})
+    reviewed, _ = per_user(children)
+    tables["Feedback"] = pd.DataFrame({
+        "feedback_id": np.arange(1, len(reviewed) + 1),
+        "trainer_id": rng.integers(1, TRAINERS + 1, len(reviewed)),
+        "rating": rng.integers(10, 51, len(reviewed)) / 10,
+    })
+    return tables
+
+def expected_engagement(tables):
+    """Engagement metrics computed table by table in pandas"""
+    uc, pay = tables["User_Class"], tables["Payments"]
+    expected = pd.DataFrame({
+        "classes_enrolled": uc.groupby("user_id").size(),
+        "classes_attended": (uc["attendance_status"] == "Attended").groupby(uc["user_id"]).sum(),
+        "total_payments": pay.groupby("user_id").size(),
+        "successful_payments": (pay["status"] == "Completed").groupby(pay["user_id"]).sum(),
+        "progress_entries": tables["Progress_Tracking"].groupby("user_id").size(),
+        "synced_devices": tables["Devices"].groupby("user_id").size(),
+    }).reindex(tables["Users"]["user_id"]).fillna(0).astype(int)
+    expected["engagement_score"] = (expected["classes_enrolled"] * 2 + expected["classes_attended"] * 5 +
+                                    expected["progress_entries"] * 3 + expected["synced_devices"] * 2)
+    return expected
+
+def expected_trainers(tables):
+    """Trainer metrics computed table by table in pandas"""
+    classes, feedback = tables["Classes"], tables["Feedback"]
+    # A trainer without feedback has a count of 0 and no average
+    return pd.DataFrame({
+        "total_classes": classes.groupby("trainer_id").size(),
+        "total_capacity": classes.groupby("trainer_id")["max_participants"].sum(),
+        "feedback_count": feedback.groupby("trainer_id").size(),
+        "avg_feedback_rating": feedback.groupby("trainer_id")["rating"].mean(),
+    }).dropna(subset=["total_classes"]).fillna({"feedback_count": 0})
+
+def wrong_rows(result, expected, key, columns):
+    """Result rows whose metrics differ from the per-table aggregates"""
+    merged = result.merge(expected[columns], left_on=key, right_index=True, suffixes=("", "_expected"))
+    differs = np.zeros(len(merged), dtype=bool)
+    for column in columns:
+        differs |= ~np.isclose(merged[column].astype(float), merged[f"{column}_expected"].astype(float),
+                               equal_nan=True)
+    return int(differs.sum())
+
+def wrong_top(result, expected, column):
+    """1 when a LIMITed result does not hold the true top values of column, else 0"""
+    top = expected[column].nlargest(len(result)).to_numpy(dtype=float)
+    found = np.sort(result[column].dropna().to_numpy(dtype=float))[::-1]
+    return int(len(found) != len(top) or not np.allclose(found, top))
+
+def timed(connection, sql):
+    start = time.perf_counter()
+    df = pd.read_sql_query(sql, connection)
+    return time.perf_counter() - start, df
+
+# ============================================
+# MAIN EXECUTION
+# ============================================
+if __name__ == "__main__":
+    users = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    max_children = int(sys.argv[2]) if len(sys.argv) > 2 else 16
+
+    # (label, fan-out SQL, pre-aggregated SQL, reference, key, compared columns, LIMIT order column)
+    checks = [
+        ("QUERY 2 trainers", FANOUT_TRAINER_SQL, load_query(2), expected_trainers, "trainer_id",
+         ["total_classes", "feedback_count", "avg_feedback_rating", "total_capacity"], None),
+        ("fitness.py QUERY2", FANOUT_TRAINER_SQL, load_analytics_query("QUERY2_SQL"), expected_trainers, "trainer_id",
+         ["total_classes", "feedback_count", "avg_feedback_rating"], "avg_feedback_rating"),
+        ("QUERY 8 engagement", FANOUT_ENGAGEMENT_SQL, load_query(8), expected_engagement, "user_id",
+         ["classes_enrolled", "classes_attended", "total_payments", "successful_payments",
+          "progress_entries", "synced_devices", "engagement_score"], "engagement_score"),
+    ]
+
+    print("="*78)
+    print(f"FAN-OUT JOIN BENCHMARK: {users} users, up to N child rows per parent and table")
+    print("="*78)
+    print(f"{'query':<20} {'N':>4} {'fan-out ms':>12} {'wrong':>6} {'pre-agg ms':>12} {'wrong':>6} {'speedup':>8}")
+
+    failures = 0
+    children = 2
+    while children <= max_children:
+        tables = make_tables(users, children)
+        connection = sqlite3.connect(":memory:")
+        for name, df in tables.items():
+            df.to_sql(name, connection, index=False)
+        for table, column in FK_INDEXES:
+            connection.execute(f"CREATE INDEX idx_{table}_{column} ON {table} ({column})")
+
+        for label, fanout_sql, sql, expected, key, columns, top_column in checks:
+            reference = expected(tables)
+            fanout_time, fanout_df = timed(connection, fanout_sql)
+            fast_time, fast_df = timed(connection, sql)
+            fanout_wrong = wrong_rows(fanout_df, reference, key, columns)
+            fast_wrong = wrong_rows(fast_df, reference, key, columns)
+            if top_column:
+                # The LIMIT must pick the true top values
+                fast_wrong += wrong_top(fast_df, reference, top_column)
+            failures += fast_wrong
+            print(f"{label:<20} {children:>4} {fanout_time * 1000:>12.1f} {fanout_wrong:>6} "
+                  f"{fast_time * 1000:>12.1f} {fast_wrong:>6} {fanout_time / fast_time:>7.1f}x")
+        connection.close()
+        children *= 2
+
+    if failures:
+        print(f"\n❌ Pre-aggregated queries returned {failures} wrong rows")
+        sys.exit(1)
+    print("\n✅ Pre-aggregated queries match the per-table aggregates at every scale")
@@ -0,0 +1,70 @@
+"""
+SQL Parser Micro-Benchmark
+Times the original character-by-character parse_values path against the
+precompiled single-pass tokenizer of SQLToMongoDBParser on one SQL file
+Usage: python benchmark_parser.py [sql_file] [repeat]
+"""
+
+import os
+import re
+import sys
+import time
+
+from fitness_json import SQLToMongoDBParser, STATEMENT_PATTERN
+
+PROJECT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+def legacy_parse(parser, content):
+    """Original path: regex split, three re.search calls and parse_values per statement"""
+    rows = []
+    for statement in re.findall(r'INSERT INTO[^;]+;', content, re.IGNORECASE | re.DOTALL):
+        table_name, row_data = parser.parse_insert_statement(statement)
+        if table_name and row_data:
+            rows.append((table_name, row_data))
+    return rows
+
+def fast_parse(parser, content):
+    """Tokenizer path: one INSERT_PATTERN match and one findall per statement"""
+    rows = []
+    for statement in STATEMENT_PATTERN.findall(content):
+        table_name, table_rows = parser.parse_insert_rows(statement)
+        rows.extend((table_name, row_data) for row_data in table_rows)
+    return rows
+
+def best_time(parse, parser, content, repeat):
+    """Best wall time of repeat runs, and the rows of the last run"""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        rows = parse(parser, content)
+        best = min(best, time.perf_counter() - start)
+    return best, rows
+
+# ============================================
+# MAIN EXECUTION
+# ============================================
+if __name__ == "__main__":
+    sql_file = sys.argv[1] if len(sys.argv) > 1 else os.path.join(PROJECT_DIR, "fitness_dml_insert.sql")
+    repeat = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+
+    with open(sql_file, 'r', encoding='utf-8') as f:
+        content = f.read()
+    parser = SQLToMongoDBParser(sql_file)
+
+    print("="*70)
+    print(f"SQL PARSER BENCHMARK: {sql_file} (best of {repeat})")
+    print("="*70)
+
+    legacy_time, legacy_rows = best_time(legacy_parse, parser, content, repeat)
+    fast_time, fast_rows = best_time(fast_parse, parser, content, repeat)
+
+    for name, elapsed, rows in [("parse_values", legacy_time, legacy_rows),
+                                ("tokenizer", fast_time, fast_rows)]:
+        print(f"{name:<14} {len(rows):>8} rows  {elapsed * 1000:>9.2f} ms  {len(rows) / elapsed:>12,.0f} rows/sec")
+
+    print(f"\n✅ Speedup: {legacy_time / fast_time:.1f}x")
+    if len(legacy_rows) == len(fast_rows):
+        differing = sum(1 for old, new in zip(legacy_rows, fast_rows) if old != new)
+        print(f"Rows parsed differently: {differing} (parse_values splits strings on unescaped quotes)")
+    else:
+        print(f"Row counts differ: parse_values cannot read multi-row INSERT statements")
@@ -0,0 +1,208 @@
+"""
+Query Workload Benchmark
+Generates the dataset at several scales with dml_generation.py (numpy backend,
+CSV load files), bulk loads each one into an in-process DuckDB snapshot (see
+fitness_duckdb.py) and runs every fitness.py query and the 15 queries in
+fitness_queries.sql: warm-up runs first, then p50/p95 latency, rows scanned
+and memory allocated from DuckDB's profiler. Results are written to JSON;
+pass an earlier results file with --baseline to flag queries that got slower.
+Usage: python benchmark_queries.py [--scales 1 100 10000] [--runs N] [--warmup N] [--output FILE] [--baseline FILE]
+"""
+
+import json
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+import duckdb
+import numpy as np
+
+from dml_generation import TABLE_COLUMNS, TABLES, resolve_row_counts, write_load_files
+from fitness_duckdb import (SNAPSHOT_SUMMARIES, analytics_queries, create_tables, install_mysql_compat,
+                            load_column_types, sql_file_queries)
+from fitness_json import load_schema
+
+DEFAULT_SCALES = [1, 100, 10000]
+DEFAULT_OUTPUT = "benchmark_queries.json"
+# Smaller p50 changes are timer noise at the 1x scale, whatever the ratio
+MIN_REGRESSION_MS = 2.0
+
+def generate_dataset(directory, scale, seed):
+    """CSV load files for every table at scale x the default row counts; returns the row count"""
+    stats, _ = write_load_files(directory, resolve_row_counts(scale=scale), fmt="csv", seed=seed, backend="numpy")
+    return stats["rows"]
+
+def stage_csv(con, directory, table):
+    """Read one generated CSV file into the staging table, keeping file order in rowid"""
+    names = ", ".join(f"'{column}'" for column in TABLE_COLUMNS[table])
+    path = os.path.join(directory, f"{table}.csv").replace("'", "''")
+    con.execute(f"""
+        CREATE OR REPLACE TEMP TABLE staging AS
+        SELECT * FROM read_csv('{path}', header = false, names = [{names}], all_varchar = true,
+                               nullstr = '\\N', quote = '"', escape = '"')
+    """)
+
+def load_dataset(con, directory):
+    """Load the generated CSV files the way load_data.sql would into MySQL.
+
+    The files leave out AUTO_INCREMENT ids, so the file line number becomes
+    the id, exactly as MySQL assigns them on an empty table.
+    """
+    column_types = load_column_types()
+    schema = load_schema()
+    create_tables(con, column_types)
+    for table, columns, _ in TABLES:
+        stage_csv(con, directory, table)
+        primary_key = schema[table.lower()]["primary_key"]
+        id_column = f"rowid + 1 AS {primary_key[0]}, " if len(primary_key) == 1 and primary_key[0] not in columns else ""
+        con.execute(f'INSERT INTO "{table.lower()}" BY NAME SELECT {id_column}* FROM staging')
+        if table == "Certifications":
+            stage_csv(con, directory, "Trainer_Certification")
+            con.execute("""
+                UPDATE trainers SET certification_id = CAST(staging.certification_id AS INTEGER)
+                FROM staging WHERE trainers.trainer_id = CAST(staging.trainer_id AS INTEGER)
+            """)
+    con.execute("DROP TABLE staging")
+    for sql in SNAPSHOT_SUMMARIES:
+        con.execute(sql)
+
+def last_profile(con):
+    """(rows scanned, bytes of memory allocated) of the last statement run"""
+    profile = json.loads(con.get_profiling_information(format="json"))
+    return profile.get("cumulative_rows_scanned"), profile.get("total_memory_allocated")
+
+def benchmark_query(con, sql, runs, warmup):
+    """Warm up, then time runs executions; latency percentiles plus profiler counters"""
+    sql = sql.strip().rstrip(";")
+    for _ in range(warmup):
+        con.execute(sql).fetchall()
+    times = []
+    rows_scanned = memory_allocated = 0
+    for _ in range(runs):
+        start = time.perf_counter()
+        rows = con.execute(sql).fetchall()
+        times.append(time.perf_counter() - start)
+        scanned, memory = last_profile(con)
+        rows_scanned = scanned or rows_scanned
+        memory_allocated = max(memory_allocated, memory or 0)
+    p50, p95 = np.percentile(times, [50, 95]) * 1000
+    return {
+        "p50_ms": round(float(p50), 3),
+        "p95_ms": round(float(p95), 3),
+        "min_ms": round(min(times) * 1000, 3),
+        "rows_returned": len(rows),
+        "rows_scanned": rows_scanned,
+        "memory_allocated_bytes": memory_allocated,
+    }
+
+def benchmark_scale(scale, queries, runs, warmup, seed):
+    """Generate, load and benchmark one scale; returns its results dict"""
+    with tempfile.TemporaryDirectory(prefix="fitness_bench_") as directory:
+        start = time.perf_counter()
+        rows = generate_dataset(directory, scale, seed)
+        generate_seconds = time.perf_counter() - start
+
+        con = duckdb.connect()
+        start = time.perf_counter()
+        load_dataset(con, directory)
+        load_seconds = time.perf_counter() - start
+
+    install_mysql_compat(con)
+    con.execute("SET enable_profiling = 'no_output'")
+    con.execute("SET profiling_mode = 'detailed'")
+    results = {
+        "rows_loaded": rows,
+        "generate_seconds": round(generate_seconds, 3),
+        "load_seconds": round(load_seconds, 3),
+        "queries": {},
+    }
+    for name, sql in queries:
+        try:
+            results["queries"][name] = benchmark_query(con, sql, runs, warmup)
+        except duckdb.Error as e:
+            results["queries"][name] = {"error": str(e).splitlines()[0]}
+    con.close()
+    return results
+
+def regressions(results, baseline, tolerance):
+    """(scale, query, old p50, new p50) for every query whose p50 grew more than tolerance x
+    (and by at least MIN_REGRESSION_MS)"""
+    slower = []
+    for scale, scale_results in results["scales"].items():
+        old_queries = baseline.get("scales", {}).get(scale, {}).get("queries", {})
+        for name, metrics in scale_results["queries"].items():
+            old = old_queries.get(name, {})
+            if "p50_ms" not in metrics or "p50_ms" not in old:
+                continue
+            if metrics["p50_ms"] > old["p50_ms"] * tolerance and metrics["p50_ms"] - old["p50_ms"] >= MIN_REGRESSION_MS:
+                slower.append((scale, name, old["p50_ms"], metrics["p50_ms"]))
+    return slower
+
+# ============================================
+# MAIN EXECUTION
+# ============================================
+if __name__ == "__main__":
+    import argparse
+
+    arg_parser = argparse.ArgumentParser(description="Benchmark the analytics queries across data scales")
+    arg_parser.add_argument("--scales", type=float, nargs="+", default=DEFAULT_SCALES,
+                            help="Multiples of the default 30 rows per table (default 1 100 10000)")
+    arg_parser.add_argument("--runs", type=int, default=10, help="Timed runs per query (default 10)")
+    arg_parser.add_argument("--warmup", type=int, default=2, help="Untimed runs per query first (default 2)")
+    arg_parser.add_argument("--seed", type=int, default=42, help="Generator seed, fixed so runs compare")
+    arg_parser.add_argument("-o", "--output", default=DEFAULT_OUTPUT, help=f"Results file (default {DEFAULT_OUTPUT})")
+    arg_parser.add_argument("--baseline", help="Earlier results file to compare p50 latency against")
+    arg_parser.add_argument("--tolerance", type=float, default=1.25,
+                            help="p50 growth over the baseline counted as a regression (default 1.25x)")
+    args = arg_parser.parse_args()
+
+    queries = analytics_queries() + sql_file_queries()
+    results = {
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "engine": f"duckdb {duckdb.__version__}",
+        "runs": args.runs,
+        "warmup": args.warmup,
+        "seed": args.seed,
+        "scales": {},
+    }
+
+    for scale in args.scales:
+        label = f"{scale:g}x"
+        print("=" * 100)
+        print(f"SCALE {label}")
+        print("=" * 100)
+        scale_results = benchmark_scale(scale, queries, args.runs, args.warmup, args.seed)
+        results["scales"][label] = scale_results
+        print(f"{scale_results['rows_loaded']:,} rows generated in {scale_results['generate_seconds']:.2f}s, "
+              f"loaded in {scale_results['load_seconds']:.2f}s")
+        print(f"{'query':<60} {'p50 ms':>9} {'p95 ms':>9} {'rows':>8} {'scanned':>11} {'alloc MB':>8}")
+        for name, metrics in scale_results["queries"].items():
+            if "error" in metrics:
+                print(f"❌ {name[:57]:<57} {metrics['error']}")
+                continue
+            print(f"{name[:60]:<60} {metrics['p50_ms']:>9.2f} {metrics['p95_ms']:>9.2f} "
+                  f"{metrics['rows_returned']:>8} {metrics['rows_scanned']:>11,} "
+                  f"{metrics['memory_allocated_bytes'] / 1e6:>8.1f}")
+
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(results, f, indent=2)
+    print(f"\n✅ Results written to {args.output}")
+
+    failed = sum(1 for scale_results in results["scales"].values()
+                 for metrics in scale_results["queries"].values() if "error" in metrics)
+    if failed:
+        print(f"❌ {failed} query runs failed")
+
+    slower = []
+    if args.baseline:
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            slower = regressions(results, json.load(f), args.tolerance)
+        for scale, name, old, new in slower:
+            print(f"❌ {scale} {name}: p50 {old:.2f} ms -> {new:.2f} ms")
+        if not slower:
+            print(f"✅ No query slower than {args.tolerance:g}x its baseline p50")
+
+    if failed or slower:
+        sys.exit(1)
@@ -0,0 +1,143 @@
+"""
+LEVEL UP - Fitness Tracking Platform
+Pooled MySQL connection layer shared by the analytics and any service code
+Configured from the environment:
+    FITNESS_DB_HOST, FITNESS_DB_PORT, FITNESS_DB_NAME, FITNESS_DB_USER,
+    FITNESS_DB_PASSWORD, FITNESS_DB_POOL_SIZE, FITNESS_DB_POOL_TIMEOUT
+"""
+
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+import pandas as pd
+from mysql.connector import Error
+from mysql.connector.errors import PoolError
+from mysql.connector.pooling import MySQLConnectionPool
+
+from instrumentation import query_span
+
+# Connection settings (password comes only from the environment)
+DB_CONFIG = {
+    'host': os.environ.get('FITNESS_DB_HOST', 'localhost'),
+    'port': int(os.environ.get('FITNESS_DB_PORT', '3306')),
+    'database': os.environ.get('FITNESS_DB_NAME', 'fitness'),
+    'user': os.environ.get('FITNESS_DB_USER', 'root'),
+    'password': os.environ.get('FITNESS_DB_PASSWORD', ''),
+    'auth_plugin': 'mysql_native_password',
+}
+POOL_SIZE = int(os.environ.get('FITNESS_DB_POOL_SIZE', '5'))
+# Seconds to wait for a free connection before giving up
+POOL_TIMEOUT = float(os.environ.get('FITNESS_DB_POOL_TIMEOUT', '30'))
+
+_pool = None
+_pool_lock = threading.Lock()
+
+# One entry per read_sql call: {"label", "seconds", "rows"}
+QUERY_TIMINGS = []
+
+
+def get_pool():
+    """Create the connection pool on first use"""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = MySQLConnectionPool(pool_name='fitness_pool', pool_size=POOL_SIZE,
+                                        pool_reset_session=True, **DB_CONFIG)
+        return _pool
+
+
+def checkout(timeout=POOL_TIMEOUT):
+    """Take a live connection from the pool, waiting while all are in use.
+
+    The connection is pinged (and reconnected if the server dropped it)
+    before it is handed out. close() returns it to the pool.
+    """
+    pool = get_pool()
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            connection = pool.get_connection()
+            break
+        except PoolError:
+            if time.monotonic() >= deadline:
+                raise
+            time.sleep(0.05)
+
+    try:
+        connection.ping(reconnect=True, attempts=2, delay=0)
+    except Error:
+        connection.close()
+        raise
+    return connection
+
+
+@contextmanager
+def pooled_connection(timeout=POOL_TIMEOUT):
+    """with pooled_connection() as connection: ... - returned to the pool on exit"""
+    connection = checkout(timeout)
+    try:
+        yield connection
+    finally:
+        connection.close()
+
+
+def read_sql(sql_query, connection=None, params=None, label=None):
+    """Run a query into a DataFrame and record how long it took
+    (see instrumentation.query_span for what else is recorded).
+
+    Uses the given connection, or borrows one from the pool for this query.
+    """
+    if connection is None:
+        with pooled_connection() as pooled:
+            return read_sql(sql_query, pooled, params, label)
+
+    with query_span(label, sql_query, connection, params) as span:
+        df = pd.read_sql_query(sql_query, connection, params=params)
+        span['rows'] = len(df)
+
+    QUERY_TIMINGS.append({"label": label or sql_query.split()[0], "seconds": span['seconds'], "rows": len(df)})
+    print(f"⏱ {label or 'query'}: {span['seconds'] * 1000:.1f} ms ({len(df)} rows)")
+    return df
+
+
+def iter_sql_chunks(sql_query, params=None, chunksize=10000, label=None, timeout=POOL_TIMEOUT):
+    """Stream a query as DataFrames of at most chunksize rows.
+
+    Uses an unbuffered cursor on its own pooled connection, so the server
+    sends rows as they are fetched and only one chunk is held client-side.
+    The timing is recorded once the last chunk has been read.
+    """
+    with pooled_connection(timeout) as connection, \
+            query_span(label, sql_query, connection, params) as span:
+        cursor = connection.cursor(buffered=False)
+        try:
+            cursor.execute(sql_query, params)
+            columns = cursor.column_names
+            while True:
+                batch = cursor.fetchmany(chunksize)
+                if not batch:
+                    break
+                span['rows'] += len(batch)
+                yield pd.DataFrame.from_records(batch, columns=columns)
+        finally:
+            # A consumer that stops early leaves rows on the wire; drain them
+            # so the connection goes back to the pool usable
+            if connection.unread_result:
+                connection.consume_results()
+            cursor.close()
+
+    QUERY_TIMINGS.append({"label": label or sql_query.split()[0], "seconds": span['seconds'], "rows": span['rows']})
+    print(f"⏱ {label or 'query'}: {span['seconds'] * 1000:.1f} ms ({span['rows']} rows streamed)")
+
+
+def print_query_timings():
+    """Summary of every query run through read_sql"""
+    if not QUERY_TIMINGS:
+        return
+    print(" Query Timings:")
+    for timing in QUERY_TIMINGS:
+        print(f"   {timing['label']:<30} {timing['seconds'] * 1000:>9.1f} ms  {timing['rows']:>8} rows")
+    print(f"   {'Total':<30} {sum(t['seconds'] for t in QUERY_TIMINGS) * 1000:>9.1f} ms")
+    print()
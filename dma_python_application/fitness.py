@@ -4,64 +4,99 @@ Python Application for Database Analytics
 Group 14: Rutvij Surti & Kush Patel
 """
 
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+
 import pandas as pd
-import mysql.connector
 from mysql.connector import Error
 import matplotlib.pyplot as plt
 import seaborn as sns
 import numpy as np
 
+import instrumentation
+import result_cache
+from db_pool import iter_sql_chunks, print_query_timings
+from instrumentation import (analysis_name, instrumented, merge_events, phase, print_phase_timings,
+                             run_collecting)
+from result_cache import cached_read_sql
+from summary_tables import refresh_summary
+
 # Set style for better visualizations
 plt.style.use('seaborn-v0_8-darkgrid')
 sns.set_palette("husl")
 
-# Database connection function
-def create_connection():
-    """Connect to MySQL database"""
-    try:
-        connection = mysql.connector.connect(
-            host='localhost',
-            database='fitness',
-            user='root',
-            password='kushp9819',
-            auth_plugin='mysql_native_password'
-        )
-        
-        if connection.is_connected():
-            cursor = connection.cursor()
-            cursor.execute("select database();")
-            record = cursor.fetchone()
-            print("✓ Connected to database:", record[0])
-            print()
-            return connection
-            
-    except Error as e:
-        print("✗ Error connecting to MySQL:", e)
-        return None
+# Chart render modes: none skips rasterization, preview is a quick low-res
+# draft, full is print quality (shadows, tight bounding box, 300 dpi)
+RENDER_MODES = {
+    'none': None,
+    'preview': {'dpi': 72, 'bbox_inches': None, 'shadow': False},
+    'full': {'dpi': 300, 'bbox_inches': 'tight', 'shadow': True},
+}
 
+# Writers for exporting the aggregated DataFrames instead of (or alongside) charts
+EXPORT_FORMATS = {
+    'parquet': lambda df, path: df.to_parquet(path, index=False),
+    'csv': lambda df, path: df.to_csv(path, index=False),
+    'json': lambda df, path: df.to_json(path, orient='records', date_format='iso', indent=2),
+}
 
-# QUERY 1: Subscription Revenue Analysis
-def query1_subscription_revenue(connection):
-    print("=" * 75)
-    print("QUERY 1: SUBSCRIPTION REVENUE ANALYSIS")
-    print("=" * 75)
-    
-    sql_query = """
+
+def save_figure(filename, render_mode='full'):
+    """Save and close the current figure at the render mode's quality"""
+    settings = RENDER_MODES[render_mode]
+    with phase('savefig'):
+        plt.savefig(filename, dpi=settings['dpi'], bbox_inches=settings['bbox_inches'])
+    plt.close()
+    return filename
+
+
+def export_frame(df, name, export_format):
+    """Write an analysis DataFrame as <name>.<format>; returns the file name"""
+    filename = f"{name}.{export_format}"
+    EXPORT_FORMATS[export_format](df, filename)
+    return filename
+
+
+# QUERY 1: Subscription Revenue Analysis (from the revenue summary tables)
+QUERY1_SQL = """
     SELECT 
         s.subscription_id,
         s.plan_name,
         s.price AS plan_price,
-        COUNT(DISTINCT p.user_id) AS total_subscribers,
-        SUM(CASE WHEN p.status = 'Completed' THEN p.amount ELSE 0 END) AS total_revenue
+        COALESCE(subscribers.total_subscribers, 0) AS total_subscribers,
+        revenue.total_revenue
     FROM Subscriptions s
-    LEFT JOIN Payments p ON s.subscription_id = p.subscription_id
-    GROUP BY s.subscription_id, s.plan_name, s.price
-    HAVING total_revenue > 0
+    INNER JOIN (
+        SELECT subscription_id, SUM(completed_revenue) AS total_revenue
+        FROM Revenue_Daily_Summary
+        GROUP BY subscription_id
+    ) revenue ON s.subscription_id = revenue.subscription_id
+    LEFT JOIN (
+        SELECT subscription_id, COUNT(*) AS total_subscribers
+        FROM Subscription_Subscribers
+        GROUP BY subscription_id
+    ) subscribers ON s.subscription_id = subscribers.subscription_id
+    WHERE revenue.total_revenue > 0
     ORDER BY total_revenue DESC
     LIMIT 10;
-    """
-    
-    df = pd.read_sql_query(sql_query, connection)
+"""
+
+
+@instrumented('fetch')
+def fetch_query1(connection=None):
+    """Bring the revenue summary up to date, then run query 1 (through the
+    result cache); uses a pooled connection when none is given"""
+    refresh_summary('revenue', connection)
+    df = cached_read_sql(QUERY1_SQL, connection, label="query1_subscription_revenue")
+    return df
+
+
+@instrumented('summarize')
+def summarize_query1(df):
+    print("=" * 75)
+    print("QUERY 1: SUBSCRIPTION REVENUE ANALYSIS")
+    print("=" * 75)
     print(df)
     print()
     
@@ -72,7 +107,11 @@ def query1_subscription_revenue(connection):
     print(f"   Total Subscribers: {df['total_subscribers'].sum()}")
     print(f"   Most Popular Plan: {df.iloc[0]['plan_name']}")
     print()
-    
+
+
+@instrumented('render')
+def plot_query1(df, render_mode='full'):
+    """Render the query 1 charts; returns the image file name"""
     # Create figure with two subplots
     fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(16, 6))
     
@@ -99,40 +138,53 @@ def query1_subscription_revenue(connection):
     
     ax2.pie(df['total_revenue'].head(5), labels=df['plan_name'].head(5), 
             autopct='%1.1f%%', startangle=90, colors=colors_pie,
-            explode=explode, shadow=True, textprops={'fontsize': 10, 'fontweight': 'bold'})
+            explode=explode, shadow=RENDER_MODES[render_mode]['shadow'], textprops={'fontsize': 10, 'fontweight': 'bold'})
     ax2.set_title('Revenue Distribution - Top 5 Plans', fontsize=14, fontweight='bold', pad=15)
     
     plt.tight_layout()
-    plt.savefig('query1_revenue_analysis.png', dpi=300, bbox_inches='tight')
-    print("✓ Saved: query1_revenue_analysis.png\n")
-    plt.close()
+    return save_figure('query1_revenue_analysis.png', render_mode)
 
 
 # QUERY 2: Trainer Performance Analysis
-def query2_trainer_performance(connection):
-    print("=" * 75)
-    print("QUERY 2: TRAINER PERFORMANCE ANALYSIS")
-    print("=" * 75)
-    
-    sql_query = """
+# Classes and Feedback are aggregated per trainer before joining, so the
+# join never builds the classes x feedback product for each trainer
+QUERY2_SQL = """
     SELECT 
         t.trainer_id,
         t.full_name AS trainer_name,
         t.specialization,
         t.rating AS overall_rating,
-        COUNT(DISTINCT cl.class_id) AS total_classes,
-        COUNT(DISTINCT f.feedback_id) AS feedback_count,
-        AVG(f.rating) AS avg_feedback_rating
+        cl.total_classes,
+        COALESCE(f.feedback_count, 0) AS feedback_count,
+        f.avg_feedback_rating
     FROM Trainers t
-    LEFT JOIN Classes cl ON t.trainer_id = cl.trainer_id
-    LEFT JOIN Feedback f ON t.trainer_id = f.trainer_id
-    GROUP BY t.trainer_id, t.full_name, t.specialization, t.rating
-    HAVING total_classes > 0
+    INNER JOIN (
+        SELECT trainer_id, COUNT(*) AS total_classes
+        FROM Classes
+        GROUP BY trainer_id
+    ) cl ON t.trainer_id = cl.trainer_id
+    LEFT JOIN (
+        SELECT trainer_id, COUNT(*) AS feedback_count, AVG(rating) AS avg_feedback_rating
+        FROM Feedback
+        GROUP BY trainer_id
+    ) f ON t.trainer_id = f.trainer_id
     ORDER BY avg_feedback_rating DESC
     LIMIT 12;
-    """
-    
-    df = pd.read_sql_query(sql_query, connection)
+"""
+
+
+@instrumented('fetch')
+def fetch_query2(connection=None):
+    """Run query 2 (through the result cache); uses a pooled connection when none is given"""
+    df = cached_read_sql(QUERY2_SQL, connection, label="query2_trainer_performance")
+    return df
+
+
+@instrumented('summarize')
+def summarize_query2(df):
+    print("=" * 75)
+    print("QUERY 2: TRAINER PERFORMANCE ANALYSIS")
+    print("=" * 75)
     print(df)
     print()
     
@@ -143,7 +195,11 @@ def query2_trainer_performance(connection):
     print(f"   Average Feedback Rating: {df['avg_feedback_rating'].mean():.2f}/5.0")
     print(f"   Top Trainer: {df.iloc[0]['trainer_name']} ({df.iloc[0]['avg_feedback_rating']:.2f})")
     print()
-    
+
+
+@instrumented('render')
+def plot_query2(df, render_mode='full'):
+    """Render the query 2 charts; returns the image file name"""
     # Create figure with two subplots
     fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(16, 6))
     
@@ -173,36 +229,49 @@ def query2_trainer_performance(connection):
     ax2.grid(axis='y', alpha=0.3, linestyle='--')
     
     plt.tight_layout()
-    plt.savefig('query2_trainer_performance.png', dpi=300, bbox_inches='tight')
-    print("✓ Saved: query2_trainer_performance.png\n")
-    plt.close()
+    return save_figure('query2_trainer_performance.png', render_mode)
 
 
-# QUERY 3: Class Attendance Analysis
-def query3_class_attendance(connection):
-    print("=" * 75)
-    print("QUERY 3: CLASS ATTENDANCE ANALYSIS")
-    print("=" * 75)
-    
-    sql_query = """
+# QUERY 3: Class Attendance Analysis (from the attendance summary table)
+QUERY3_SQL = """
     SELECT 
         cl.class_id,
         cl.class_name,
         cl.category,
-        COUNT(uc.user_id) AS enrolled_count,
-        SUM(CASE WHEN uc.attendance_status = 'Attended' THEN 1 ELSE 0 END) AS attended_count,
-        SUM(CASE WHEN uc.attendance_status = 'Missed' THEN 1 ELSE 0 END) AS missed_count,
-        ROUND((SUM(CASE WHEN uc.attendance_status = 'Attended' THEN 1 ELSE 0 END) * 100.0 / 
-               NULLIF(COUNT(uc.user_id), 0)), 2) AS attendance_rate
+        a.enrolled_count,
+        a.attended_count,
+        a.missed_count,
+        ROUND((a.attended_count * 100.0 / NULLIF(a.enrolled_count, 0)), 2) AS attendance_rate
     FROM Classes cl
-    LEFT JOIN User_Class uc ON cl.class_id = uc.class_id
-    GROUP BY cl.class_id, cl.class_name, cl.category
-    HAVING enrolled_count > 0
+    INNER JOIN (
+        SELECT 
+            class_id,
+            SUM(enrolled_count) AS enrolled_count,
+            SUM(CASE WHEN attendance_status = 'Attended' THEN enrolled_count ELSE 0 END) AS attended_count,
+            SUM(CASE WHEN attendance_status = 'Missed' THEN enrolled_count ELSE 0 END) AS missed_count
+        FROM Attendance_Summary
+        GROUP BY class_id
+    ) a ON cl.class_id = a.class_id
+    WHERE a.enrolled_count > 0
     ORDER BY enrolled_count DESC
     LIMIT 12;
-    """
-    
-    df = pd.read_sql_query(sql_query, connection)
+"""
+
+
+@instrumented('fetch')
+def fetch_query3(connection=None):
+    """Bring the attendance summary up to date, then run query 3 (through the
+    result cache); uses a pooled connection when none is given"""
+    refresh_summary('attendance', connection)
+    df = cached_read_sql(QUERY3_SQL, connection, label="query3_class_attendance")
+    return df
+
+
+@instrumented('summarize')
+def summarize_query3(df):
+    print("=" * 75)
+    print("QUERY 3: CLASS ATTENDANCE ANALYSIS")
+    print("=" * 75)
     print(df)
     print()
     
@@ -214,7 +283,11 @@ def query3_class_attendance(connection):
     print(f"   Total Attended: {df['attended_count'].sum()}")
     print(f"   Total Missed: {df['missed_count'].sum()}")
     print()
-    
+
+
+@instrumented('render')
+def plot_query3(df, render_mode='full'):
+    """Render the query 3 charts; returns the image file name"""
     # Create figure with two subplots
     fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(16, 6))
     
@@ -247,18 +320,11 @@ def query3_class_attendance(connection):
     ax2.grid(True, alpha=0.3, linestyle='--')
     
     plt.tight_layout()
-    plt.savefig('query3_class_attendance.png', dpi=300, bbox_inches='tight')
-    print("✓ Saved: query3_class_attendance.png\n")
-    plt.close()
+    return save_figure('query3_class_attendance.png', render_mode)
 
 
 # QUERY 4: User Progress Tracking
-def query4_user_progress(connection):
-    print("=" * 75)
-    print("QUERY 4: USER PROGRESS TRACKING")
-    print("=" * 75)
-    
-    sql_query = """
+QUERY4_SQL = """
     SELECT 
         u.user_id,
         u.full_name,
@@ -271,10 +337,22 @@ def query4_user_progress(connection):
     INNER JOIN Progress_Tracking pt ON u.user_id = pt.user_id
     WHERE u.user_id IN (1, 2, 5, 10, 15, 20, 25)
     ORDER BY u.user_id, pt.date;
-    """
-    
-    df = pd.read_sql_query(sql_query, connection)
+"""
+
+
+@instrumented('fetch')
+def fetch_query4(connection=None):
+    """Run query 4 (through the result cache); uses a pooled connection when none is given"""
+    df = cached_read_sql(QUERY4_SQL, connection, label="query4_user_progress")
     df['tracking_date'] = pd.to_datetime(df['tracking_date'])
+    return df
+
+
+@instrumented('summarize')
+def summarize_query4(df):
+    print("=" * 75)
+    print("QUERY 4: USER PROGRESS TRACKING")
+    print("=" * 75)
     print(df)
     print()
     
@@ -286,7 +364,11 @@ def query4_user_progress(connection):
     print(f"   Average Calories: {df['calories_burned'].mean():.0f} cal")
     print(f"   Average Steps: {df['steps'].mean():.0f}")
     print()
-    
+
+
+@instrumented('render')
+def plot_query4(df, render_mode='full'):
+    """Render the query 4 charts; returns the image file name"""
     # Create figure with two subplots
     fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(16, 6))
     
@@ -317,18 +399,150 @@ def query4_user_progress(connection):
     ax2.grid(axis='y', alpha=0.3, linestyle='--')
     
     plt.tight_layout()
-    plt.savefig('query4_user_progress.png', dpi=300, bbox_inches='tight')
-    print("✓ Saved: query4_user_progress.png\n")
-    plt.close()
+    return save_figure('query4_user_progress.png', render_mode)
 
 
-# QUERY 5: Goal Achievement Analysis
-def query5_goal_achievement(connection):
+# QUERY 4 (all users): streamed in chunks and aggregated incrementally, so
+# memory stays bounded by the number of users rather than progress entries
+QUERY4_ALL_SQL = """
+    SELECT 
+        pt.user_id,
+        u.full_name,
+        pt.date AS tracking_date,
+        pt.weight,
+        pt.bmi,
+        pt.calories_burned,
+        pt.steps
+    FROM Progress_Tracking pt
+    INNER JOIN Users u ON u.user_id = pt.user_id
+    ORDER BY pt.user_id, pt.date;
+"""
+STREAM_CHUNK_ROWS = 50000
+# Fixed bins let every chunk add to the same calorie histogram
+CALORIE_BIN_EDGES = np.arange(0, 2050, 50)
+PROGRESS_METRICS = ['weight', 'bmi', 'calories_burned', 'steps']
+
+
+def accumulate_progress(chunks):
+    """Fold progress chunks (ordered by user and date) into one row per user.
+
+    The per-month trend and the calorie histogram are built alongside and
+    returned in df.attrs as plain lists, so they survive pickling and export.
+    """
+    user_parts, month_parts = [], []
+    calorie_counts = np.zeros(len(CALORIE_BIN_EDGES) - 1, dtype=np.int64)
+    
+    for chunk in chunks:
+        chunk['tracking_date'] = pd.to_datetime(chunk['tracking_date'])
+        for metric in PROGRESS_METRICS:
+            chunk[metric] = pd.to_numeric(chunk[metric])
+        
+        aggregations = {
+            'full_name': ('full_name', 'first'),
+            'entries': ('tracking_date', 'size'),
+            'first_date': ('tracking_date', 'first'),
+            'last_date': ('tracking_date', 'last'),
+            'first_weight': ('weight', 'first'),
+            'last_weight': ('weight', 'last'),
+        }
+        for metric in PROGRESS_METRICS:
+            aggregations[f'{metric}_sum'] = (metric, 'sum')
+            aggregations[f'{metric}_count'] = (metric, 'count')
+        user_parts.append(chunk.groupby('user_id', sort=False).agg(**aggregations))
+        
+        month = chunk['tracking_date'].dt.to_period('M').rename('month')
+        month_parts.append(chunk.groupby(month)[['weight', 'calories_burned']].agg(['sum', 'count']))
+        
+        calories = chunk['calories_burned'].dropna().clip(upper=CALORIE_BIN_EDGES[-1])
+        calorie_counts += np.histogram(calories, bins=CALORIE_BIN_EDGES)[0]
+    
+    # A user or month split across two chunks has two partial rows; merge them
+    combine = {'full_name': 'first', 'entries': 'sum', 'first_date': 'min', 'last_date': 'max',
+               'first_weight': 'first', 'last_weight': 'last'}
+    combine.update({f'{metric}_{part}': 'sum' for metric in PROGRESS_METRICS for part in ('sum', 'count')})
+    users = pd.concat(user_parts).groupby(level=0).agg(combine) if user_parts else pd.DataFrame(columns=list(combine))
+    months = pd.concat(month_parts).groupby(level=0).sum() if month_parts else None
+    
+    df = users[['full_name', 'entries', 'first_date', 'last_date', 'first_weight', 'last_weight']].copy()
+    df['weight_change'] = df['last_weight'] - df['first_weight']
+    for metric in PROGRESS_METRICS:
+        df[f'avg_{metric}'] = users[f'{metric}_sum'] / users[f'{metric}_count'].replace(0, np.nan)
+    df = df.reset_index().rename(columns={'index': 'user_id'})
+    
+    df.attrs['totals'] = {metric: [float(users[f'{metric}_sum'].sum()), int(users[f'{metric}_count'].sum())]
+                          for metric in PROGRESS_METRICS}
+    df.attrs['monthly'] = {
+        'month': [str(period) for period in months.index] if months is not None else [],
+        'avg_weight': (months[('weight', 'sum')] / months[('weight', 'count')]).round(2).tolist() if months is not None else [],
+        'avg_calories': (months[('calories_burned', 'sum')] / months[('calories_burned', 'count')]).round(1).tolist() if months is not None else [],
+    }
+    df.attrs['calorie_counts'] = calorie_counts.tolist()
+    return df
+
+
+@instrumented('fetch')
+def fetch_query4_all():
+    """Stream query 4 for every user through an unbuffered cursor"""
+    return accumulate_progress(iter_sql_chunks(QUERY4_ALL_SQL, chunksize=STREAM_CHUNK_ROWS,
+                                               label="query4_user_progress_all"))
+
+
+@instrumented('summarize')
+def summarize_query4_all(df):
     print("=" * 75)
-    print("QUERY 5: GOAL ACHIEVEMENT ANALYSIS")
+    print("QUERY 4: USER PROGRESS TRACKING (ALL USERS, STREAMED)")
     print("=" * 75)
+    print(df.sort_values('entries', ascending=False).head(20))
+    print()
     
-    sql_query = """
+    # Statistics from the running totals, weighted by entry like the sampled report
+    totals = df.attrs['totals']
+    average = {metric: total / count if count else float('nan') for metric, (total, count) in totals.items()}
+    print("📊 Summary Statistics:")
+    print(f"   Users Tracked: {len(df)}")
+    print(f"   Progress Entries: {df['entries'].sum()}")
+    print(f"   Average Weight: {average['weight']:.2f} kg")
+    print(f"   Average BMI: {average['bmi']:.2f}")
+    print(f"   Average Calories: {average['calories_burned']:.0f} cal")
+    print(f"   Average Steps: {average['steps']:.0f}")
+    print(f"   Users Losing Weight: {(df['weight_change'] < 0).sum()}")
+    print()
+
+
+@instrumented('render')
+def plot_query4_all(df, render_mode='full'):
+    """Render the all-users query 4 charts from the aggregates; returns the image file name"""
+    fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(16, 6))
+    
+    # Plot 1: Monthly average weight across all users
+    monthly = df.attrs['monthly']
+    ax1.plot(pd.PeriodIndex(monthly['month'], freq='M').to_timestamp(), monthly['avg_weight'],
+            marker='o', linewidth=2.5, markersize=6, color='#4ECDC4')
+    ax1.set_xlabel('Month', fontsize=12, fontweight='bold')
+    ax1.set_ylabel('Average Weight (kg)', fontsize=12, fontweight='bold')
+    ax1.set_title('Average Weight per Month - All Users', fontsize=14, fontweight='bold', pad=15)
+    ax1.grid(True, alpha=0.3, linestyle='--')
+    plt.setp(ax1.xaxis.get_majorticklabels(), rotation=45, ha='right')
+    
+    # Plot 2: Calories histogram accumulated chunk by chunk
+    calories_total, calories_count = df.attrs['totals']['calories_burned']
+    ax2.stairs(df.attrs['calorie_counts'], CALORIE_BIN_EDGES, fill=True, color='#FF6B6B',
+              edgecolor='black', linewidth=1.2, alpha=0.7)
+    if calories_count:
+        ax2.axvline(calories_total / calories_count, color='blue', linestyle='--', linewidth=2,
+                   label=f"Mean: {calories_total / calories_count:.0f}")
+        ax2.legend(fontsize=11)
+    ax2.set_xlabel('Calories Burned', fontsize=12, fontweight='bold')
+    ax2.set_ylabel('Frequency', fontsize=12, fontweight='bold')
+    ax2.set_title('Distribution of Calories Burned - All Users', fontsize=14, fontweight='bold', pad=15)
+    ax2.grid(axis='y', alpha=0.3, linestyle='--')
+    
+    plt.tight_layout()
+    return save_figure('query4_user_progress_all.png', render_mode)
+
+
+# QUERY 5: Goal Achievement Analysis
+QUERY5_SQL = """
     SELECT 
         goal_type,
         status,
@@ -336,9 +550,21 @@ def query5_goal_achievement(connection):
     FROM Goals
     GROUP BY goal_type, status
     ORDER BY goal_type, status;
-    """
-    
-    df = pd.read_sql_query(sql_query, connection)
+"""
+
+
+@instrumented('fetch')
+def fetch_query5(connection=None):
+    """Run query 5 (through the result cache); uses a pooled connection when none is given"""
+    df = cached_read_sql(QUERY5_SQL, connection, label="query5_goal_achievement")
+    return df
+
+
+@instrumented('summarize')
+def summarize_query5(df):
+    print("=" * 75)
+    print("QUERY 5: GOAL ACHIEVEMENT ANALYSIS")
+    print("=" * 75)
     print(df)
     print()
     
@@ -352,6 +578,12 @@ def query5_goal_achievement(connection):
     for status, count in status_summary.items():
         print(f"      {status}: {count} ({count/total_goals*100:.1f}%)")
     print()
+
+
+@instrumented('render')
+def plot_query5(df, render_mode='full'):
+    """Render the query 5 charts; returns the image file name"""
+    status_summary = df.groupby('status')['goal_count'].sum()
     
     # Create figure with two subplots
     fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(16, 6))
@@ -362,7 +594,7 @@ def query5_goal_achievement(connection):
     
     wedges, texts, autotexts = ax1.pie(status_summary.values, labels=status_summary.index, 
             autopct='%1.1f%%', startangle=90, colors=colors_status,
-            explode=explode, shadow=True,
+            explode=explode, shadow=RENDER_MODES[render_mode]['shadow'],
             textprops={'fontsize': 11, 'fontweight': 'bold'})
     
     for autotext in autotexts:
@@ -385,50 +617,125 @@ def query5_goal_achievement(connection):
     plt.setp(ax2.xaxis.get_majorticklabels(), rotation=45, ha='right')
     
     plt.tight_layout()
-    plt.savefig('query5_goal_achievement.png', dpi=300, bbox_inches='tight')
-    print("✓ Saved: query5_goal_achievement.png\n")
-    plt.close()
+    return save_figure('query5_goal_achievement.png', render_mode)
+
+
+# Analyses in report order: (output name, fetch, summarize, plot)
+ANALYSES = [
+    ('query1_revenue_analysis', fetch_query1, summarize_query1, plot_query1),
+    ('query2_trainer_performance', fetch_query2, summarize_query2, plot_query2),
+    ('query3_class_attendance', fetch_query3, summarize_query3, plot_query3),
+    ('query4_user_progress', fetch_query4, summarize_query4, plot_query4),
+    ('query5_goal_achievement', fetch_query5, summarize_query5, plot_query5),
+]
+
+# Same report with query 4 streamed across every user instead of the sample
+ANALYSES_ALL_USERS = [
+    ('query4_user_progress_all', fetch_query4_all, summarize_query4_all, plot_query4_all)
+    if name == 'query4_user_progress' else (name, fetch, summarize, plot)
+    for name, fetch, summarize, plot in ANALYSES
+]
+
+
+def run_report(render_mode='full', export_format=None, fetch_workers=None, render_workers=None,
+               analyses=ANALYSES):
+    """Run every analysis: fetches in threads, each on its own pooled
+    connection, and chart renders in worker processes (matplotlib is not
+    thread-safe) as soon as their data arrives. With render_mode 'none' no
+    chart is drawn; export_format also writes each DataFrame to disk.
+    analyses defaults to ANALYSES; pass ANALYSES_ALL_USERS to stream query 4.
+    Returns the generated file names."""
+    frames = [None] * len(analyses)
+    renders = [None] * len(analyses)
+    render_workers = render_workers or min(len(analyses), os.cpu_count() or 1)
+    rendering = RENDER_MODES[render_mode] is not None
+    
+    with ThreadPoolExecutor(max_workers=fetch_workers or len(analyses)) as fetch_pool, \
+            ProcessPoolExecutor(max_workers=render_workers) as render_pool:
+        fetches = {fetch_pool.submit(fetch): i for i, (_, fetch, _, _) in enumerate(analyses)}
+        for future in as_completed(fetches):
+            i = fetches[future]
+            frames[i] = future.result()
+            if rendering:
+                renders[i] = render_pool.submit(run_collecting, analyses[i][3], frames[i], render_mode)
+        
+        # Text summaries stay in report order
+        for (_, _, summarize, _), df in zip(analyses, frames):
+            summarize(df)
+        
+        files = []
+        for (name, fetch, _, _), df, render in zip(analyses, frames, renders):
+            if export_format:
+                with phase('export', analysis_name(fetch)):
+                    files.append(export_frame(df, name, export_format))
+                print(f"✓ Exported: {files[-1]}")
+            if render is not None:
+                # Render timings were recorded in the worker process
+                files.append(merge_events(render.result()))
+                print(f"✓ Saved: {files[-1]}")
+        print()
+    return files
 
 
 # Main function
 def main():
+    import argparse
+    
+    arg_parser = argparse.ArgumentParser(description="Run the Level Up analytics report")
+    arg_parser.add_argument("--render", choices=list(RENDER_MODES), default="full",
+                            help="Chart quality: none (no charts), preview (72 dpi) or full (300 dpi)")
+    arg_parser.add_argument("--export", choices=list(EXPORT_FORMATS),
+                            help="Also write each analysis DataFrame in this format")
+    arg_parser.add_argument("--all-users", action="store_true",
+                            help="Stream query 4 across every user instead of the sample users")
+    arg_parser.add_argument("--no-cache", action="store_true",
+                            help="Ignore cached results and query the database")
+    arg_parser.add_argument("--clear-cache", action="store_true",
+                            help="Delete all cached results before running")
+    arg_parser.add_argument("--log-json", metavar="FILE",
+                            help="Write one JSON line per phase and query to FILE ('-' for stderr)")
+    arg_parser.add_argument("--metrics", metavar="FILE",
+                            help="Write phase and query totals to FILE in Prometheus text format")
+    arg_parser.add_argument("--slow-ms", type=float,
+                            help=f"Log the EXPLAIN plan of queries slower than this "
+                                 f"(default {instrumentation.SLOW_QUERY_MS:.0f})")
+    args = arg_parser.parse_args()
+    if args.log_json:
+        instrumentation.configure_logging(args.log_json)
+    if args.slow_ms is not None:
+        instrumentation.SLOW_QUERY_MS = args.slow_ms
+    if args.no_cache:
+        result_cache.CACHE_ENABLED = False
+    if args.clear_cache:
+        result_cache.clear_cache()
+    
     print("\n" + "="*75)
     print("LEVEL UP - FITNESS TRACKING PLATFORM")
     print("Database Analytics Application")
     print("Group 14: Rutvij Surti & Kush Patel")
     print("="*75 + "\n")
     
-    # Connect to database
-    connection = create_connection()
-    
-    if connection is None:
-        print("Failed to connect to database")
-        return
-    
+    start = time.perf_counter()
     try:
-        # Run all queries
-        query1_subscription_revenue(connection)
-        query2_trainer_performance(connection)
-        query3_class_attendance(connection)
-        query4_user_progress(connection)
-        query5_goal_achievement(connection)
+        files = run_report(render_mode=args.render, export_format=args.export,
+                           analyses=ANALYSES_ALL_USERS if args.all_users else ANALYSES)
         
         print("="*75)
         print("✓ ALL ANALYSES COMPLETED SUCCESSFULLY")
         print("="*75)
         print("\n Generated Files:")
-        print("   1. query1_revenue_analysis.png")
-        print("   2. query2_trainer_performance.png")
-        print("   3. query3_class_attendance.png")
-        print("   4. query4_user_progress.png")
-        print("   5. query5_goal_achievement.png")
+        for number, filename in enumerate(files, 1):
+            print(f"   {number}. {filename}")
         print()
+        print_query_timings()
+        print_phase_timings()
+        if args.metrics:
+            print(f"✓ Metrics written to {instrumentation.write_prometheus(args.metrics)}")
+        print(f"✓ Report completed in {time.perf_counter() - start:.2f}s\n")
         
     except Error as e:
-        print("Error:", e)
-        
-    finally:
-        if connection.is_connected():
-            connection.close()
-            print("✓ Database connection closed\n")
+        print("✗ Error running analytics:", e)
+
 
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+"""
+LEVEL UP - Fitness Tracking Platform
+Index advisor: runs EXPLAIN on every analytics query in fitness.py and
+fitness_queries.sql and flags full table scans, filesorts and temporary
+tables, so a missing index shows up before the tables grow.
+Usage: python index_advisor.py [--apply] [--strict]
+    --apply    create any index from fitness_indexes.sql that is not there yet
+    --strict   exit with status 1 when any query is flagged
+"""
+
+import os
+import re
+import sys
+
+from mysql.connector import Error
+
+from db_pool import pooled_connection
+from query_catalog import PROJECT_DIR, analytics_queries, sql_file_queries
+
+MIGRATION_FILE = os.path.join(PROJECT_DIR, 'fitness_indexes.sql')
+
+CREATE_INDEX_PATTERN = re.compile(r'CREATE\s+INDEX\s+(\w+)\s+ON\s+(\w+)\s*\(([^)]*)\)\s*;', re.IGNORECASE)
+
+# EXPLAIN Extra notes worth a look, and what to say about them
+EXTRA_FLAGS = {
+    'Using filesort': 'filesort',
+    'Using temporary': 'temporary table',
+}
+
+
+def migration_indexes(path=MIGRATION_FILE):
+    """(index, table, columns) for each CREATE INDEX in the migration"""
+    with open(path, 'r', encoding='utf-8') as f:
+        return CREATE_INDEX_PATTERN.findall(f.read())
+
+
+def apply_migration(connection, path=MIGRATION_FILE):
+    """Create the migration's indexes that do not exist yet; returns the names created"""
+    cursor = connection.cursor()
+    created = []
+    try:
+        cursor.execute("""
+            SELECT DISTINCT TABLE_NAME, INDEX_NAME FROM information_schema.STATISTICS
+            WHERE TABLE_SCHEMA = DATABASE()
+        """)
+        existing = {(table.lower(), index.lower()) for table, index in cursor.fetchall()}
+        for index, table, columns in migration_indexes(path):
+            if (table.lower(), index.lower()) in existing:
+                continue
+            cursor.execute(f"CREATE INDEX {index} ON {table} ({columns})")
+            created.append(index)
+    finally:
+        cursor.close()
+    return created
+
+
+def explain(connection, sql):
+    """EXPLAIN rows for one statement as dicts"""
+    cursor = connection.cursor(dictionary=True)
+    try:
+        cursor.execute(f"EXPLAIN {sql}")
+        return cursor.fetchall()
+    finally:
+        cursor.close()
+
+
+def plan_flags(plan):
+    """Human-readable problems in an EXPLAIN plan"""
+    flags = []
+    for row in plan:
+        table = row.get('table') or ''
+        extra = row.get('Extra') or ''
+        # <derivedN>/<unionN> are the optimizer's own materialized results, not base tables
+        if row.get('type') == 'ALL' and not table.startswith('<'):
+            flags.append(f"full scan of {table} (~{row.get('rows')} rows)")
+        for note, label in EXTRA_FLAGS.items():
+            if note in extra:
+                flags.append(f"{label} on {table or 'result'}")
+    return flags
+
+
+def advise(connection, queries):
+    """Explain every query; returns {name: flags} (an Error message becomes a flag)"""
+    report = {}
+    for name, sql in queries:
+        try:
+            report[name] = plan_flags(explain(connection, sql))
+        except Error as e:
+            report[name] = [f"EXPLAIN failed: {e}"]
+    return report
+
+
+def print_report(report):
+    print("=" * 75)
+    print("INDEX ADVISOR - EXPLAIN REVIEW")
+    print("=" * 75)
+    for name, flags in report.items():
+        print(f"{'⚠' if flags else '✓'} {name}")
+        for flag in flags:
+            print(f"      {flag}")
+    flagged = sum(1 for flags in report.values() if flags)
+    print(f"\n {flagged} of {len(report)} queries flagged\n")
+    return flagged
+
+
+# ============================================
+# MAIN EXECUTION
+# ============================================
+if __name__ == "__main__":
+    import argparse
+
+    arg_parser = argparse.ArgumentParser(description="EXPLAIN the analytics queries and flag scans and sorts")
+    arg_parser.add_argument("--apply", action="store_true",
+                            help="Create missing indexes from fitness_indexes.sql first")
+    arg_parser.add_argument("--strict", action="store_true",
+                            help="Exit with status 1 when any query is flagged")
+    args = arg_parser.parse_args()
+
+    try:
+        with pooled_connection() as connection:
+            if args.apply:
+                created = apply_migration(connection)
+                print(f"✓ Created {len(created)} indexes: {', '.join(created) or 'none missing'}\n")
+            flagged = print_report(advise(connection, analytics_queries() + sql_file_queries()))
+    except Error as e:
+        print("✗ Error running index advisor:", e)
+        sys.exit(1)
+
+    if args.strict and flagged:
+        sys.exit(1)
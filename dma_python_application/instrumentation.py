@@ -0,0 +1,232 @@
+"""
+LEVEL UP - Fitness Tracking Platform
+Lightweight instrumentation for the analytics: per-phase timings (fetch,
+summarize, render, savefig) for each analysis, and per-query SQL text, row
+counts and bytes sent by the server. Every event is kept in EVENTS and
+logged as one JSON line on the 'fitness.instrumentation' logger; queries
+slower than the threshold also log their EXPLAIN plan. prometheus_text()
+renders the totals in the Prometheus text exposition format.
+Configured from the environment:
+    FITNESS_INSTRUMENT (0 disables query details), FITNESS_SLOW_QUERY_MS
+"""
+
+import functools
+import json
+import logging
+import os
+import re
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from datetime import datetime
+
+from mysql.connector import Error
+
+ENABLED = os.environ.get('FITNESS_INSTRUMENT', '1') != '0'
+# Queries slower than this get their EXPLAIN plan logged
+SLOW_QUERY_MS = float(os.environ.get('FITNESS_SLOW_QUERY_MS', '1000'))
+
+logger = logging.getLogger('fitness.instrumentation')
+
+# One dict per finished phase or query, in completion order
+EVENTS = []
+
+# Analysis the current thread is working on, so queries can be attributed to it
+_context = threading.local()
+
+
+def configure_logging(path='-'):
+    """Send the JSON event lines to a file, or to stderr for '-'"""
+    handler = logging.StreamHandler() if path == '-' else logging.FileHandler(path, encoding='utf-8')
+    handler.setFormatter(logging.Formatter('%(message)s'))
+    logger.addHandler(handler)
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+
+
+def compact_sql(sql):
+    return re.sub(r'\s+', ' ', sql).strip()
+
+
+def record(event, level=logging.INFO):
+    """Store an event and log it as a JSON line"""
+    event = {'ts': datetime.now().isoformat(timespec='milliseconds'), **event}
+    EVENTS.append(event)
+    logger.log(level, json.dumps(event, default=str))
+    return event
+
+
+def current_analysis():
+    return getattr(_context, 'analysis', None)
+
+
+@contextmanager
+def phase(name, analysis=None, **fields):
+    """with phase('fetch', 'query1'): ... - times the block as one phase of an analysis.
+
+    analysis defaults to the one the enclosing phase is timing. The block
+    may add fields (e.g. rows) to the yielded dict before it is recorded.
+    """
+    analysis = analysis or current_analysis()
+    previous = current_analysis()
+    _context.analysis = analysis
+    event = {'event': 'phase', 'analysis': analysis, 'phase': name, **fields}
+    start = time.perf_counter()
+    try:
+        yield event
+    finally:
+        event['seconds'] = time.perf_counter() - start
+        _context.analysis = previous
+        record(event)
+
+
+def analysis_name(func):
+    """Analysis a fetch/summarize/plot function belongs to: fetch_query1 -> query1"""
+    return func.__name__.split('_', 1)[1]
+
+
+def instrumented(name):
+    """Decorator timing every call as phase name of the function's analysis
+    (see analysis_name); DataFrame results add their row count"""
+    def decorate(func):
+        analysis = analysis_name(func)
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with phase(name, analysis) as event:
+                result = func(*args, **kwargs)
+                if hasattr(result, 'shape'):
+                    event['rows'] = len(result)
+                return result
+        return wrapper
+    return decorate
+
+
+def run_collecting(func, *args):
+    """Call func in a process pool worker and return (result, events it
+    recorded); the parent passes that to merge_events"""
+    mark = len(EVENTS)
+    result = func(*args)
+    return result, EVENTS[mark:]
+
+
+def merge_events(collected):
+    """Keep a worker's events in this process; returns the worker's result"""
+    result, events = collected
+    EVENTS.extend(events)
+    return result
+
+
+def bytes_sent(connection):
+    """Server-side Bytes_sent counter of this session"""
+    cursor = connection.cursor()
+    try:
+        cursor.execute("SHOW SESSION STATUS LIKE 'Bytes_sent'")
+        return int(cursor.fetchone()[1])
+    finally:
+        cursor.close()
+
+
+def explain(connection, sql, params=None):
+    """EXPLAIN rows for one statement as dicts"""
+    cursor = connection.cursor(dictionary=True)
+    try:
+        cursor.execute(f"EXPLAIN {sql.strip().rstrip(';')}", params)
+        return cursor.fetchall()
+    finally:
+        cursor.close()
+
+
+@contextmanager
+def query_span(label, sql, connection, params=None):
+    """Time one query on connection; the block sets the yielded dict's rows.
+
+    With instrumentation enabled the event also carries the SQL text and
+    the bytes the server sent, and a query over SLOW_QUERY_MS is explained
+    on the same connection once it has finished.
+    """
+    event = {'event': 'query', 'analysis': current_analysis(), 'label': label, 'rows': 0}
+    if ENABLED:
+        event['sql'] = compact_sql(sql)
+        sent_before = bytes_sent(connection)
+    start = time.perf_counter()
+    # A failed query raises out of the yield and is not recorded
+    yield event
+    event['seconds'] = time.perf_counter() - start
+    if ENABLED:
+        # The first status query's own result is counted in the difference
+        event['bytes'] = bytes_sent(connection) - sent_before
+    record(event)
+    if ENABLED and event['seconds'] * 1000 > SLOW_QUERY_MS:
+        try:
+            plan = explain(connection, sql, params)
+        except Error as e:
+            plan = f"EXPLAIN failed: {e}"
+        record({'event': 'slow_query', 'analysis': event['analysis'], 'label': label,
+                'seconds': event['seconds'], 'threshold_ms': SLOW_QUERY_MS,
+                'sql': event['sql'], 'plan': plan}, logging.WARNING)
+
+
+def prometheus_label(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def prometheus_text(events=None):
+    """Totals of the recorded events in the Prometheus text exposition format"""
+    events = EVENTS if events is None else events
+    metrics = {
+        'fitness_phase_seconds_total': ('counter', 'Wall time spent in each analysis phase', defaultdict(float)),
+        'fitness_phase_runs_total': ('counter', 'Analysis phases run', defaultdict(int)),
+        'fitness_query_seconds_total': ('counter', 'Wall time spent running each query', defaultdict(float)),
+        'fitness_query_rows_total': ('counter', 'Rows returned by each query', defaultdict(int)),
+        'fitness_query_bytes_total': ('counter', 'Bytes the server sent for each query', defaultdict(int)),
+        'fitness_slow_queries_total': ('counter', 'Queries slower than the slow-query threshold', defaultdict(int)),
+    }
+    for event in events:
+        if event['event'] == 'phase':
+            key = (('analysis', event['analysis']), ('phase', event['phase']))
+            metrics['fitness_phase_seconds_total'][2][key] += event['seconds']
+            metrics['fitness_phase_runs_total'][2][key] += 1
+        elif event['event'] == 'query':
+            key = (('analysis', event['analysis']), ('query', event['label']))
+            metrics['fitness_query_seconds_total'][2][key] += event['seconds']
+            metrics['fitness_query_rows_total'][2][key] += event['rows']
+            metrics['fitness_query_bytes_total'][2][key] += event.get('bytes', 0)
+        elif event['event'] == 'slow_query':
+            key = (('analysis', event['analysis']), ('query', event['label']))
+            metrics['fitness_slow_queries_total'][2][key] += 1
+
+    lines = []
+    for name, (metric_type, help_text, samples) in metrics.items():
+        lines += [f"# HELP {name} {help_text}", f"# TYPE {name} {metric_type}"]
+        for key, value in samples.items():
+            labels = ",".join(f'{label}="{prometheus_label(label_value)}"'
+                              for label, label_value in key if label_value is not None)
+            lines.append(f"{name}{{{labels}}} {value}")
+    return "\n".join(lines) + "\n"
+
+
+def write_prometheus(path, events=None):
+    """Write the exposition atomically, e.g. for node_exporter's textfile collector"""
+    temp_path = f"{path}.tmp"
+    with open(temp_path, 'w', encoding='utf-8') as f:
+        f.write(prometheus_text(events))
+    os.replace(temp_path, path)
+    return path
+
+
+def print_phase_timings():
+    """Summary of the recorded phases per analysis"""
+    phases = [event for event in EVENTS if event['event'] == 'phase']
+    if not phases:
+        return
+    print(" Phase Timings:")
+    for event in phases:
+        label = f"{event['analysis']} {event['phase']}"
+        rows = f"{event['rows']:>8} rows" if 'rows' in event else ""
+        print(f"   {label:<40} {event['seconds'] * 1000:>9.1f} ms  {rows}")
+    slow = sum(1 for event in EVENTS if event['event'] == 'slow_query')
+    if slow:
+        print(f"   ⚠ {slow} slow queries (over {SLOW_QUERY_MS:.0f} ms) logged with their EXPLAIN plan")
+    print()
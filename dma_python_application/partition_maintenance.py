@@ -0,0 +1,160 @@
+"""
+LEVEL UP - Fitness Tracking Platform
+Monthly partition maintenance for Payments and Progress_Tracking
+(partitioned by fitness_partitioned.sql). Run once a month, e.g. from cron:
+  * splits p_future so the next months each have their own partition
+  * moves partitions older than the retention window into standalone
+    <table>_archive_<yyyymm> tables (EXCHANGE PARTITION, no row copy),
+    or drops them with --drop; a run interrupted midway can simply be repeated
+Usage: python partition_maintenance.py [--months-ahead N] [--retain-months N] [--drop] [--dry-run]
+"""
+
+from datetime import date, datetime
+
+from mysql.connector import Error
+
+from db_pool import pooled_connection
+
+# Partitioned table -> partitioning column
+PARTITIONED_TABLES = {
+    'Payments': 'payment_date',
+    'Progress_Tracking': 'date',
+}
+FUTURE_PARTITION = 'p_future'
+
+
+def month_start(day):
+    return date(day.year, day.month, 1)
+
+
+def add_months(month, count):
+    """First day of the month count months after month (count may be negative)"""
+    index = month.year * 12 + month.month - 1 + count
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(month):
+    return f"p{month:%Y%m}"
+
+
+def partition_bound(description):
+    """Upper bound of a RANGE COLUMNS partition as a date, or None for MAXVALUE"""
+    if description is None or 'MAXVALUE' in description:
+        return None
+    return datetime.strptime(description.strip("'")[:10], '%Y-%m-%d').date()
+
+
+def existing_partitions(cursor, table):
+    """[(name, upper bound)] in partition order"""
+    cursor.execute("""
+        SELECT PARTITION_NAME, PARTITION_DESCRIPTION FROM information_schema.PARTITIONS
+        WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s AND PARTITION_NAME IS NOT NULL
+        ORDER BY PARTITION_ORDINAL_POSITION
+    """, (table,))
+    return [(name, partition_bound(description)) for name, description in cursor.fetchall()]
+
+
+def future_partition_statements(table, partitions, months_ahead, today):
+    """REORGANIZE p_future so every month up to months_ahead ahead has a partition"""
+    bounds = [bound for _, bound in partitions if bound is not None]
+    # The month after the newest bounded partition is the first one missing
+    month = max(bounds) if bounds else month_start(today)
+    last = add_months(month_start(today), months_ahead)
+    new_partitions = []
+    while month <= last:
+        new_partitions.append(f"PARTITION {partition_name(month)} VALUES LESS THAN ('{add_months(month, 1)}')")
+        month = add_months(month, 1)
+    if not new_partitions:
+        return []
+    new_partitions.append(f"PARTITION {FUTURE_PARTITION} VALUES LESS THAN (MAXVALUE)")
+    return [f"ALTER TABLE {table} REORGANIZE PARTITION {FUTURE_PARTITION} INTO (\n    "
+            + ",\n    ".join(new_partitions) + "\n)"]
+
+
+def archive_status(cursor, archive):
+    """(exists, still partitioned, holds rows) for an archive table"""
+    cursor.execute("""
+        SELECT CREATE_OPTIONS FROM information_schema.TABLES
+        WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s
+    """, (archive,))
+    row = cursor.fetchone()
+    if row is None:
+        return False, False, False
+    return True, 'partitioned' in (row[0] or ''), has_rows(cursor, archive)
+
+
+def has_rows(cursor, table, partition=None):
+    cursor.execute(f"SELECT 1 FROM {table}{f' PARTITION ({partition})' if partition else ''} LIMIT 1")
+    return cursor.fetchone() is not None
+
+
+def expired_partition_statements(cursor, table, partitions, retain_months, today, drop=False):
+    """Archive (or drop) every partition whose rows all predate the retention window.
+
+    Archiving resumes where an interrupted run stopped: an archive table
+    that already exists is reused, and one that already holds rows was
+    exchanged before, so exchanging again would swap them back out.
+    """
+    cutoff = add_months(month_start(today), -retain_months)
+    statements = []
+    for name, bound in partitions:
+        if bound is None or bound > cutoff:
+            continue
+        if not drop:
+            archive = f"{table}_archive_{name.lstrip('p_')}"
+            exists, partitioned, archived = archive_status(cursor, archive)
+            if archived and has_rows(cursor, table, name):
+                print(f"❌ {table} {name}: {archive} already holds rows; archive or drop it by hand")
+                continue
+            statements.append(f"CREATE TABLE IF NOT EXISTS {archive} LIKE {table}")
+            if partitioned or not exists:
+                statements.append(f"ALTER TABLE {archive} REMOVE PARTITIONING")
+            if not archived:
+                statements.append(f"ALTER TABLE {table} EXCHANGE PARTITION {name} WITH TABLE {archive}")
+        statements.append(f"ALTER TABLE {table} DROP PARTITION {name}")
+    return statements
+
+
+def maintain(connection, months_ahead=3, retain_months=24, drop=False, dry_run=False, today=None):
+    """Run (or with dry_run only print) the maintenance DDL for every partitioned table"""
+    today = today or date.today()
+    cursor = connection.cursor()
+    try:
+        for table in PARTITIONED_TABLES:
+            partitions = existing_partitions(cursor, table)
+            if not partitions:
+                print(f"❌ {table} is not partitioned; apply fitness_partitioned.sql first")
+                continue
+            statements = (future_partition_statements(table, partitions, months_ahead, today)
+                          + expired_partition_statements(cursor, table, partitions, retain_months, today, drop))
+            if not statements:
+                print(f"✅ {table}: partitions already cover {months_ahead} months ahead and {retain_months} months back")
+            for statement in statements:
+                print(f"{statement};")
+                if not dry_run:
+                    cursor.execute(statement)
+    finally:
+        cursor.close()
+
+
+# ============================================
+# MAIN EXECUTION
+# ============================================
+if __name__ == "__main__":
+    import argparse
+
+    arg_parser = argparse.ArgumentParser(description="Add future and archive expired monthly partitions")
+    arg_parser.add_argument("--months-ahead", type=int, default=3,
+                            help="Keep a partition for each of the next N months (default 3)")
+    arg_parser.add_argument("--retain-months", type=int, default=24,
+                            help="Archive partitions entirely older than N months (default 24)")
+    arg_parser.add_argument("--drop", action="store_true",
+                            help="Drop expired partitions instead of archiving them to tables")
+    arg_parser.add_argument("--dry-run", action="store_true", help="Print the DDL without running it")
+    args = arg_parser.parse_args()
+
+    try:
+        with pooled_connection() as connection:
+            maintain(connection, args.months_ahead, args.retain_months, args.drop, args.dry_run)
+    except Error as e:
+        print(f"❌ Partition maintenance failed: {e}")
@@ -0,0 +1,46 @@
+"""
+LEVEL UP - Fitness Tracking Platform
+The analytics queries as (name, sql) pairs: the QUERYn_SQL constants in
+fitness.py and the numbered queries in fitness_queries.sql. Reads both
+files as text, so the index advisor, the DuckDB snapshot and the
+benchmarks share one parser without importing fitness.py or a database
+driver. Statements come back without their trailing semicolon.
+"""
+
+import ast
+import os
+import re
+
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+ANALYTICS_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fitness.py')
+QUERIES_FILE = os.path.join(PROJECT_DIR, 'fitness_queries.sql')
+
+QUERY_HEADER_PATTERN = re.compile(r'^-- QUERY (\d+): (.+)$', re.MULTILINE)
+QUERY_CONSTANT_PATTERN = re.compile(r'QUERY\d+\w*_SQL')
+
+
+def analytics_queries(path=ANALYTICS_FILE):
+    """(name, sql) for every QUERYn_SQL constant in fitness.py, read without importing it"""
+    with open(path, 'r', encoding='utf-8') as f:
+        tree = ast.parse(f.read())
+    queries = []
+    for node in tree.body:
+        if (isinstance(node, ast.Assign) and len(node.targets) == 1
+                and isinstance(node.targets[0], ast.Name) and QUERY_CONSTANT_PATTERN.fullmatch(node.targets[0].id)):
+            queries.append((f"fitness.py {node.targets[0].id}", ast.literal_eval(node.value).strip().rstrip(';')))
+    return queries
+
+
+def sql_file_queries(path=QUERIES_FILE):
+    """(name, sql) for each numbered query in fitness_queries.sql"""
+    with open(path, 'r', encoding='utf-8') as f:
+        content = f.read()
+    headers = list(QUERY_HEADER_PATTERN.finditer(content))
+    queries = []
+    for header, following in zip(headers, headers[1:] + [None]):
+        body = content[header.end():following.start() if following else len(content)]
+        # Drop comment lines; what remains is the statement
+        sql = "\n".join(line for line in body.splitlines() if not line.lstrip().startswith('--')).strip()
+        if sql:
+            queries.append((f"QUERY {header.group(1)}: {header.group(2).strip()}", sql.rstrip(';')))
+    return queries
@@ -0,0 +1,179 @@
+"""
+LEVEL UP - Fitness Tracking Platform
+Disk-backed result cache for the analytics queries
+Entries are keyed on the query text and parameters, expire after a TTL, are
+evicted least-recently-used first, and are dropped as soon as any table the
+query reads from changes (information_schema AUTO_INCREMENT or update time,
+metadata lookups that never scan the table).
+Configured from the environment:
+    FITNESS_CACHE_DIR, FITNESS_CACHE_TTL, FITNESS_CACHE_MAX_ENTRIES, FITNESS_CACHE
+"""
+
+import hashlib
+import os
+import pickle
+import re
+import time
+
+from mysql.connector import Error
+
+from db_pool import QUERY_TIMINGS, pooled_connection, read_sql
+
+CACHE_DIR = os.environ.get('FITNESS_CACHE_DIR',
+                           os.path.join(os.path.dirname(os.path.abspath(__file__)), '.query_cache'))
+# Seconds an entry stays valid even if its tables look unchanged
+CACHE_TTL = float(os.environ.get('FITNESS_CACHE_TTL', '3600'))
+CACHE_MAX_ENTRIES = int(os.environ.get('FITNESS_CACHE_MAX_ENTRIES', '64'))
+# FITNESS_CACHE=0 (or --no-cache in fitness.py) always goes to the database
+CACHE_ENABLED = os.environ.get('FITNESS_CACHE', '1') != '0'
+
+TABLE_PATTERN = re.compile(r'\b(?:FROM|JOIN)\s+`?(\w+)`?', re.IGNORECASE)
+
+# UPDATE_TIME moves on every insert, update and delete (it is NULL for InnoDB
+# tables untouched since the server started) but only has one-second
+# resolution; AUTO_INCREMENT also catches inserts within the same second.
+# NOW() is read with it, on the same clock, to spot versions whose second
+# has not finished yet (see store_entry)
+TABLE_VERSION_SQL = """
+    SELECT TABLE_NAME, AUTO_INCREMENT, UPDATE_TIME, NOW()
+    FROM information_schema.TABLES
+    WHERE TABLE_SCHEMA = DATABASE() AND LOWER(TABLE_NAME) IN ({placeholders})
+"""
+
+
+def query_tables(sql_query):
+    """Tables a query reads from, sorted"""
+    return sorted(set(TABLE_PATTERN.findall(sql_query)))
+
+
+def data_version(connection, tables):
+    """Cheap change signal for tables: ({table: (AUTO_INCREMENT, last update time)},
+    server time of the read, or None when no table was found).
+    Reads table metadata only, so a cache hit costs the same at any table size."""
+    if not tables:
+        return {}, None
+    cursor = connection.cursor()
+    try:
+        try:
+            # MySQL 8 caches these columns for a day by default; read them fresh
+            cursor.execute("SET SESSION information_schema_stats_expiry = 0")
+        except Error:
+            # Older servers have no such cache
+            pass
+        cursor.execute(TABLE_VERSION_SQL.format(placeholders=", ".join(["%s"] * len(tables))),
+                       [table.lower() for table in tables])
+        rows = cursor.fetchall()
+    finally:
+        cursor.close()
+    versions = {table.lower(): (auto_increment, updated) for table, auto_increment, updated, _ in rows}
+    read_at = rows[0][3] if rows else None
+    return {table: versions.get(table.lower()) for table in tables}, read_at
+
+
+def settled(version, read_at):
+    """False when a table was updated in the second its version was read (or later,
+    by a skewed clock): another update in that second would leave UPDATE_TIME and
+    so the version unchanged, and the entry would be served stale until the TTL"""
+    return all(table_version is None or table_version[1] is None or table_version[1] < read_at
+               for table_version in version.values())
+
+
+def cache_key(sql_query, params=None):
+    """Stable key for a query and its parameters"""
+    normalized = " ".join(sql_query.split())
+    return hashlib.sha256(f"{normalized}\0{params!r}".encode('utf-8')).hexdigest()
+
+
+def cache_path(key):
+    return os.path.join(CACHE_DIR, f"{key}.pkl")
+
+
+def load_entry(key):
+    """Cached entry for key, or None when missing or unreadable"""
+    try:
+        with open(cache_path(key), 'rb') as f:
+            return pickle.load(f)
+    except (OSError, pickle.UnpicklingError, EOFError):
+        return None
+
+
+def store_entry(key, entry):
+    """Write an entry atomically, then trim the cache. Entries whose version is not
+    settled are not written: the next read runs the query again."""
+    if not settled(entry['version'], entry['read_at']):
+        return
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    temp_path = f"{cache_path(key)}.{os.getpid()}.tmp"
+    with open(temp_path, 'wb') as f:
+        pickle.dump(entry, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(temp_path, cache_path(key))
+    evict(CACHE_MAX_ENTRIES)
+
+
+def evict(max_entries=CACHE_MAX_ENTRIES):
+    """Drop expired entries, then the least recently used beyond max_entries"""
+    try:
+        names = [name for name in os.listdir(CACHE_DIR) if name.endswith('.pkl')]
+    except FileNotFoundError:
+        return
+    entries = []
+    now = time.time()
+    for name in names:
+        path = os.path.join(CACHE_DIR, name)
+        try:
+            used = os.path.getmtime(path)
+        except OSError:
+            continue
+        # mtime is bumped on every hit, so an entry this old cannot be valid
+        if now - used > CACHE_TTL:
+            remove(path)
+        else:
+            entries.append((used, path))
+    entries.sort(reverse=True)
+    for _, path in entries[max_entries:]:
+        remove(path)
+
+
+def remove(path):
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+
+def clear_cache():
+    """Delete every cached result"""
+    evict(0)
+
+
+def cached_read_sql(sql_query, connection=None, params=None, label=None, ttl=None):
+    """read_sql backed by the disk cache.
+
+    A cached DataFrame is returned only while it is younger than the TTL and
+    every table the query reads has the same AUTO_INCREMENT and update time
+    as when it was stored. Otherwise the query runs and the result is cached.
+    """
+    if not CACHE_ENABLED:
+        return read_sql(sql_query, connection, params, label)
+    if connection is None:
+        with pooled_connection() as pooled:
+            return cached_read_sql(sql_query, pooled, params, label, ttl)
+
+    ttl = CACHE_TTL if ttl is None else ttl
+    key = cache_key(sql_query, params)
+    start = time.perf_counter()
+    version, read_at = data_version(connection, query_tables(sql_query))
+
+    entry = load_entry(key)
+    if entry and time.time() - entry['created'] <= ttl and entry['version'] == version:
+        os.utime(cache_path(key))
+        df = entry['df'].copy()
+        elapsed = time.perf_counter() - start
+        QUERY_TIMINGS.append({"label": f"{label or 'query'} (cached)", "seconds": elapsed, "rows": len(df)})
+        print(f"⚡ {label or 'query'}: cache hit in {elapsed * 1000:.1f} ms ({len(df)} rows)")
+        return df
+
+    df = read_sql(sql_query, connection, params, label)
+    store_entry(key, {"sql": sql_query, "params": params, "version": version, "read_at": read_at,
+                      "created": time.time(), "df": df})
+    return df
@@ -0,0 +1,301 @@
+"""
+LEVEL UP - Fitness Tracking Platform
+Pre-aggregated summary tables for the revenue and attendance analytics
+Triggers on Payments and User_Class queue the summary keys every insert,
+update and delete touches (a plan and day, a plan and payer, a class) in
+change tables with an AUTO_INCREMENT id. Each refresh recomputes only the
+queued keys from the fact tables and deletes the changes it applied, so
+report queries read a table whose size depends on plans, days and classes
+rather than on the number of payments or enrollments, and status changes
+(Pending -> Completed, Enrolled -> Attended) reach the summaries.
+Usage: python summary_tables.py [--setup | --rebuild] [summary ...]
+    --setup    create the summary and change tables and the triggers, then
+               build the summaries (run once after fitness.sql; re-runnable)
+    --rebuild  recompute the summaries from the full fact tables
+
+Triggers do not fire for foreign key cascades or partition exchange/drop
+(partition_maintenance.py), so deleting users, classes or plans, or
+archiving Payments partitions, needs a --rebuild, e.g. from a nightly job.
+"""
+
+import sys
+
+from mysql.connector import Error
+
+from db_pool import pooled_connection
+
+# ============================================
+# SETUP DDL
+# ============================================
+SUMMARY_DDL = [
+    """
+    CREATE TABLE IF NOT EXISTS Revenue_Daily_Summary (
+        subscription_id INT NOT NULL,
+        payment_day DATE NOT NULL,
+        payment_count INT NOT NULL,
+        completed_revenue DECIMAL(14,2) NOT NULL,
+        PRIMARY KEY (subscription_id, payment_day)
+    )
+    """,
+    # Distinct payers per plan are not additive across days, so they are kept as a set
+    """
+    CREATE TABLE IF NOT EXISTS Subscription_Subscribers (
+        subscription_id INT NOT NULL,
+        user_id INT NOT NULL,
+        PRIMARY KEY (subscription_id, user_id)
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS Attendance_Summary (
+        class_id INT NOT NULL,
+        attendance_status VARCHAR(20) NOT NULL,
+        enrolled_count INT NOT NULL,
+        PRIMARY KEY (class_id, attendance_status)
+    )
+    """,
+    # Change queues filled by the triggers below and emptied by each refresh
+    """
+    CREATE TABLE IF NOT EXISTS Payment_Changes (
+        change_id BIGINT PRIMARY KEY AUTO_INCREMENT,
+        subscription_id INT NULL,
+        user_id INT NOT NULL,
+        payment_day DATE NOT NULL
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS Enrollment_Changes (
+        change_id BIGINT PRIMARY KEY AUTO_INCREMENT,
+        class_id INT NOT NULL
+    )
+    """,
+    # Left by the earlier high-water-mark refresh
+    "DROP TABLE IF EXISTS Summary_Watermarks",
+]
+
+PAYMENT_KEYS = "({row}.subscription_id, {row}.user_id, DATE({row}.payment_date))"
+ENROLLMENT_KEYS = "({row}.class_id)"
+
+# Trigger -> (table, event, statement). Updates queue the old and the new
+# keys, since a row can move to another plan, day or class.
+SUMMARY_TRIGGERS = {
+    'trg_payments_summary_insert': ('Payments', 'INSERT', f"""
+        INSERT INTO Payment_Changes (subscription_id, user_id, payment_day)
+        VALUES {PAYMENT_KEYS.format(row='NEW')}"""),
+    'trg_payments_summary_update': ('Payments', 'UPDATE', f"""
+        INSERT INTO Payment_Changes (subscription_id, user_id, payment_day)
+        VALUES {PAYMENT_KEYS.format(row='OLD')}, {PAYMENT_KEYS.format(row='NEW')}"""),
+    'trg_payments_summary_delete': ('Payments', 'DELETE', f"""
+        INSERT INTO Payment_Changes (subscription_id, user_id, payment_day)
+        VALUES {PAYMENT_KEYS.format(row='OLD')}"""),
+    'trg_user_class_summary_insert': ('User_Class', 'INSERT', f"""
+        INSERT INTO Enrollment_Changes (class_id) VALUES {ENROLLMENT_KEYS.format(row='NEW')}"""),
+    'trg_user_class_summary_update': ('User_Class', 'UPDATE', f"""
+        INSERT INTO Enrollment_Changes (class_id)
+        VALUES {ENROLLMENT_KEYS.format(row='OLD')}, {ENROLLMENT_KEYS.format(row='NEW')}"""),
+    'trg_user_class_summary_delete': ('User_Class', 'DELETE', f"""
+        INSERT INTO Enrollment_Changes (class_id) VALUES {ENROLLMENT_KEYS.format(row='OLD')}"""),
+}
+
+# ============================================
+# AGGREGATES
+# ============================================
+# Each aggregate reads either the whole fact table (rebuild) or only the
+# rows behind the queued keys (refresh); {source} supplies the alias p or u
+REVENUE_DAILY_SQL = """
+    INSERT INTO Revenue_Daily_Summary (subscription_id, payment_day, payment_count, completed_revenue)
+    SELECT p.subscription_id, DATE(p.payment_date), COUNT(*),
+           SUM(CASE WHEN p.status = 'Completed' THEN p.amount ELSE 0 END)
+    FROM {source}
+    WHERE p.subscription_id IS NOT NULL
+    GROUP BY p.subscription_id, DATE(p.payment_date)
+"""
+
+SUBSCRIBERS_SQL = """
+    INSERT INTO Subscription_Subscribers (subscription_id, user_id)
+    SELECT DISTINCT p.subscription_id, p.user_id
+    FROM {source}
+    WHERE p.subscription_id IS NOT NULL
+"""
+
+ATTENDANCE_SQL = """
+    INSERT INTO Attendance_Summary (class_id, attendance_status, enrolled_count)
+    SELECT u.class_id, COALESCE(u.attendance_status, ''), COUNT(*)
+    FROM {source}
+    GROUP BY u.class_id, COALESCE(u.attendance_status, '')
+"""
+
+CHANGED_DAYS = """
+    (SELECT DISTINCT subscription_id, payment_day FROM Payment_Changes
+     WHERE change_id <= %(high)s AND subscription_id IS NOT NULL) c
+"""
+CHANGED_PAYERS = """
+    (SELECT DISTINCT subscription_id, user_id FROM Payment_Changes
+     WHERE change_id <= %(high)s AND subscription_id IS NOT NULL) c
+"""
+CHANGED_CLASSES = """
+    (SELECT DISTINCT class_id FROM Enrollment_Changes WHERE change_id <= %(high)s) c
+"""
+
+# Queued keys are recomputed from scratch: their summary rows are deleted,
+# then re-aggregated from the fact rows still behind them (none after a delete)
+REVENUE_REFRESH_SQL = [
+    f"""
+    DELETE r FROM Revenue_Daily_Summary r
+    JOIN {CHANGED_DAYS} ON r.subscription_id = c.subscription_id AND r.payment_day = c.payment_day
+    """,
+    REVENUE_DAILY_SQL.format(source=f"""{CHANGED_DAYS}
+    JOIN Payments p ON p.subscription_id = c.subscription_id
+     AND p.payment_date >= c.payment_day AND p.payment_date < c.payment_day + INTERVAL 1 DAY"""),
+    f"""
+    DELETE s FROM Subscription_Subscribers s
+    JOIN {CHANGED_PAYERS} ON s.subscription_id = c.subscription_id AND s.user_id = c.user_id
+    """,
+    SUBSCRIBERS_SQL.format(source=f"""{CHANGED_PAYERS}
+    JOIN Payments p ON p.subscription_id = c.subscription_id AND p.user_id = c.user_id"""),
+]
+
+ATTENDANCE_REFRESH_SQL = [
+    f"DELETE a FROM Attendance_Summary a JOIN {CHANGED_CLASSES} ON a.class_id = c.class_id",
+    ATTENDANCE_SQL.format(source=f"{CHANGED_CLASSES} JOIN User_Class u ON u.class_id = c.class_id"),
+]
+
+SUMMARIES = {
+    'revenue': {
+        'tables': ['Revenue_Daily_Summary', 'Subscription_Subscribers'],
+        'changes': 'Payment_Changes',
+        'refresh': REVENUE_REFRESH_SQL,
+        'rebuild': [REVENUE_DAILY_SQL.format(source="Payments p"), SUBSCRIBERS_SQL.format(source="Payments p")],
+    },
+    'attendance': {
+        'tables': ['Attendance_Summary'],
+        'changes': 'Enrollment_Changes',
+        'refresh': ATTENDANCE_REFRESH_SQL,
+        'rebuild': [ATTENDANCE_SQL.format(source="User_Class u")],
+    },
+}
+
+
+def install_summaries(connection):
+    """Create the summary and change tables and (re)create the triggers feeding
+    them; a setup step, not part of any report. Run rebuild_summary after it."""
+    cursor = connection.cursor()
+    try:
+        for ddl in SUMMARY_DDL:
+            cursor.execute(ddl)
+        for trigger, (table, event, statement) in SUMMARY_TRIGGERS.items():
+            cursor.execute(f"DROP TRIGGER IF EXISTS {trigger}")
+            cursor.execute(f"CREATE TRIGGER {trigger} AFTER {event} ON {table} FOR EACH ROW {statement}")
+        connection.commit()
+    finally:
+        cursor.close()
+
+
+def lock_changes(cursor, changes_table):
+    """Lock the queued changes up to the newest one; returns (newest change_id, count).
+
+    The locking read waits for writers whose changes are still uncommitted,
+    so no change below the mark is deleted unapplied, and concurrent
+    refreshes of the same summary queue here.
+    """
+    cursor.execute(f"SELECT MAX(change_id) FROM {changes_table}")
+    high = cursor.fetchone()[0]
+    if high is None:
+        return None, 0
+    cursor.execute(f"SELECT COUNT(*) FROM {changes_table} WHERE change_id <= %s FOR UPDATE", (high,))
+    return high, cursor.fetchone()[0]
+
+
+def apply_changes(cursor, summary_name):
+    """Recompute the keys queued for a summary and dequeue them; returns the
+    number of changes applied"""
+    summary = SUMMARIES[summary_name]
+    high, count = lock_changes(cursor, summary['changes'])
+    if not count:
+        return 0
+    for sql in summary['refresh']:
+        cursor.execute(sql, {'high': high})
+    cursor.execute(f"DELETE FROM {summary['changes']} WHERE change_id <= %s", (high,))
+    return count
+
+
+def refresh_summary(summary_name, connection=None):
+    """Bring one summary up to date in a single transaction; returns the number
+    of queued changes applied. The tables must exist (see install_summaries)."""
+    if connection is None:
+        with pooled_connection() as pooled:
+            return refresh_summary(summary_name, pooled)
+
+    cursor = connection.cursor()
+    try:
+        result = apply_changes(cursor, summary_name)
+        connection.commit()
+        return result
+    except Error:
+        connection.rollback()
+        raise
+    finally:
+        cursor.close()
+
+
+def rebuild_summary(summary_name, connection=None):
+    """Empty a summary and its change queue, then recompute it from the full fact table"""
+    if connection is None:
+        with pooled_connection() as pooled:
+            return rebuild_summary(summary_name, pooled)
+
+    summary = SUMMARIES[summary_name]
+    cursor = connection.cursor()
+    try:
+        # Changes committed after this point stay queued for the next refresh
+        high, _ = lock_changes(cursor, summary['changes'])
+        if high is not None:
+            cursor.execute(f"DELETE FROM {summary['changes']} WHERE change_id <= %s", (high,))
+        for table in summary['tables']:
+            cursor.execute(f"DELETE FROM {table}")
+        for sql in summary['rebuild']:
+            cursor.execute(sql)
+        connection.commit()
+    except Error:
+        connection.rollback()
+        raise
+    finally:
+        cursor.close()
+
+
+# ============================================
+# MAIN EXECUTION
+# ============================================
+if __name__ == "__main__":
+    import argparse
+
+    arg_parser = argparse.ArgumentParser(description="Set up, refresh or rebuild the analytics summary tables")
+    mode = arg_parser.add_mutually_exclusive_group()
+    mode.add_argument("--setup", action="store_true",
+                      help="Create the summary tables and change triggers, then build the summaries")
+    mode.add_argument("--rebuild", action="store_true",
+                      help="Recompute the summaries from the full fact tables")
+    arg_parser.add_argument("summaries", nargs="*", metavar="summary",
+                            help=f"Summaries to refresh: {', '.join(SUMMARIES)} (default: all)")
+    args = arg_parser.parse_args()
+    unknown = set(args.summaries) - set(SUMMARIES)
+    if unknown:
+        arg_parser.error(f"unknown summary: {', '.join(sorted(unknown))}")
+
+    if args.setup:
+        try:
+            with pooled_connection() as connection:
+                install_summaries(connection)
+            print(f"✅ Created summary tables and {len(SUMMARY_TRIGGERS)} change triggers")
+        except Error as e:
+            print(f"❌ Error setting up summary tables: {e}")
+            sys.exit(1)
+
+    for name in args.summaries or list(SUMMARIES):
+        try:
+            if args.setup or args.rebuild:
+                rebuild_summary(name)
+                print(f"✅ Rebuilt {name} summary")
+            else:
+                print(f"✅ Refreshed {name} summary ({refresh_summary(name)} queued changes applied)")
+        except Error as e:
+            print(f"❌ Error refreshing {name} summary: {e}")
@@ -1,18 +1,49 @@
 """
 Fitness Management System - DML Data Generator
-Generates 30 records per table with referential integrity
-Outputs SQL file ready for MySQL execution
+Generates records for every table with referential integrity
+(30 per table by default, configurable per table for load testing)
+Streams single-row INSERTs, multi-row INSERT batches, or TSV/CSV files
+with a LOAD DATA LOCAL INFILE script, ready for MySQL execution
 """
 
+import argparse
+import hashlib
+import os
 import random
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from datetime import datetime, timedelta
+from itertools import islice
 
-def random_date(start_year=2023, end_year=2025):
+# Rows generated per table, in dependency order
+DEFAULT_ROW_COUNTS = {
+    "Subscriptions": 30,
+    "Trainers": 30,
+    "Certifications": 30,
+    "Users": 30,
+    "Classes": 30,
+    "User_Class": 30,
+    "Payments": 30,
+    "Progress_Tracking": 30,
+    "Goals": 30,
+    "Workout_Plan": 30,
+    "Exercises": 30,
+    "Workout_Exercises": 30,
+    "Feedback": 30,
+    "Devices": 30,
+}
+
+# Rows generated, formatted and written to the output file per block
+DEFAULT_CHUNK_SIZE = 10000
+
+PASSWORD_CHARS = 'abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789'
+
+def random_date(start_year=2023, end_year=2025, rng=random):
     """Generate random datetime"""
     start = datetime(start_year, 1, 1)
     end = datetime(end_year, 12, 31)
     delta = end - start
-    random_days = random.randint(0, delta.days)
+    random_days = rng.randint(0, delta.days)
     return start + timedelta(days=random_days)
 
 def random_email(name, domain="fitapp.com"):
@@ -20,454 +51,835 @@ def random_email(name, domain="fitapp.com"):
     clean_name = name.lower().replace(" ", ".")
     return f"{clean_name}@{domain}"
 
-def generate_sql():
-    sql_statements = []
-    
-    # ============================================
-    # 1. SUBSCRIPTIONS (30 records)
-    # ============================================
-    sql_statements.append("-- ============================================")
-    sql_statements.append("-- SUBSCRIPTIONS DATA (30 records)")
-    sql_statements.append("-- ============================================")
-    
-    subscription_plans = [
-        ("Basic Monthly", 1, 29.99, "Access to gym, Basic tracking"),
-        ("Basic Quarterly", 3, 79.99, "Access to gym, Basic tracking, 10% discount"),
-        ("Basic Annual", 12, 299.99, "Access to gym, Basic tracking, 20% discount"),
-        ("Premium Monthly", 1, 49.99, "Gym access, Personal trainer, Advanced tracking"),
-        ("Premium Quarterly", 3, 134.99, "Gym access, Personal trainer, Advanced tracking, 10% discount"),
-        ("Premium Annual", 12, 499.99, "Gym access, Personal trainer, Advanced tracking, 20% discount"),
-        ("Elite Monthly", 1, 99.99, "All features, Unlimited classes, Nutrition plans"),
-        ("Elite Quarterly", 3, 269.99, "All features, Unlimited classes, Nutrition plans, 10% discount"),
-        ("Elite Annual", 12, 999.99, "All features, Unlimited classes, Nutrition plans, 20% discount"),
-        ("Student Monthly", 1, 19.99, "Basic access for students"),
-    ]
-    
-    # Extend to 30 by adding variations
-    for i in range(30):
-        if i < len(subscription_plans):
-            plan = subscription_plans[i]
+def random_password(rng=random):
+    """Generate a bcrypt-looking password hash"""
+    return f"$2y$10${''.join(rng.choices(PASSWORD_CHARS, k=50))}"
+
+def cycle_name(names, i):
+    """Pick names[i], adding a cycle number once the list runs out so values stay unique"""
+    base = names[i % len(names)]
+    cycle = i // len(names)
+    return base if cycle == 0 else f"{base} {cycle + 1}"
+
+def row_range(total, start=0, stop=None):
+    """Row indexes [start, stop) of a table with total rows"""
+    return range(start, total if stop is None else min(stop, total))
+
+# Junction tables and the parent tables whose id pairs form their primary key
+PAIR_TABLES = {
+    "User_Class": ("Users", "Classes"),
+    "Workout_Exercises": ("Workout_Plan", "Exercises"),
+}
+
+# Tables whose rows draw foreign keys from each parent table
+PARENT_TABLES = {
+    "Certifications": ("Trainers",),
+    "Users": ("Subscriptions", "Trainers"),
+    "Classes": ("Trainers",),
+    "User_Class": ("Users", "Classes"),
+    "Payments": ("Users", "Subscriptions"),
+    "Progress_Tracking": ("Users",),
+    "Goals": ("Users",),
+    "Workout_Plan": ("Users", "Trainers", "Goals"),
+    "Workout_Exercises": ("Workout_Plan", "Exercises"),
+    "Feedback": ("Users", "Trainers", "Classes"),
+    "Devices": ("Users",),
+}
+
+def resolve_row_counts(row_counts=None, scale=1):
+    """Scale the default row counts and apply per-table overrides"""
+    counts = {table: max(1, int(n * scale)) for table, n in DEFAULT_ROW_COUNTS.items()}
+    for table, n in (row_counts or {}).items():
+        if table not in counts:
+            raise ValueError(f"Unknown table: {table}")
+        counts[table] = int(n)
+        if counts[table] < 0:
+            raise ValueError(f"{table} row count must not be negative")
+
+    # A child table with rows needs ids to draw from; empty children are fine
+    for child, parents in PARENT_TABLES.items():
+        for parent in parents:
+            if counts[child] and not counts[parent]:
+                raise ValueError(f"{parent} needs at least one row: {child} has {counts[child]} rows referencing it")
+
+    for table, (left, right) in PAIR_TABLES.items():
+        if counts[table] > counts[left] * counts[right]:
+            raise ValueError(
+                f"{table} needs {counts[table]} unique ({left}, {right}) pairs "
+                f"but only {counts[left] * counts[right]} exist"
+            )
+    return counts
+
+def _feistel_round(value, round_key):
+    value = ((value ^ round_key) * 0x9E3779B97F4A7C15) & 0xFFFFFFFFFFFFFFFF
+    return value ^ (value >> 29)
+
+def permuted_index(i, n, key):
+    """Map i in [0, n) to its position in a keyed pseudo-random permutation of [0, n).
+
+    A 4-round Feistel network is a bijection on the smallest even-width bit
+    domain covering n; cycle-walking keeps the result inside [0, n). That
+    domain is under 4n, so each call takes fewer than 4 walks on average and
+    needs no memory of earlier outputs.
+    """
+    half = max(1, ((n - 1).bit_length() + 1) // 2)
+    mask = (1 << half) - 1
+    round_keys = [(key >> (16 * r)) & 0xFFFF | (r << 16) for r in range(4)]
+    x = i
+    while True:
+        left, right = x >> half, x & mask
+        for round_key in round_keys:
+            left, right = right, left ^ (_feistel_round(right, round_key) & mask)
+        x = (left << half) | right
+        if x < n:
+            return x
+
+def unique_pair(i, n_left, n_right, key):
+    """The i-th distinct 1-based (left_id, right_id) pair, sampled without replacement"""
+    n = n_left * n_right
+    if not 0 <= i < n:
+        raise ValueError(f"Pair index {i} is outside the {n_left} x {n_right} key space")
+    index = permuted_index(i, n, key)
+    return index // n_right + 1, index % n_right + 1
+
+def sql_literal(value):
+    """Format a Python value as a MySQL literal"""
+    if value is None:
+        return "NULL"
+    if isinstance(value, str):
+        return "'" + value.replace("'", "''") + "'"
+    if isinstance(value, datetime):
+        return f"'{value.strftime('%Y-%m-%d %H:%M:%S')}'"
+    return str(value)
+
+# ============================================
+# ROW GENERATORS
+# Each yields one tuple per row, in the table's column order
+# ============================================
+
+SUBSCRIPTION_PLANS = [
+    ("Basic Monthly", 1, 29.99, "Access to gym, Basic tracking"),
+    ("Basic Quarterly", 3, 79.99, "Access to gym, Basic tracking, 10% discount"),
+    ("Basic Annual", 12, 299.99, "Access to gym, Basic tracking, 20% discount"),
+    ("Premium Monthly", 1, 49.99, "Gym access, Personal trainer, Advanced tracking"),
+    ("Premium Quarterly", 3, 134.99, "Gym access, Personal trainer, Advanced tracking, 10% discount"),
+    ("Premium Annual", 12, 499.99, "Gym access, Personal trainer, Advanced tracking, 20% discount"),
+    ("Elite Monthly", 1, 99.99, "All features, Unlimited classes, Nutrition plans"),
+    ("Elite Quarterly", 3, 269.99, "All features, Unlimited classes, Nutrition plans, 10% discount"),
+    ("Elite Annual", 12, 999.99, "All features, Unlimited classes, Nutrition plans, 20% discount"),
+    ("Student Monthly", 1, 19.99, "Basic access for students"),
+]
+
+def subscriptions_rows(counts, rng=random, start=0, stop=None):
+    # Extend past the named plans by adding variations
+    for i in row_range(counts["Subscriptions"], start, stop):
+        if i < len(SUBSCRIPTION_PLANS):
+            yield SUBSCRIPTION_PLANS[i]
         else:
-            # Create variations
-            plan = (
+            yield (
                 f"Custom Plan {i+1}",
-                random.choice([1, 3, 6, 12]),
-                round(random.uniform(19.99, 149.99), 2),
+                rng.choice([1, 3, 6, 12]),
+                round(rng.uniform(19.99, 149.99), 2),
                 f"Custom features package {i+1}"
             )
-        
-        sql_statements.append(
-            f"INSERT INTO Subscriptions (plan_name, duration_months, price, features) VALUES "
-            f"('{plan[0]}', {plan[1]}, {plan[2]}, '{plan[3]}');"
-        )
-    
-    # ============================================
-    # 2. TRAINERS (30 records - without certification_id initially)
-    # ============================================
-    sql_statements.append("\n-- ============================================")
-    sql_statements.append("-- TRAINERS DATA (30 records)")
-    sql_statements.append("-- ============================================")
-    
-    trainer_names = [
-        "Mike Johnson", "Sarah Williams", "David Brown", "Emma Davis",
-        "James Miller", "Olivia Wilson", "Robert Moore", "Sophia Taylor",
-        "Michael Anderson", "Isabella Thomas", "William Jackson", "Mia White",
-        "Daniel Harris", "Charlotte Martin", "Matthew Thompson", "Amelia Garcia",
-        "Joseph Martinez", "Harper Robinson", "Christopher Clark", "Evelyn Rodriguez",
-        "Andrew Lewis", "Abigail Lee", "Joshua Walker", "Emily Hall",
-        "Ryan Allen", "Elizabeth Young", "Nicholas Hernandez", "Sofia King",
-        "Alexander Wright", "Avery Lopez"
-    ]
-    
-    specializations = [
-        "Strength Training", "Yoga", "Cardio", "CrossFit", "Pilates",
-        "HIIT", "Boxing", "Weight Loss", "Bodybuilding", "Functional Training"
-    ]
-    
-    for i, name in enumerate(trainer_names):
-        sql_statements.append(
-            f"INSERT INTO Trainers (full_name, email, password, specialization, experience_years, rating) VALUES "
-            f"('{name}', '{random_email(name, 'trainers.fit')}', "
-            f"'$2y$10${''.join(random.choices('abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789', k=50))}', "
-            f"'{random.choice(specializations)}', "
-            f"{round(random.uniform(1.0, 20.0), 1)}, "
-            f"{round(random.uniform(3.5, 5.0), 2)});"
+
+TRAINER_NAMES = [
+    "Mike Johnson", "Sarah Williams", "David Brown", "Emma Davis",
+    "James Miller", "Olivia Wilson", "Robert Moore", "Sophia Taylor",
+    "Michael Anderson", "Isabella Thomas", "William Jackson", "Mia White",
+    "Daniel Harris", "Charlotte Martin", "Matthew Thompson", "Amelia Garcia",
+    "Joseph Martinez", "Harper Robinson", "Christopher Clark", "Evelyn Rodriguez",
+    "Andrew Lewis", "Abigail Lee", "Joshua Walker", "Emily Hall",
+    "Ryan Allen", "Elizabeth Young", "Nicholas Hernandez", "Sofia King",
+    "Alexander Wright", "Avery Lopez"
+]
+
+SPECIALIZATIONS = [
+    "Strength Training", "Yoga", "Cardio", "CrossFit", "Pilates",
+    "HIIT", "Boxing", "Weight Loss", "Bodybuilding", "Functional Training"
+]
+
+def trainers_rows(counts, rng=random, start=0, stop=None):
+    # certification_id is filled in later by certification_updates()
+    for i in row_range(counts["Trainers"], start, stop):
+        name = cycle_name(TRAINER_NAMES, i)
+        yield (
+            name, random_email(name, 'trainers.fit'), random_password(rng),
+            rng.choice(SPECIALIZATIONS),
+            round(rng.uniform(1.0, 20.0), 1),
+            round(rng.uniform(3.5, 5.0), 2),
         )
-    
-    # ============================================
-    # 3. CERTIFICATIONS (30 records)
-    # ============================================
-    sql_statements.append("\n-- ============================================")
-    sql_statements.append("-- CERTIFICATIONS DATA (30 records)")
-    sql_statements.append("-- ============================================")
-    
-    cert_names = [
-        "Certified Personal Trainer", "Certified Strength Coach", "Yoga Instructor Certification",
-        "CrossFit Level 1", "Pilates Instructor", "NASM CPT", "ACE Personal Trainer",
-        "ISSA Fitness Trainer", "Nutrition Specialist", "Sports Nutrition Certificate"
-    ]
-    
-    cert_issuers = [
-        "NASM", "ACE", "ISSA", "ACSM", "CrossFit Inc", "Yoga Alliance",
-        "NSCA", "AFAA", "Cooper Institute", "NCSF"
-    ]
-    
-    for i in range(30):
-        trainer_id = (i % 30) + 1
-        issue_date = random_date(2020, 2024)
+
+CERT_NAMES = [
+    "Certified Personal Trainer", "Certified Strength Coach", "Yoga Instructor Certification",
+    "CrossFit Level 1", "Pilates Instructor", "NASM CPT", "ACE Personal Trainer",
+    "ISSA Fitness Trainer", "Nutrition Specialist", "Sports Nutrition Certificate"
+]
+
+CERT_ISSUERS = [
+    "NASM", "ACE", "ISSA", "ACSM", "CrossFit Inc", "Yoga Alliance",
+    "NSCA", "AFAA", "Cooper Institute", "NCSF"
+]
+
+def certifications_rows(counts, rng=random, start=0, stop=None):
+    for i in row_range(counts["Certifications"], start, stop):
+        trainer_id = (i % counts["Trainers"]) + 1
+        issue_date = random_date(2020, 2024, rng)
         expiry_date = issue_date + timedelta(days=365*3)  # 3 years validity
-        
-        sql_statements.append(
-            f"INSERT INTO Certifications (trainer_id, certification_name, issued_by, issue_date, expiry_date) VALUES "
-            f"({trainer_id}, '{random.choice(cert_names)}', '{random.choice(cert_issuers)}', "
-            f"'{issue_date.strftime('%Y-%m-%d %H:%M:%S')}', '{expiry_date.strftime('%Y-%m-%d %H:%M:%S')}');"
-        )
-    
-    # ============================================
-    # Update Trainers with certification_id
-    # ============================================
-    sql_statements.append("\n-- ============================================")
-    sql_statements.append("-- UPDATE TRAINERS with certification_id")
-    sql_statements.append("-- ============================================")
-    
-    for i in range(1, 31):
+        yield (trainer_id, rng.choice(CERT_NAMES), rng.choice(CERT_ISSUERS), issue_date, expiry_date)
+
+def certification_updates(counts, rng=random, start=0, stop=None):
+    """Yield (certification_id, trainer_id) for trainers that hold their own certification"""
+    for i in row_range(min(counts["Trainers"], counts["Certifications"]), start, stop):
         # 80% of trainers have certification
-        if random.random() < 0.8:
-            cert_id = i
-            sql_statements.append(f"UPDATE Trainers SET certification_id = {cert_id} WHERE trainer_id = {i};")
-    
-    # ============================================
-    # 4. USERS (30 records)
-    # ============================================
-    sql_statements.append("\n-- ============================================")
-    sql_statements.append("-- USERS DATA (30 records)")
-    sql_statements.append("-- ============================================")
-    
-    user_names = [
-        "John Smith", "Alice Johnson", "Bob Williams", "Carol Brown",
-        "David Jones", "Eve Garcia", "Frank Miller", "Grace Davis",
-        "Henry Rodriguez", "Ivy Martinez", "Jack Hernandez", "Kelly Lopez",
-        "Leo Gonzalez", "Megan Wilson", "Nathan Anderson", "Olivia Thomas",
-        "Peter Taylor", "Quinn Moore", "Rachel Jackson", "Steve Martin",
-        "Tina Lee", "Uma Perez", "Victor Thompson", "Wendy White",
-        "Xavier Harris", "Yara Sanchez", "Zack Clark", "Amy Ramirez",
-        "Brian Lewis", "Chloe Robinson"
-    ]
-    
-    genders = ["Male", "Female", "Non-binary", "Prefer not to say"]
-    goals = ["Weight Loss", "Muscle Gain", "General Fitness", "Endurance", "Flexibility"]
-    
-    for i, name in enumerate(user_names):
+        if rng.random() < 0.8:
+            yield (i + 1, i + 1)
+
+USER_NAMES = [
+    "John Smith", "Alice Johnson", "Bob Williams", "Carol Brown",
+    "David Jones", "Eve Garcia", "Frank Miller", "Grace Davis",
+    "Henry Rodriguez", "Ivy Martinez", "Jack Hernandez", "Kelly Lopez",
+    "Leo Gonzalez", "Megan Wilson", "Nathan Anderson", "Olivia Thomas",
+    "Peter Taylor", "Quinn Moore", "Rachel Jackson", "Steve Martin",
+    "Tina Lee", "Uma Perez", "Victor Thompson", "Wendy White",
+    "Xavier Harris", "Yara Sanchez", "Zack Clark", "Amy Ramirez",
+    "Brian Lewis", "Chloe Robinson"
+]
+
+GENDERS = ["Male", "Female", "Non-binary", "Prefer not to say"]
+USER_GOALS = ["Weight Loss", "Muscle Gain", "General Fitness", "Endurance", "Flexibility"]
+
+def users_rows(counts, rng=random, start=0, stop=None):
+    for i in row_range(counts["Users"], start, stop):
+        name = cycle_name(USER_NAMES, i)
         # 70% have subscriptions
-        subscription_id = random.randint(1, 30) if random.random() < 0.7 else "NULL"
+        subscription_id = rng.randint(1, counts["Subscriptions"]) if rng.random() < 0.7 else None
         # 50% have trainers
-        trainer_id = random.randint(1, 30) if random.random() < 0.5 else "NULL"
-        
-        sql_statements.append(
-            f"INSERT INTO Users (full_name, email, password, gender, age, height, weight, goal, subscription_id, trainer_id) VALUES "
-            f"('{name}', '{random_email(name, 'users.fit')}', "
-            f"'$2y$10${''.join(random.choices('abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789', k=50))}', "
-            f"'{random.choice(genders)}', {random.randint(18, 65)}, "
-            f"{round(random.uniform(150.0, 200.0), 2)}, {round(random.uniform(50.0, 120.0), 2)}, "
-            f"'{random.choice(goals)}', {subscription_id}, {trainer_id});"
+        trainer_id = rng.randint(1, counts["Trainers"]) if rng.random() < 0.5 else None
+        yield (
+            name, random_email(name, 'users.fit'), random_password(rng),
+            rng.choice(GENDERS), rng.randint(18, 65),
+            round(rng.uniform(150.0, 200.0), 2), round(rng.uniform(50.0, 120.0), 2),
+            rng.choice(USER_GOALS), subscription_id, trainer_id,
         )
-    
-    # ============================================
-    # 5. CLASSES (30 records)
-    # ============================================
-    sql_statements.append("\n-- ============================================")
-    sql_statements.append("-- CLASSES DATA (30 records)")
-    sql_statements.append("-- ============================================")
-    
-    class_names = [
-        "Morning Yoga", "HIIT Blast", "Spin Class", "Zumba Dance",
-        "CrossFit WOD", "Pilates Core", "Boxing Bootcamp", "Strength Training",
-        "Cardio Kickboxing", "Power Yoga"
-    ]
-    
-    categories = ["Cardio", "Strength", "Flexibility", "Dance", "Martial Arts"]
-    modes = ["In-Person", "Virtual", "Hybrid"]
-    
-    for i in range(30):
-        trainer_id = random.randint(1, 30)
-        schedule_date = random_date(2025, 2025) + timedelta(days=random.randint(1, 90))
-        
-        sql_statements.append(
-            f"INSERT INTO Classes (trainer_id, class_name, category, mode, schedule_date, duration_minutes, max_participants) VALUES "
-            f"({trainer_id}, '{random.choice(class_names)} {i+1}', '{random.choice(categories)}', "
-            f"'{random.choice(modes)}', '{schedule_date.strftime('%Y-%m-%d %H:%M:%S')}', "
-            f"{random.choice([30, 45, 60, 90])}, {random.randint(10, 50)});"
-        )
-    
-    # ============================================
-    # 6. USER_CLASS (30 records)
-    # ============================================
-    sql_statements.append("\n-- ============================================")
-    sql_statements.append("-- USER_CLASS DATA (30 records)")
-    sql_statements.append("-- ============================================")
-    
-    attendance_statuses = ["Enrolled", "Attended", "Missed", "Cancelled"]
-    used_combinations = set()
-    
-    for i in range(30):
-        # Ensure unique user_id, class_id combinations
-        while True:
-            user_id = random.randint(1, 30)
-            class_id = random.randint(1, 30)
-            if (user_id, class_id) not in used_combinations:
-                used_combinations.add((user_id, class_id))
-                break
-        
-        enrollment_date = random_date(2024, 2025)
-        
-        sql_statements.append(
-            f"INSERT INTO User_Class (user_id, class_id, enrollment_date, attendance_status) VALUES "
-            f"({user_id}, {class_id}, '{enrollment_date.strftime('%Y-%m-%d %H:%M:%S')}', '{random.choice(attendance_statuses)}');"
+
+CLASS_NAMES = [
+    "Morning Yoga", "HIIT Blast", "Spin Class", "Zumba Dance",
+    "CrossFit WOD", "Pilates Core", "Boxing Bootcamp", "Strength Training",
+    "Cardio Kickboxing", "Power Yoga"
+]
+
+CLASS_CATEGORIES = ["Cardio", "Strength", "Flexibility", "Dance", "Martial Arts"]
+CLASS_MODES = ["In-Person", "Virtual", "Hybrid"]
+
+def classes_rows(counts, rng=random, start=0, stop=None):
+    for i in row_range(counts["Classes"], start, stop):
+        trainer_id = rng.randint(1, counts["Trainers"])
+        schedule_date = random_date(2025, 2025, rng) + timedelta(days=rng.randint(1, 90))
+        yield (
+            trainer_id, f"{rng.choice(CLASS_NAMES)} {i+1}", rng.choice(CLASS_CATEGORIES),
+            rng.choice(CLASS_MODES), schedule_date,
+            rng.choice([30, 45, 60, 90]), rng.randint(10, 50),
         )
-    
-    # ============================================
-    # 7. PAYMENTS (30 records)
-    # ============================================
-    sql_statements.append("\n-- ============================================")
-    sql_statements.append("-- PAYMENTS DATA (30 records)")
-    sql_statements.append("-- ============================================")
-    
-    payment_methods = ["Credit Card", "Debit Card", "PayPal", "Bank Transfer", "Apple Pay", "Google Pay"]
-    payment_statuses = ["Completed", "Pending", "Failed", "Refunded"]
-    
-    for i in range(30):
-        user_id = (i % 30) + 1
-        subscription_id = random.randint(1, 30) if random.random() < 0.8 else "NULL"
-        payment_date = random_date(2024, 2025)
-        
-        sql_statements.append(
-            f"INSERT INTO Payments (user_id, subscription_id, payment_date, amount, payment_method, status) VALUES "
-            f"({user_id}, {subscription_id}, '{payment_date.strftime('%Y-%m-%d %H:%M:%S')}', "
-            f"{round(random.uniform(19.99, 999.99), 2)}, '{random.choice(payment_methods)}', '{random.choice(payment_statuses)}');"
+
+ATTENDANCE_STATUSES = ["Enrolled", "Attended", "Missed", "Cancelled"]
+
+def user_class_rows(counts, rng=random, start=0, stop=None, key=None):
+    # Row i takes the i-th pair of a keyed permutation, so pairs never repeat
+    if key is None:
+        key = rng.getrandbits(64)
+    for i in row_range(counts["User_Class"], start, stop):
+        user_id, class_id = unique_pair(i, counts["Users"], counts["Classes"], key)
+        enrollment_date = random_date(2024, 2025, rng)
+        yield (user_id, class_id, enrollment_date, rng.choice(ATTENDANCE_STATUSES))
+
+PAYMENT_METHODS = ["Credit Card", "Debit Card", "PayPal", "Bank Transfer", "Apple Pay", "Google Pay"]
+PAYMENT_STATUSES = ["Completed", "Pending", "Failed", "Refunded"]
+
+def payments_rows(counts, rng=random, start=0, stop=None):
+    for i in row_range(counts["Payments"], start, stop):
+        user_id = (i % counts["Users"]) + 1
+        subscription_id = rng.randint(1, counts["Subscriptions"]) if rng.random() < 0.8 else None
+        payment_date = random_date(2024, 2025, rng)
+        yield (
+            user_id, subscription_id, payment_date,
+            round(rng.uniform(19.99, 999.99), 2), rng.choice(PAYMENT_METHODS), rng.choice(PAYMENT_STATUSES),
         )
-    
-    # ============================================
-    # 8. PROGRESS_TRACKING (30 records)
-    # ============================================
-    sql_statements.append("\n-- ============================================")
-    sql_statements.append("-- PROGRESS_TRACKING DATA (30 records)")
-    sql_statements.append("-- ============================================")
-    
-    for i in range(30):
-        user_id = (i % 30) + 1
-        date = random_date(2024, 2025)
-        weight = round(random.uniform(50.0, 120.0), 2)
-        height = round(random.uniform(150.0, 200.0), 2)
+
+def progress_tracking_rows(counts, rng=random, start=0, stop=None):
+    for i in row_range(counts["Progress_Tracking"], start, stop):
+        user_id = (i % counts["Users"]) + 1
+        date = random_date(2024, 2025, rng)
+        weight = round(rng.uniform(50.0, 120.0), 2)
+        height = round(rng.uniform(150.0, 200.0), 2)
         bmi = round(weight / ((height/100) ** 2), 2)
-        
-        sql_statements.append(
-            f"INSERT INTO Progress_Tracking (user_id, date, calories_burned, steps, workout_time_min, weight, bmi) VALUES "
-            f"({user_id}, '{date.strftime('%Y-%m-%d %H:%M:%S')}', "
-            f"{random.randint(100, 1000)}, {random.randint(1000, 20000)}, "
-            f"{random.randint(15, 120)}, {weight}, {bmi});"
+        yield (
+            user_id, date, rng.randint(100, 1000), rng.randint(1000, 20000),
+            rng.randint(15, 120), weight, bmi,
         )
-    
-    # ============================================
-    # 9. GOALS (30 records)
-    # ============================================
-    sql_statements.append("\n-- ============================================")
-    sql_statements.append("-- GOALS DATA (30 records)")
-    sql_statements.append("-- ============================================")
-    
-    goal_types = ["Weight Loss", "Weight Gain", "Muscle Building", "Fat Loss", "Endurance", "Flexibility"]
-    goal_statuses = ["Active", "Completed", "Abandoned", "On Hold"]
-    
-    for i in range(30):
-        user_id = (i % 30) + 1
-        start_date = random_date(2024, 2025)
-        end_date = start_date + timedelta(days=random.randint(30, 180))
-        
-        sql_statements.append(
-            f"INSERT INTO Goals (user_id, goal_type, target_weight, start_date, end_date, status) VALUES "
-            f"({user_id}, '{random.choice(goal_types)}', {round(random.uniform(50.0, 100.0), 2)}, "
-            f"'{start_date.strftime('%Y-%m-%d %H:%M:%S')}', '{end_date.strftime('%Y-%m-%d %H:%M:%S')}', "
-            f"'{random.choice(goal_statuses)}');"
-        )
-    
-    # ============================================
-    # 10. WORKOUT_PLAN (30 records)
-    # ============================================
-    sql_statements.append("\n-- ============================================")
-    sql_statements.append("-- WORKOUT_PLAN DATA (30 records)")
-    sql_statements.append("-- ============================================")
-    
-    plan_names = [
-        "Beginner's Start", "Fat Burn Challenge", "Muscle Builder Pro",
-        "Cardio Blast", "Strength Foundation", "HIIT Master", "Endurance Builder",
-        "Core Crusher", "Full Body Transformation", "Athletic Performance"
-    ]
-    
-    for i in range(30):
-        user_id = (i % 30) + 1
-        trainer_id = random.randint(1, 30) if random.random() < 0.6 else "NULL"
-        goal_id = (i % 30) + 1 if random.random() < 0.7 else "NULL"
-        start_date = random_date(2024, 2025)
-        end_date = start_date + timedelta(days=random.randint(30, 180))
-        
-        sql_statements.append(
-            f"INSERT INTO Workout_Plan (user_id, trainer_id, goal_id, plan_name, plan_description, start_date, end_date) VALUES "
-            f"({user_id}, {trainer_id}, {goal_id}, '{random.choice(plan_names)} {i+1}', "
-            f"'Customized workout plan focusing on specific fitness goals and progress tracking', "
-            f"'{start_date.strftime('%Y-%m-%d %H:%M:%S')}', '{end_date.strftime('%Y-%m-%d %H:%M:%S')}');"
-        )
-    
-    # ============================================
-    # 11. EXERCISES (30 records)
-    # ============================================
-    sql_statements.append("\n-- ============================================")
-    sql_statements.append("-- EXERCISES DATA (30 records)")
-    sql_statements.append("-- ============================================")
-    
-    exercises = [
-        ("Push-ups", "Strength", "Beginner", 300, "Chest"),
-        ("Squats", "Strength", "Beginner", 400, "Legs"),
-        ("Running", "Cardio", "Intermediate", 600, "Full Body"),
-        ("Bench Press", "Strength", "Intermediate", 350, "Chest"),
-        ("Deadlift", "Strength", "Advanced", 450, "Back"),
-        ("Pull-ups", "Strength", "Intermediate", 400, "Back"),
-        ("Lunges", "Strength", "Beginner", 350, "Legs"),
-        ("Plank", "Core", "Beginner", 200, "Core"),
-        ("Burpees", "Cardio", "Advanced", 800, "Full Body"),
-        ("Mountain Climbers", "Cardio", "Intermediate", 700, "Full Body"),
-        ("Bicep Curls", "Strength", "Beginner", 250, "Arms"),
-        ("Tricep Dips", "Strength", "Intermediate", 300, "Arms"),
-        ("Shoulder Press", "Strength", "Intermediate", 350, "Shoulders"),
-        ("Leg Press", "Strength", "Intermediate", 400, "Legs"),
-        ("Rowing", "Cardio", "Intermediate", 550, "Back"),
-        ("Box Jumps", "Plyometric", "Advanced", 650, "Legs"),
-        ("Kettlebell Swings", "Strength", "Intermediate", 500, "Full Body"),
-        ("Battle Ropes", "Cardio", "Advanced", 700, "Arms"),
-        ("Jumping Jacks", "Cardio", "Beginner", 450, "Full Body"),
-        ("Sit-ups", "Core", "Beginner", 250, "Core"),
-        ("Russian Twists", "Core", "Intermediate", 300, "Core"),
-        ("Leg Raises", "Core", "Intermediate", 280, "Core"),
-        ("Cycling", "Cardio", "Beginner", 500, "Legs"),
-        ("Swimming", "Cardio", "Intermediate", 600, "Full Body"),
-        ("Yoga Sun Salutation", "Flexibility", "Beginner", 200, "Full Body"),
-        ("Pilates Roll-up", "Core", "Intermediate", 250, "Core"),
-        ("Dumbbell Rows", "Strength", "Intermediate", 350, "Back"),
-        ("Calf Raises", "Strength", "Beginner", 200, "Legs"),
-        ("Side Plank", "Core", "Intermediate", 220, "Core"),
-        ("Wall Sits", "Strength", "Beginner", 300, "Legs")
-    ]
-    
-    for i, exercise in enumerate(exercises):
-        sql_statements.append(
-            f"INSERT INTO Exercises (name, type, difficulty_level, calories_per_hour, muscle_group) VALUES "
-            f"('{exercise[0]}', '{exercise[1]}', '{exercise[2]}', {exercise[3]}, '{exercise[4]}');"
+
+GOAL_TYPES = ["Weight Loss", "Weight Gain", "Muscle Building", "Fat Loss", "Endurance", "Flexibility"]
+GOAL_STATUSES = ["Active", "Completed", "Abandoned", "On Hold"]
+
+def goals_rows(counts, rng=random, start=0, stop=None):
+    for i in row_range(counts["Goals"], start, stop):
+        user_id = (i % counts["Users"]) + 1
+        start_date = random_date(2024, 2025, rng)
+        end_date = start_date + timedelta(days=rng.randint(30, 180))
+        yield (
+            user_id, rng.choice(GOAL_TYPES), round(rng.uniform(50.0, 100.0), 2),
+            start_date, end_date, rng.choice(GOAL_STATUSES),
         )
-    
-    # ============================================
-    # 12. WORKOUT_EXERCISES (30 records)
-    # ============================================
-    sql_statements.append("\n-- ============================================")
-    sql_statements.append("-- WORKOUT_EXERCISES DATA (30 records)")
-    sql_statements.append("-- ============================================")
-    
-    used_combinations_we = set()
-    
-    for i in range(30):
-        # Ensure unique plan_id, exercise_id combinations
-        while True:
-            plan_id = random.randint(1, 30)
-            exercise_id = random.randint(1, 30)
-            if (plan_id, exercise_id) not in used_combinations_we:
-                used_combinations_we.add((plan_id, exercise_id))
-                break
-        
-        sql_statements.append(
-            f"INSERT INTO Workout_Exercises (plan_id, exercise_id, sets, reps, duration_min) VALUES "
-            f"({plan_id}, {exercise_id}, {random.randint(2, 5)}, "
-            f"{random.randint(8, 20)}, {random.randint(10, 60)});"
+
+PLAN_NAMES = [
+    "Beginner's Start", "Fat Burn Challenge", "Muscle Builder Pro",
+    "Cardio Blast", "Strength Foundation", "HIIT Master", "Endurance Builder",
+    "Core Crusher", "Full Body Transformation", "Athletic Performance"
+]
+
+def workout_plan_rows(counts, rng=random, start=0, stop=None):
+    for i in row_range(counts["Workout_Plan"], start, stop):
+        user_id = (i % counts["Users"]) + 1
+        trainer_id = rng.randint(1, counts["Trainers"]) if rng.random() < 0.6 else None
+        goal_id = (i % counts["Goals"]) + 1 if rng.random() < 0.7 else None
+        start_date = random_date(2024, 2025, rng)
+        end_date = start_date + timedelta(days=rng.randint(30, 180))
+        yield (
+            user_id, trainer_id, goal_id, f"{rng.choice(PLAN_NAMES)} {i+1}",
+            'Customized workout plan focusing on specific fitness goals and progress tracking',
+            start_date, end_date,
         )
-    
-    # ============================================
-    # 13. FEEDBACK (30 records)
-    # ============================================
-    sql_statements.append("\n-- ============================================")
-    sql_statements.append("-- FEEDBACK DATA (30 records)")
-    sql_statements.append("-- ============================================")
-    
-    feedback_comments = [
-        "Excellent trainer, very knowledgeable!",
-        "Great class, highly recommend!",
-        "Could be better organized.",
-        "Amazing workout session!",
-        "Very professional and motivating.",
-        "The class was too crowded.",
-        "Perfect for beginners!",
-        "Challenging but rewarding.",
-        "Trainer needs to be more attentive.",
-        "Best fitness class I've attended!"
-    ]
-    
-    for i in range(30):
-        user_id = (i % 30) + 1
-        trainer_id = random.randint(1, 30) if random.random() < 0.7 else "NULL"
-        class_id = random.randint(1, 30) if random.random() < 0.6 else "NULL"
-        date = random_date(2024, 2025)
-        
-        sql_statements.append(
-            f"INSERT INTO Feedback (user_id, trainer_id, class_id, rating, comments, date) VALUES "
-            f"({user_id}, {trainer_id}, {class_id}, {round(random.uniform(3.0, 5.0), 2)}, "
-            f"'{random.choice(feedback_comments)}', '{date.strftime('%Y-%m-%d %H:%M:%S')}');"
+
+EXERCISES = [
+    ("Push-ups", "Strength", "Beginner", 300, "Chest"),
+    ("Squats", "Strength", "Beginner", 400, "Legs"),
+    ("Running", "Cardio", "Intermediate", 600, "Full Body"),
+    ("Bench Press", "Strength", "Intermediate", 350, "Chest"),
+    ("Deadlift", "Strength", "Advanced", 450, "Back"),
+    ("Pull-ups", "Strength", "Intermediate", 400, "Back"),
+    ("Lunges", "Strength", "Beginner", 350, "Legs"),
+    ("Plank", "Core", "Beginner", 200, "Core"),
+    ("Burpees", "Cardio", "Advanced", 800, "Full Body"),
+    ("Mountain Climbers", "Cardio", "Intermediate", 700, "Full Body"),
+    ("Bicep Curls", "Strength", "Beginner", 250, "Arms"),
+    ("Tricep Dips", "Strength", "Intermediate", 300, "Arms"),
+    ("Shoulder Press", "Strength", "Intermediate", 350, "Shoulders"),
+    ("Leg Press", "Strength", "Intermediate", 400, "Legs"),
+    ("Rowing", "Cardio", "Intermediate", 550, "Back"),
+    ("Box Jumps", "Plyometric", "Advanced", 650, "Legs"),
+    ("Kettlebell Swings", "Strength", "Intermediate", 500, "Full Body"),
+    ("Battle Ropes", "Cardio", "Advanced", 700, "Arms"),
+    ("Jumping Jacks", "Cardio", "Beginner", 450, "Full Body"),
+    ("Sit-ups", "Core", "Beginner", 250, "Core"),
+    ("Russian Twists", "Core", "Intermediate", 300, "Core"),
+    ("Leg Raises", "Core", "Intermediate", 280, "Core"),
+    ("Cycling", "Cardio", "Beginner", 500, "Legs"),
+    ("Swimming", "Cardio", "Intermediate", 600, "Full Body"),
+    ("Yoga Sun Salutation", "Flexibility", "Beginner", 200, "Full Body"),
+    ("Pilates Roll-up", "Core", "Intermediate", 250, "Core"),
+    ("Dumbbell Rows", "Strength", "Intermediate", 350, "Back"),
+    ("Calf Raises", "Strength", "Beginner", 200, "Legs"),
+    ("Side Plank", "Core", "Intermediate", 220, "Core"),
+    ("Wall Sits", "Strength", "Beginner", 300, "Legs")
+]
+
+def exercises_rows(counts, rng=random, start=0, stop=None):
+    names = [exercise[0] for exercise in EXERCISES]
+    for i in row_range(counts["Exercises"], start, stop):
+        exercise = EXERCISES[i % len(EXERCISES)]
+        yield (cycle_name(names, i),) + exercise[1:]
+
+def workout_exercises_rows(counts, rng=random, start=0, stop=None, key=None):
+    # Row i takes the i-th pair of a keyed permutation, so pairs never repeat
+    if key is None:
+        key = rng.getrandbits(64)
+    for i in row_range(counts["Workout_Exercises"], start, stop):
+        plan_id, exercise_id = unique_pair(i, counts["Workout_Plan"], counts["Exercises"], key)
+        yield (plan_id, exercise_id, rng.randint(2, 5), rng.randint(8, 20), rng.randint(10, 60))
+
+FEEDBACK_COMMENTS = [
+    "Excellent trainer, very knowledgeable!",
+    "Great class, highly recommend!",
+    "Could be better organized.",
+    "Amazing workout session!",
+    "Very professional and motivating.",
+    "The class was too crowded.",
+    "Perfect for beginners!",
+    "Challenging but rewarding.",
+    "Trainer needs to be more attentive.",
+    "Best fitness class I've attended!"
+]
+
+def feedback_rows(counts, rng=random, start=0, stop=None):
+    for i in row_range(counts["Feedback"], start, stop):
+        user_id = (i % counts["Users"]) + 1
+        trainer_id = rng.randint(1, counts["Trainers"]) if rng.random() < 0.7 else None
+        class_id = rng.randint(1, counts["Classes"]) if rng.random() < 0.6 else None
+        date = random_date(2024, 2025, rng)
+        yield (
+            user_id, trainer_id, class_id, round(rng.uniform(3.0, 5.0), 2),
+            rng.choice(FEEDBACK_COMMENTS), date,
         )
-    
-    # ============================================
-    # 14. DEVICES (30 records)
-    # ============================================
-    sql_statements.append("\n-- ============================================")
-    sql_statements.append("-- DEVICES DATA (30 records)")
-    sql_statements.append("-- ============================================")
-    
-    device_names = ["Fitbit", "Apple Watch", "Garmin", "Samsung Galaxy Watch", "Xiaomi Mi Band"]
-    models = ["Series 8", "Charge 5", "Venu 2", "Active 2", "Band 7", "Ultra", "Forerunner 945"]
-    
-    for i in range(30):
-        user_id = (i % 30) + 1
-        sync_date = random_date(2024, 2025)
-        
-        sql_statements.append(
-            f"INSERT INTO Devices (user_id, device_name, model, sync_date, battery_level, firmware_version) VALUES "
-            f"({user_id}, '{random.choice(device_names)}', '{random.choice(models)}', "
-            f"'{sync_date.strftime('%Y-%m-%d %H:%M:%S')}', {random.randint(10, 100)}, "
-            f"'{random.randint(1, 5)}.{random.randint(0, 9)}.{random.randint(0, 9)}');"
+
+DEVICE_NAMES = ["Fitbit", "Apple Watch", "Garmin", "Samsung Galaxy Watch", "Xiaomi Mi Band"]
+DEVICE_MODELS = ["Series 8", "Charge 5", "Venu 2", "Active 2", "Band 7", "Ultra", "Forerunner 945"]
+
+def devices_rows(counts, rng=random, start=0, stop=None):
+    for i in row_range(counts["Devices"], start, stop):
+        user_id = (i % counts["Users"]) + 1
+        sync_date = random_date(2024, 2025, rng)
+        yield (
+            user_id, rng.choice(DEVICE_NAMES), rng.choice(DEVICE_MODELS), sync_date,
+            rng.randint(10, 100), f"{rng.randint(1, 5)}.{rng.randint(0, 9)}.{rng.randint(0, 9)}",
         )
-    
-    return sql_statements
+
+# (table, insert columns, row generator) in dependency order
+TABLES = [
+    ("Subscriptions", ["plan_name", "duration_months", "price", "features"], subscriptions_rows),
+    ("Trainers", ["full_name", "email", "password", "specialization", "experience_years", "rating"], trainers_rows),
+    ("Certifications", ["trainer_id", "certification_name", "issued_by", "issue_date", "expiry_date"], certifications_rows),
+    ("Users", ["full_name", "email", "password", "gender", "age", "height", "weight", "goal", "subscription_id", "trainer_id"], users_rows),
+    ("Classes", ["trainer_id", "class_name", "category", "mode", "schedule_date", "duration_minutes", "max_participants"], classes_rows),
+    ("User_Class", ["user_id", "class_id", "enrollment_date", "attendance_status"], user_class_rows),
+    ("Payments", ["user_id", "subscription_id", "payment_date", "amount", "payment_method", "status"], payments_rows),
+    ("Progress_Tracking", ["user_id", "date", "calories_burned", "steps", "workout_time_min", "weight", "bmi"], progress_tracking_rows),
+    ("Goals", ["user_id", "goal_type", "target_weight", "start_date", "end_date", "status"], goals_rows),
+    ("Workout_Plan", ["user_id", "trainer_id", "goal_id", "plan_name", "plan_description", "start_date", "end_date"], workout_plan_rows),
+    ("Exercises", ["name", "type", "difficulty_level", "calories_per_hour", "muscle_group"], exercises_rows),
+    ("Workout_Exercises", ["plan_id", "exercise_id", "sets", "reps", "duration_min"], workout_exercises_rows),
+    ("Feedback", ["user_id", "trainer_id", "class_id", "rating", "comments", "date"], feedback_rows),
+    ("Devices", ["user_id", "device_name", "model", "sync_date", "battery_level", "firmware_version"], devices_rows),
+]
 
 # ============================================
-# MAIN EXECUTION
+# ROW FORMATTING BACKENDS
+# A backend's iter_row_blocks() yields lists of up to block_rows rows,
+# already formatted for one style:
+#   "sql"        -> "(v1, v2, ...)" VALUES tuples
+#                   (whole UPDATE statements for Trainer_Certification)
+#   "tsv"/"csv"  -> data file lines for LOAD DATA
 # ============================================
-if __name__ == "__main__":
-    print("Generating DML statements...")
-    sql_statements = generate_sql()
-    
-    # Write to file
-    output_file = "fitness_dml_insert.sql"
+
+TABLE_COLUMNS = {table: columns for table, columns, _ in TABLES}
+TABLE_COLUMNS["Trainer_Certification"] = ["certification_id", "trainer_id"]
+ROW_GENERATORS = {table: rows_fn for table, _, rows_fn in TABLES}
+ROW_GENERATORS["Trainer_Certification"] = certification_updates
+
+def format_values(row):
+    return "(" + ", ".join(sql_literal(value) for value in row) + ")"
+
+def update_statement(cert_id, trainer_id):
+    return f"UPDATE Trainers SET certification_id = {cert_id} WHERE trainer_id = {trainer_id};"
+
+def tsv_field(value):
+    """Format a value for MySQL's default LOAD DATA field escaping"""
+    if value is None:
+        return "\\N"
+    if isinstance(value, datetime):
+        return value.strftime('%Y-%m-%d %H:%M:%S')
+    if isinstance(value, str):
+        return value.replace("\\", "\\\\").replace("\t", "\\t").replace("\n", "\\n")
+    return str(value)
+
+def csv_field(value):
+    """Format a value as a double-quote enclosed CSV field"""
+    if isinstance(value, str):
+        return '"' + value.replace("\\", "\\\\").replace('"', '""') + '"'
+    return tsv_field(value)
+
+ROW_FORMATTERS = {
+    "sql": format_values,
+    "tsv": lambda row: "\t".join(map(tsv_field, row)),
+    "csv": lambda row: ",".join(map(csv_field, row)),
+}
+
+def iter_row_blocks(table, counts, rng=random, start=0, stop=None, style="sql", block_rows=DEFAULT_CHUNK_SIZE, **extra):
+    """Python backend: generate tuples row by row and format each one"""
+    rows = ROW_GENERATORS[table](counts, rng, start, stop, **extra)
+    if table == "Trainer_Certification" and style == "sql":
+        lines = (update_statement(*row) for row in rows)
+    else:
+        lines = map(ROW_FORMATTERS[style], rows)
+    while True:
+        block = list(islice(lines, block_rows))
+        if not block:
+            return
+        yield block
+
+BACKENDS = ["python", "numpy"]
+
+def get_backend(name):
+    """Return (make_rng, iter_row_blocks) for a backend; numpy is imported only when asked for"""
+    if name == "numpy":
+        import dml_vectorized
+        return dml_vectorized.make_rng, dml_vectorized.iter_row_blocks
+    return random.Random, iter_row_blocks
+
+# ============================================
+# SQL OUTPUT
+# ============================================
+
+def section_header(title, first=False):
+    return [
+        ("" if first else "\n") + "-- ============================================",
+        f"-- {title}",
+        "-- ============================================",
+    ]
+
+def iter_insert_statements(table, columns, blocks, batch_size=1, stats=None):
+    """Yield INSERT statements as text chunks (complete lines joined by newlines),
+    packing batch_size formatted VALUES tuples into each statement"""
+    prefix = f"INSERT INTO {table} ({', '.join(columns)}) VALUES"
+    if batch_size == 1:
+        prefix += " "
+        for block in blocks:
+            if stats is not None:
+                stats["rows"] += len(block)
+                stats["statements"] += len(block)
+            yield prefix + (";\n" + prefix).join(block) + ";"
+        return
+
+    def flush(batch):
+        if stats is not None:
+            stats["rows"] += len(batch)
+            stats["statements"] += 1
+        return prefix + "\n" + ",\n".join(batch) + ";"
+
+    pending = []
+    for block in blocks:
+        pending += block
+        full = len(pending) - len(pending) % batch_size
+        if full:
+            yield "\n".join([flush(pending[i:i + batch_size]) for i in range(0, full, batch_size)])
+        pending = pending[full:]
+    if pending:
+        yield flush(pending)
+
+def iter_update_statements(blocks, stats=None):
+    """Yield blocks of UPDATE statements as text chunks, counting them"""
+    for block in blocks:
+        if stats is not None:
+            stats["rows"] += len(block)
+            stats["statements"] += len(block)
+        yield "\n".join(block)
+
+def iter_sql(row_counts=None, rng=random, batch_size=1, stats=None, rows=iter_row_blocks, block_rows=DEFAULT_CHUNK_SIZE):
+    """Yield the dump table by table as text chunks, without holding it in memory"""
+    counts = resolve_row_counts(row_counts)
+    for table, columns, _ in TABLES:
+        yield "\n".join(section_header(f"{table.upper()} DATA ({counts[table]} records)",
+                                       first=(table == TABLES[0][0])))
+        yield from iter_insert_statements(table, columns, rows(table, counts, rng, block_rows=block_rows),
+                                          batch_size, stats)
+
+        if table == "Certifications":
+            yield "\n".join(section_header("UPDATE TRAINERS with certification_id"))
+            yield from iter_update_statements(rows("Trainer_Certification", counts, rng, block_rows=block_rows), stats)
+
+def generate_sql(row_counts=None, rng=random):
+    """Build the full dump as a list of lines (small datasets only)"""
+    return "\n".join(iter_sql(row_counts, rng)).split("\n")
+
+def write_chunks(f, chunks):
+    """Write text chunks to f, one write call each"""
+    for chunk in chunks:
+        f.write(chunk + "\n")
+
+def write_sql(output_file, row_counts=None, chunk_size=DEFAULT_CHUNK_SIZE, seed=None, batch_size=1, backend="python"):
+    """Stream INSERT statements to output_file, generating and writing chunk_size rows at a time.
+
+    batch_size > 1 packs that many rows into each multi-row INSERT and runs
+    the whole load in one transaction. Returns (stats, elapsed_seconds).
+    """
+    counts = resolve_row_counts(row_counts)
+    make_rng, rows = get_backend(backend)
+    stats = {"rows": 0, "statements": 0}
+    start = time.perf_counter()
+
     with open(output_file, 'w', encoding='utf-8') as f:
         f.write("-- ============================================\n")
         f.write("-- FITNESS MANAGEMENT SYSTEM - DML (MySQL)\n")
         f.write("-- Generated Insert Statements\n")
-        f.write("-- 30 Records per table\n")
+        f.write(f"-- {sum(counts.values())} Records across {len(counts)} tables\n")
         f.write("-- ============================================\n\n")
-        f.write("SET FOREIGN_KEY_CHECKS = 0;\n\n")
-        
-        for statement in sql_statements:
-            f.write(statement + "\n")
-        
+        f.write("SET FOREIGN_KEY_CHECKS = 0;\n")
+        if batch_size > 1:
+            f.write("SET UNIQUE_CHECKS = 0;\n")
+            f.write("SET AUTOCOMMIT = 0;\n")
+        f.write("\n")
+
+        write_chunks(f, iter_sql(counts, make_rng(seed), batch_size, stats, rows, chunk_size))
+
+        if batch_size > 1:
+            f.write("\nCOMMIT;\n")
+            f.write("SET UNIQUE_CHECKS = 1;\n")
         f.write("\nSET FOREIGN_KEY_CHECKS = 1;\n")
         f.write("\n-- ============================================\n")
         f.write("-- END OF DML\n")
         f.write("-- ============================================\n")
-    
-    print(f"✅ Successfully generated {len(sql_statements)} SQL statements!")
-    print(f"✅ Output file: {output_file}")
+
+    return stats, time.perf_counter() - start
+
+# ============================================
+# BULK LOAD OUTPUT (LOAD DATA LOCAL INFILE)
+# ============================================
+
+LOAD_FORMATS = {
+    "tsv": "FIELDS TERMINATED BY '\\t'",
+    "csv": "FIELDS TERMINATED BY ',' OPTIONALLY ENCLOSED BY '\"'",
+}
+
+def load_data_statement(table, columns, filename, fmt):
+    return (
+        f"LOAD DATA LOCAL INFILE '{filename}' INTO TABLE {table}\n"
+        f"    {LOAD_FORMATS[fmt]} LINES TERMINATED BY '\\n'\n"
+        f"    ({', '.join(columns)});"
+    )
+
+def write_table_file(path, blocks, stats):
+    """Write each block of data file lines with a single write call"""
+    with open(path, 'w', encoding='utf-8', newline='\n') as f:
+        for block in blocks:
+            # An empty block would write a blank line, which LOAD DATA reads as a row
+            if not block:
+                continue
+            stats["rows"] += len(block)
+            f.write("\n".join(block) + "\n")
+
+def load_script_header(counts, command):
+    return [
+        "-- ============================================",
+        "-- FITNESS MANAGEMENT SYSTEM - BULK LOAD (MySQL)",
+        f"-- {sum(counts.values())} Records across {len(counts)} tables",
+        f"-- Run from this directory: {command} -u your_user -p your_database < load_data.sql",
+        "-- ============================================",
+        "",
+        "SET FOREIGN_KEY_CHECKS = 0;",
+        "SET UNIQUE_CHECKS = 0;",
+    ]
+
+def load_script_footer():
+    return [
+        "",
+        "SET UNIQUE_CHECKS = 1;",
+        "SET FOREIGN_KEY_CHECKS = 1;",
+    ]
+
+def trainer_certification_load(filenames, fmt):
+    """Load certification links into a temporary table and apply them in one UPDATE"""
+    lines = ["CREATE TEMPORARY TABLE Trainer_Certification (certification_id INT NOT NULL, trainer_id INT PRIMARY KEY);"]
+    for filename in filenames:
+        lines.append(load_data_statement("Trainer_Certification", TABLE_COLUMNS["Trainer_Certification"], filename, fmt))
+    lines += [
+        "UPDATE Trainers t JOIN Trainer_Certification tc ON t.trainer_id = tc.trainer_id",
+        "    SET t.certification_id = tc.certification_id;",
+        "DROP TEMPORARY TABLE Trainer_Certification;",
+    ]
+    return lines
+
+def write_load_files(output_dir, row_counts=None, fmt="tsv", chunk_size=DEFAULT_CHUNK_SIZE, seed=None, backend="python"):
+    """Write one data file per table plus load_data.sql to bulk load them.
+
+    Returns (stats, elapsed_seconds).
+    """
+    counts = resolve_row_counts(row_counts)
+    make_rng, rows = get_backend(backend)
+    rng = make_rng(seed)
+    stats = {"rows": 0, "statements": 0}
+    start = time.perf_counter()
+    os.makedirs(output_dir, exist_ok=True)
+
+    script = load_script_header(counts, "mysql --local-infile=1")
+
+    for table, columns, _ in TABLES:
+        filename = f"{table}.{fmt}"
+        write_table_file(os.path.join(output_dir, filename),
+                         rows(table, counts, rng, style=fmt, block_rows=chunk_size), stats)
+        script += section_header(f"{table.upper()} DATA ({counts[table]} records)")
+        script.append(load_data_statement(table, columns, filename, fmt))
+
+        if table == "Certifications":
+            filename = f"Trainer_Certification.{fmt}"
+            write_table_file(os.path.join(output_dir, filename),
+                             rows("Trainer_Certification", counts, rng, style=fmt, block_rows=chunk_size), stats)
+            script += section_header("UPDATE TRAINERS with certification_id")
+            script += trainer_certification_load([filename], fmt)
+        stats["statements"] += 1
+
+    script += load_script_footer()
+    with open(os.path.join(output_dir, "load_data.sql"), 'w', encoding='utf-8') as f:
+        f.write("\n".join(script) + "\n")
+
+    return stats, time.perf_counter() - start
+
+# ============================================
+# PARALLEL GENERATION
+# Every row generator depends only on the parent tables' row counts, so
+# tables (and row ranges within a table) can be generated independently.
+# ============================================
+
+# Rows per shard file in parallel mode
+DEFAULT_SHARD_ROWS = 1000000
+
+def table_seed(seed, table, shard):
+    """Derive a stable per-shard seed, independent of worker count and scheduling"""
+    digest = hashlib.sha256(f"{seed}:{table}:{shard}".encode()).digest()
+    return int.from_bytes(digest[:8], "big")
+
+def plan_shards(counts, shard_rows=DEFAULT_SHARD_ROWS):
+    """List (table, shard, start, stop) jobs in load order"""
+    totals = [(table, counts[table]) for table, _, _ in TABLES]
+    totals.insert(3, ("Trainer_Certification", min(counts["Trainers"], counts["Certifications"])))
+
+    jobs = []
+    for table, total in totals:
+        for shard, start in enumerate(range(0, total, max(shard_rows, 1))):
+            jobs.append((table, shard, start, min(start + shard_rows, total)))
+    return jobs
+
+def generate_shard(table, shard, start, stop, counts, seed, fmt, batch_size, output_dir, chunk_size, backend="python"):
+    """Worker: generate one row range of a table into its own shard file"""
+    make_rng, iter_backend_rows = get_backend(backend)
+    rng = make_rng(table_seed(seed, table, shard))
+    # Every shard of a junction table must walk the same pair permutation
+    extra = {"key": table_seed(seed, table, "pairs")} if table in PAIR_TABLES else {}
+    style = fmt if fmt in LOAD_FORMATS else "sql"
+    rows = iter_backend_rows(table, counts, rng, start, stop, style, block_rows=chunk_size, **extra)
+    stats = {"rows": 0, "statements": 0}
+    filename = f"{table}.{shard:04d}.{style}"
+
+    if fmt in LOAD_FORMATS:
+        write_table_file(os.path.join(output_dir, filename), rows, stats)
+    else:
+        if table == "Trainer_Certification":
+            chunks = iter_update_statements(rows, stats)
+        else:
+            chunks = iter_insert_statements(table, TABLE_COLUMNS[table], rows, batch_size, stats)
+        with open(os.path.join(output_dir, filename), 'w', encoding='utf-8') as f:
+            write_chunks(f, chunks)
+
+    return table, shard, filename, stats
+
+def write_parallel(output_dir, row_counts=None, fmt="tsv", seed=0, workers=None,
+                   shard_rows=DEFAULT_SHARD_ROWS, batch_size=1, chunk_size=DEFAULT_CHUNK_SIZE, backend="python"):
+    """Generate shard files for every table on a process pool plus a load_data.sql.
+
+    Output depends only on seed, row counts, shard_rows and backend, never on
+    the number of workers. Returns (stats, elapsed_seconds).
+    """
+    counts = resolve_row_counts(row_counts)
+    stats = {"rows": 0, "statements": 0}
+    start = time.perf_counter()
+    os.makedirs(output_dir, exist_ok=True)
+
+    jobs = plan_shards(counts, shard_rows)
+    files = {}
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [
+            pool.submit(generate_shard, table, shard, lo, hi, counts, seed, fmt, batch_size,
+                        output_dir, chunk_size, backend)
+            for table, shard, lo, hi in jobs
+        ]
+        for future in as_completed(futures):
+            table, shard, filename, shard_stats = future.result()
+            files[(table, shard)] = filename
+            stats["rows"] += shard_stats["rows"]
+            stats["statements"] += shard_stats["statements"]
+
+    # Shards are loaded in row order so AUTO_INCREMENT ids match the generated foreign keys
+    def shard_files(table):
+        return [files[key] for key in sorted(key for key in files if key[0] == table)]
+
+    if fmt in LOAD_FORMATS:
+        script = load_script_header(counts, "mysql --local-infile=1")
+    else:
+        script = load_script_header(counts, "mysql")
+        if batch_size > 1:
+            script.append("SET AUTOCOMMIT = 0;")
+
+    for table, columns, _ in TABLES:
+        script += section_header(f"{table.upper()} DATA ({counts[table]} records)")
+        for filename in shard_files(table):
+            script.append(load_data_statement(table, columns, filename, fmt) if fmt in LOAD_FORMATS
+                          else f"SOURCE {filename};")
+
+        if table == "Certifications":
+            script += section_header("UPDATE TRAINERS with certification_id")
+            if fmt in LOAD_FORMATS:
+                script += trainer_certification_load(shard_files("Trainer_Certification"), fmt)
+            else:
+                script += [f"SOURCE {filename};" for filename in shard_files("Trainer_Certification")]
+
+    if fmt not in LOAD_FORMATS and batch_size > 1:
+        script.append("COMMIT;")
+    script += load_script_footer()
+    with open(os.path.join(output_dir, "load_data.sql"), 'w', encoding='utf-8') as f:
+        f.write("\n".join(script) + "\n")
+
+    return stats, time.perf_counter() - start
+
+def parse_row_override(value):
+    """Parse a TABLE=N command-line override"""
+    table, _, n = value.partition("=")
+    if not n.isdigit():
+        raise argparse.ArgumentTypeError(f"expected TABLE=N, got {value!r}")
+    return table, int(n)
+
+# ============================================
+# MAIN EXECUTION
+# ============================================
+if __name__ == "__main__":
+    arg_parser = argparse.ArgumentParser(description="Generate fitness DML with referential integrity")
+    arg_parser.add_argument("-o", "--output",
+                            help="SQL file, or directory for tsv/csv (default: fitness_dml_insert.sql / fitness_load_data)")
+    arg_parser.add_argument("--format", choices=["insert", "batch", "tsv", "csv"], default="insert",
+                            help="single-row INSERTs, multi-row INSERTs, or data files for LOAD DATA")
+    arg_parser.add_argument("--batch-size", type=int, default=1000,
+                            help="rows per INSERT in batch format")
+    arg_parser.add_argument("--scale", type=float, default=1,
+                            help="multiply every default row count (30) by this factor")
+    arg_parser.add_argument("--rows", type=parse_row_override, action="append", default=[],
+                            metavar="TABLE=N", help="row count for one table, e.g. Users=10000000")
+    arg_parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE,
+                            help="rows generated and written per block")
+    arg_parser.add_argument("--seed", type=int, help="seed for reproducible output")
+    arg_parser.add_argument("--backend", choices=BACKENDS, default="python",
+                            help="row-at-a-time Python or column-wise NumPy generation")
+    arg_parser.add_argument("--parallel", action="store_true",
+                            help="generate per-table shard files on a process pool (default: fitness_shards)")
+    arg_parser.add_argument("--workers", type=int, help="process pool size in parallel mode (default: CPU count)")
+    arg_parser.add_argument("--shard-rows", type=int, default=DEFAULT_SHARD_ROWS,
+                            help="rows per shard file in parallel mode")
+    args = arg_parser.parse_args()
+
+    row_counts = resolve_row_counts(dict(args.rows), args.scale)
+    batch_size = args.batch_size if args.format == "batch" else 1
+
+    print("Generating DML statements...")
+    if args.parallel:
+        output = args.output or "fitness_shards"
+        stats, elapsed = write_parallel(output, row_counts, args.format, args.seed or 0, args.workers,
+                                        args.shard_rows, batch_size, args.chunk_size, args.backend)
+        print(f"✅ Successfully generated {stats['rows']} rows in parallel shards!")
+        print(f"✅ Output directory: {output}")
+    elif args.format in LOAD_FORMATS:
+        output = args.output or "fitness_load_data"
+        stats, elapsed = write_load_files(output, row_counts, args.format, args.chunk_size,
+                                          args.seed, args.backend)
+        print(f"✅ Successfully generated {stats['rows']} rows in {stats['statements']} {args.format.upper()} files!")
+        print(f"✅ Output directory: {output}")
+    else:
+        output = args.output or "fitness_dml_insert.sql"
+        stats, elapsed = write_sql(output, row_counts, args.chunk_size, args.seed, batch_size, args.backend)
+        print(f"✅ Successfully generated {stats['statements']} SQL statements ({stats['rows']} rows)!")
+        print(f"✅ Output file: {output}")
+    print(f"✅ Throughput: {stats['rows'] / max(elapsed, 1e-9):,.0f} rows/sec ({elapsed:.2f}s)")
+
     print(f"\nTo execute in MySQL:")
     print(f"1. Run the DDL file first: mysql -u your_user -p your_database < fitness_ddl.sql")
-    print(f"2. Run this DML file: mysql -u your_user -p your_database < {output_file}")
\ No newline at end of file
+    if args.parallel and args.format not in LOAD_FORMATS:
+        print(f"2. Load the shard files: cd {output} && mysql -u your_user -p your_database < load_data.sql")
+    elif args.format in LOAD_FORMATS:
+        print(f"2. Load the data files: cd {output} && mysql --local-infile=1 -u your_user -p your_database < load_data.sql")
+    else:
+        print(f"2. Run this DML file: mysql -u your_user -p your_database < {output}")
@@ -0,0 +1,490 @@
+"""
+Fitness Management System - Vectorized DML Backend
+Generates each table column-wise as NumPy arrays and formats whole blocks
+of rows at once, instead of one random.* call and f-string per value
+Used by dml_generation.py with --backend numpy
+"""
+
+from functools import lru_cache
+
+import numpy as np
+
+from dml_generation import (
+    ATTENDANCE_STATUSES, CERT_ISSUERS, CERT_NAMES, CLASS_CATEGORIES, CLASS_MODES,
+    CLASS_NAMES, DEVICE_MODELS, DEVICE_NAMES, EXERCISES, FEEDBACK_COMMENTS, GENDERS,
+    GOAL_STATUSES, GOAL_TYPES, PAIR_TABLES, PASSWORD_CHARS, PAYMENT_METHODS,
+    PAYMENT_STATUSES, PLAN_NAMES, SPECIALIZATIONS, SUBSCRIPTION_PLANS, TRAINER_NAMES,
+    DEFAULT_CHUNK_SIZE, USER_GOALS, USER_NAMES, row_range,
+)
+
+NULL_TOKENS = {"sql": "NULL", "tsv": "\\N", "csv": "\\N"}
+
+FEISTEL_MULTIPLIER = np.uint64(0x9E3779B97F4A7C15)
+# Integers below this are formatted from a cached digit table
+DIGIT_TABLE_SIZE = 1 << 20
+
+def make_rng(seed=None):
+    return np.random.default_rng(seed)
+
+# ============================================
+# COLUMN HELPERS
+# A column is (kind, values, nulls) with kind one of
+#   int/float  numeric array
+#   str        array or list of strings, or byte cells (see BYTE CELLS)
+#   cat        (codes, options): formatted once per option, then indexed
+#   date       datetime64[D] array
+# and nulls an optional boolean mask of NULL rows
+# ============================================
+
+def int_col(values, nulls=None):
+    return ("int", values, nulls)
+
+def float_col(values, nulls=None):
+    return ("float", values, nulls)
+
+def str_col(values):
+    return ("str", values, None)
+
+def cat_col(rng, options, n):
+    """Column of values drawn uniformly from options, like random.choice per row"""
+    return ("cat", (rng.integers(0, len(options), n), list(options)), None)
+
+def date_col(values):
+    return ("date", values, None)
+
+def choice(rng, options, n):
+    return np.asarray(options)[rng.integers(0, len(options), n)]
+
+def uniform(rng, low, high, n, decimals=2):
+    return np.round(rng.uniform(low, high, n), decimals)
+
+def integers(rng, low, high, n):
+    """Inclusive on both ends, like random.randint"""
+    return rng.integers(low, high + 1, n)
+
+def random_dates(rng, start_year, end_year, n):
+    start = np.datetime64(f"{start_year}-01-01")
+    days = (np.datetime64(f"{end_year}-12-31") - start).astype(int)
+    return start + rng.integers(0, days + 1, n)
+
+def optional_ids(rng, upper, probability, n):
+    """Random 1..upper ids, NULL with probability 1 - probability"""
+    return int_col(rng.integers(1, upper + 1, n), rng.random(n) >= probability)
+
+def numbered(prefixes, numbers):
+    """Cells of each prefix followed by its number: "Custom Plan " + "12" """
+    return np.hstack([prefixes, integer_cells(numbers)])
+
+def cycle_names(names, idx, separator=" "):
+    """Vectorized dml_generation.cycle_name, as byte cells"""
+    cycle = idx // len(names)
+    suffix = numbered(constant_cells(separator, len(idx)), cycle + 1)
+    suffix[cycle == 0] = 0
+    return np.hstack([lookup_cells(names, idx % len(names)), suffix])
+
+def emails(names, idx, domain):
+    """dml_generation.random_email of cycle_names(names, idx)"""
+    local_parts = [name.lower().replace(" ", ".") for name in names]
+    return np.hstack([cycle_names(local_parts, idx, "."), constant_cells(f"@{domain}", len(idx))])
+
+def passwords(rng, n):
+    alphabet = np.frombuffer(PASSWORD_CHARS.encode("ascii"), dtype=np.uint8)
+    return np.hstack([constant_cells("$2y$10$", n), alphabet[rng.integers(0, len(alphabet), (n, 50))]])
+
+def permuted_indexes(indexes, n, key):
+    """Vectorized dml_generation.permuted_index; yields the same permutation"""
+    half = max(1, ((n - 1).bit_length() + 1) // 2)
+    shift, mask = np.uint64(half), np.uint64((1 << half) - 1)
+    round_keys = [np.uint64((key >> (16 * r)) & 0xFFFF | (r << 16)) for r in range(4)]
+
+    x = indexes.astype(np.uint64)
+    pending = np.arange(len(x))
+    while len(pending):
+        y = x[pending]
+        left, right = y >> shift, y & mask
+        for round_key in round_keys:
+            mixed = (right ^ round_key) * FEISTEL_MULTIPLIER
+            mixed ^= mixed >> np.uint64(29)
+            left, right = right, left ^ (mixed & mask)
+        y = (left << shift) | right
+        x[pending] = y
+        # Cycle-walk the values that landed outside [0, n)
+        pending = pending[y >= n]
+    return x.astype(np.int64)
+
+def unique_pairs(idx, n_left, n_right, key):
+    index = permuted_indexes(idx, n_left * n_right, key)
+    return index // n_right + 1, index % n_right + 1
+
+# ============================================
+# TABLE GENERATORS
+# Each returns the columns for rows idx, in the table's column order
+# ============================================
+
+def subscriptions_columns(counts, rng, idx, key=None):
+    n = len(idx)
+    named = idx < len(SUBSCRIPTION_PLANS)
+    plan = np.minimum(idx, len(SUBSCRIPTION_PLANS) - 1)
+    names, durations, prices, features = zip(*SUBSCRIPTION_PLANS)
+    return [
+        str_col(select_cells(named, lookup_cells(names, plan),
+                             numbered(constant_cells("Custom Plan ", n), idx + 1))),
+        int_col(np.where(named, np.asarray(durations)[plan], choice(rng, [1, 3, 6, 12], n))),
+        float_col(np.where(named, np.asarray(prices)[plan], uniform(rng, 19.99, 149.99, n))),
+        str_col(select_cells(named, lookup_cells(features, plan),
+                             numbered(constant_cells("Custom features package ", n), idx + 1))),
+    ]
+
+def trainers_columns(counts, rng, idx, key=None):
+    n = len(idx)
+    return [
+        str_col(cycle_names(TRAINER_NAMES, idx)), str_col(emails(TRAINER_NAMES, idx, "trainers.fit")),
+        str_col(passwords(rng, n)),
+        cat_col(rng, SPECIALIZATIONS, n),
+        float_col(uniform(rng, 1.0, 20.0, n, 1)),
+        float_col(uniform(rng, 3.5, 5.0, n)),
+    ]
+
+def certifications_columns(counts, rng, idx, key=None):
+    n = len(idx)
+    issue_dates = random_dates(rng, 2020, 2024, n)
+    return [
+        int_col(idx % counts["Trainers"] + 1),
+        cat_col(rng, CERT_NAMES, n), cat_col(rng, CERT_ISSUERS, n),
+        date_col(issue_dates),
+        date_col(issue_dates + 365 * 3),  # 3 years validity
+    ]
+
+def trainer_certification_columns(counts, rng, idx, key=None):
+    # 80% of trainers have certification
+    ids = idx[rng.random(len(idx)) < 0.8] + 1
+    return [int_col(ids), int_col(ids)]
+
+def users_columns(counts, rng, idx, key=None):
+    n = len(idx)
+    return [
+        str_col(cycle_names(USER_NAMES, idx)), str_col(emails(USER_NAMES, idx, "users.fit")),
+        str_col(passwords(rng, n)),
+        cat_col(rng, GENDERS, n), int_col(integers(rng, 18, 65, n)),
+        float_col(uniform(rng, 150.0, 200.0, n)), float_col(uniform(rng, 50.0, 120.0, n)),
+        cat_col(rng, USER_GOALS, n),
+        optional_ids(rng, counts["Subscriptions"], 0.7, n),
+        optional_ids(rng, counts["Trainers"], 0.5, n),
+    ]
+
+def classes_columns(counts, rng, idx, key=None):
+    n = len(idx)
+    schedule_dates = random_dates(rng, 2025, 2025, n) + integers(rng, 1, 90, n)
+    return [
+        int_col(integers(rng, 1, counts["Trainers"], n)),
+        str_col(numbered(lookup_cells([f"{name} " for name in CLASS_NAMES], rng.integers(0, len(CLASS_NAMES), n)),
+                         idx + 1)),
+        cat_col(rng, CLASS_CATEGORIES, n), cat_col(rng, CLASS_MODES, n),
+        date_col(schedule_dates),
+        int_col(choice(rng, [30, 45, 60, 90], n)), int_col(integers(rng, 10, 50, n)),
+    ]
+
+def user_class_columns(counts, rng, idx, key=None):
+    n = len(idx)
+    user_ids, class_ids = unique_pairs(idx, counts["Users"], counts["Classes"], key)
+    return [
+        int_col(user_ids), int_col(class_ids),
+        date_col(random_dates(rng, 2024, 2025, n)), cat_col(rng, ATTENDANCE_STATUSES, n),
+    ]
+
+def payments_columns(counts, rng, idx, key=None):
+    n = len(idx)
+    return [
+        int_col(idx % counts["Users"] + 1),
+        optional_ids(rng, counts["Subscriptions"], 0.8, n),
+        date_col(random_dates(rng, 2024, 2025, n)),
+        float_col(uniform(rng, 19.99, 999.99, n)),
+        cat_col(rng, PAYMENT_METHODS, n), cat_col(rng, PAYMENT_STATUSES, n),
+    ]
+
+def progress_tracking_columns(counts, rng, idx, key=None):
+    n = len(idx)
+    weight = uniform(rng, 50.0, 120.0, n)
+    height = uniform(rng, 150.0, 200.0, n)
+    return [
+        int_col(idx % counts["Users"] + 1),
+        date_col(random_dates(rng, 2024, 2025, n)),
+        int_col(integers(rng, 100, 1000, n)), int_col(integers(rng, 1000, 20000, n)),
+        int_col(integers(rng, 15, 120, n)),
+        float_col(weight),
+        float_col(np.round(weight / (height / 100) ** 2, 2)),
+    ]
+
+def goals_columns(counts, rng, idx, key=None):
+    n = len(idx)
+    start_dates = random_dates(rng, 2024, 2025, n)
+    return [
+        int_col(idx % counts["Users"] + 1),
+        cat_col(rng, GOAL_TYPES, n), float_col(uniform(rng, 50.0, 100.0, n)),
+        date_col(start_dates), date_col(start_dates + integers(rng, 30, 180, n)),
+        cat_col(rng, GOAL_STATUSES, n),
+    ]
+
+def workout_plan_columns(counts, rng, idx, key=None):
+    n = len(idx)
+    start_dates = random_dates(rng, 2024, 2025, n)
+    return [
+        int_col(idx % counts["Users"] + 1),
+        optional_ids(rng, counts["Trainers"], 0.6, n),
+        int_col(idx % counts["Goals"] + 1, rng.random(n) >= 0.7),
+        str_col(numbered(lookup_cells([f"{name} " for name in PLAN_NAMES], rng.integers(0, len(PLAN_NAMES), n)),
+                         idx + 1)),
+        ("cat", (np.zeros(n, dtype=np.int64), ["Customized workout plan focusing on specific fitness goals and progress tracking"]), None),
+        date_col(start_dates), date_col(start_dates + integers(rng, 30, 180, n)),
+    ]
+
+def exercises_columns(counts, rng, idx, key=None):
+    names, types, levels, calories, muscles = zip(*EXERCISES)
+    base = idx % len(EXERCISES)
+    return [
+        str_col(cycle_names(names, idx)), ("cat", (base, types), None), ("cat", (base, levels), None),
+        int_col(np.asarray(calories)[base]), ("cat", (base, muscles), None),
+    ]
+
+def workout_exercises_columns(counts, rng, idx, key=None):
+    n = len(idx)
+    plan_ids, exercise_ids = unique_pairs(idx, counts["Workout_Plan"], counts["Exercises"], key)
+    return [
+        int_col(plan_ids), int_col(exercise_ids),
+        int_col(integers(rng, 2, 5, n)), int_col(integers(rng, 8, 20, n)), int_col(integers(rng, 10, 60, n)),
+    ]
+
+def feedback_columns(counts, rng, idx, key=None):
+    n = len(idx)
+    return [
+        int_col(idx % counts["Users"] + 1),
+        optional_ids(rng, counts["Trainers"], 0.7, n),
+        optional_ids(rng, counts["Classes"], 0.6, n),
+        float_col(uniform(rng, 3.0, 5.0, n)),
+        cat_col(rng, FEEDBACK_COMMENTS, n),
+        date_col(random_dates(rng, 2024, 2025, n)),
+    ]
+
+def devices_columns(counts, rng, idx, key=None):
+    n = len(idx)
+    # Single digits: "1".."5", ".", "0".."9", ".", "0".."9"
+    firmware = np.empty((n, 5), dtype=np.uint8)
+    firmware[:, 0] = integers(rng, 1, 5, n) + ord("0")
+    firmware[:, 1::2] = ord(".")
+    for position in (2, 4):
+        firmware[:, position] = integers(rng, 0, 9, n) + ord("0")
+    return [
+        int_col(idx % counts["Users"] + 1),
+        cat_col(rng, DEVICE_NAMES, n), cat_col(rng, DEVICE_MODELS, n),
+        date_col(random_dates(rng, 2024, 2025, n)),
+        int_col(integers(rng, 10, 100, n)), str_col(firmware),
+    ]
+
+COLUMN_GENERATORS = {
+    "Subscriptions": subscriptions_columns,
+    "Trainers": trainers_columns,
+    "Certifications": certifications_columns,
+    "Trainer_Certification": trainer_certification_columns,
+    "Users": users_columns,
+    "Classes": classes_columns,
+    "User_Class": user_class_columns,
+    "Payments": payments_columns,
+    "Progress_Tracking": progress_tracking_columns,
+    "Goals": goals_columns,
+    "Workout_Plan": workout_plan_columns,
+    "Exercises": exercises_columns,
+    "Workout_Exercises": workout_exercises_columns,
+    "Feedback": feedback_columns,
+    "Devices": devices_columns,
+}
+
+# ============================================
+# BULK FORMATTING
+# ============================================
+
+# Characters that force escaping in each style, and their replacements
+ESCAPES = {
+    "sql": [("'", "''")],
+    "csv": [("\\", "\\\\"), ('"', '""')],
+    "tsv": [("\\", "\\\\"), ("\t", "\\t"), ("\n", "\\n")],
+}
+QUOTES = {"sql": "'", "csv": '"', "tsv": ""}
+
+def format_strings(strings, style):
+    """Escape and quote a list of strings, skipping the escape pass when nothing needs it"""
+    joined = "\0".join(strings)
+    for old, new in ESCAPES[style]:
+        if old in joined:
+            strings = [value.replace(old, new) for value in strings]
+    quote = QUOTES[style]
+    return [quote + value + quote for value in strings] if quote else strings
+
+# ============================================
+# BYTE CELLS
+# A formatted column is a (rows, width) uint8 matrix holding each value's
+# ASCII bytes, NUL-padded anywhere (join_rows drops every NUL). Values
+# repeat heavily, so most columns format their distinct values once and
+# gather the rows from that small table; nothing is done per value in Python.
+# ============================================
+
+def byte_cells(strings):
+    """Left-aligned cells of an array or list of ASCII strings; cells pass through"""
+    if isinstance(strings, np.ndarray) and strings.ndim == 2:
+        return strings
+    strings = np.ascontiguousarray(strings)
+    if strings.dtype.kind != "U":
+        return strings.view(np.uint8).reshape(len(strings), strings.dtype.itemsize)
+    # UCS-4 code points; ASCII fits in a byte, so narrowing is the encoding
+    codes = strings.view(np.uint32).reshape(len(strings), strings.dtype.itemsize // 4)
+    if codes.size and codes.max() > 127:
+        raise ValueError("generated values must be ASCII")
+    return codes.astype(np.uint8)
+
+def constant_cells(text, rows):
+    """The same string in every row, without copying it per row"""
+    return np.broadcast_to(np.frombuffer(text.encode("ascii"), dtype=np.uint8), (rows, len(text)))
+
+def select_cells(condition, if_true, if_false):
+    """Per-row choice between two cell matrices of possibly different widths"""
+    width = max(if_true.shape[1], if_false.shape[1])
+    pad = lambda cells: np.pad(cells, ((0, 0), (0, width - cells.shape[1])))
+    return np.where(condition[:, None], pad(if_true), pad(if_false))
+
+def lookup_cells(strings, codes):
+    """Cells of strings[codes], formatting each distinct string once"""
+    return byte_cells(strings)[codes]
+
+def digit_cells(values):
+    """Right-aligned decimal digits of non-negative integers"""
+    width = len(str(int(values.max()))) if len(values) else 1
+    powers = 10 ** np.arange(width - 1, -1, -1, dtype=np.int64)
+    digits = (values[:, None] // powers % 10 + ord("0")).astype(np.uint8)
+    # Leading zeros become padding; the units digit always stays
+    leading = values[:, None] < powers
+    leading[:, -1] = False
+    digits[leading] = 0
+    return digits
+
+@lru_cache(maxsize=None)
+def digit_table(size):
+    return digit_cells(np.arange(size, dtype=np.int64))
+
+def integer_cells(values):
+    """Cells of non-negative integers"""
+    if not len(values) or values.max() >= DIGIT_TABLE_SIZE:
+        return digit_cells(values.astype(np.int64))
+    return digit_table(max(1024, 1 << int(values.max()).bit_length()))[values]
+
+@lru_cache(maxsize=None)
+def cents_table():
+    """Fraction digits str() prints for each whole number of cents: 0.5 -> "5", 0.05 -> "05" """
+    return byte_cells([f"{cents:02d}".rstrip("0") or "0" for cents in range(100)])
+
+def decimal_cells(values):
+    """Cells of non-negative floats with at most two decimals, as str() formats them
+    (shortest repr: no trailing zeros, at least one decimal); None for other floats"""
+    cents = np.rint(values * 100)
+    if not len(values) or values.min() < 0 or values.max() >= 1e12 or not np.array_equal(cents / 100, values):
+        return None
+    cents = cents.astype(np.int64)
+    point = np.full((len(values), 1), ord("."), dtype=np.uint8)
+    return np.hstack([integer_cells(cents // 100), point, cents_table()[cents % 100]])
+
+@lru_cache(maxsize=None)
+def date_table(low, high, quote):
+    """Cells of every day from low to high (days since the epoch): dates span a few
+    hundred days, so each is formatted once"""
+    span = np.arange(low, high + 1).astype("datetime64[D]")
+    return byte_cells([f"{quote}{day} 00:00:00{quote}" for day in np.datetime_as_string(span).tolist()])
+
+def string_cells(values, style):
+    matrix = byte_cells(values)
+    # Every escape turns one character into two: give each character a second
+    # byte, left NUL unless the character was escaped
+    for old, new in ESCAPES[style]:
+        found = matrix == ord(old)
+        if found.any():
+            escaped = np.zeros(matrix.shape + (2,), dtype=np.uint8)
+            escaped[..., 0] = np.where(found, ord(new[0]), matrix)
+            escaped[..., 1] = np.where(found, ord(new[1]), 0)
+            matrix = escaped.reshape(len(matrix), -1)
+    quote = QUOTES[style]
+    if not quote:
+        return matrix
+    # The padding is dropped, so the closing quote can sit in the last column
+    quotes = constant_cells(quote, len(matrix))
+    return np.hstack([quotes, matrix, quotes])
+
+def format_column(column, style):
+    """Format a whole column as byte cells for one output style"""
+    kind, values, nulls = column
+    if kind == "cat":
+        codes, options = values
+        cells = lookup_cells(format_strings(list(options), style), codes)
+    elif kind == "date":
+        days = values.astype(np.int64)
+        low = int(days.min())
+        cells = date_table(low, int(days.max()), "'" if style == "sql" else "")[days - low]
+    elif kind == "str":
+        cells = string_cells(values, style)
+    elif kind == "int" and (not len(values) or values.min() >= 0):
+        cells = integer_cells(values)
+    elif kind == "float":
+        cells = decimal_cells(values)
+        if cells is None:
+            # Other floats: format each distinct value once
+            distinct, inverse = np.unique(values, return_inverse=True)
+            cells = lookup_cells(list(map(str, distinct.tolist())), inverse)
+    else:
+        cells = byte_cells(values.astype("S"))
+    return apply_nulls(cells, nulls, style)
+
+def apply_nulls(cells, nulls, style):
+    if nulls is None or not nulls.any():
+        return cells
+    token = np.frombuffer(NULL_TOKENS[style].encode("ascii"), dtype=np.uint8)
+    if cells.shape[1] < len(token):
+        cells = np.pad(cells, ((0, 0), (0, len(token) - cells.shape[1])))
+    elif not cells.flags.writeable:
+        cells = cells.copy()
+    cells[nulls] = 0
+    cells[nulls, :len(token)] = token
+    return cells
+
+def join_rows(pieces, rows):
+    """Rows of pieces (constant strings and byte cells): the cells are laid side by
+    side with the constants and a newline, and the NUL padding is dropped.
+    Generated values never contain a raw newline, so it splits the rows apart."""
+    blocks = [constant_cells(piece, rows) if isinstance(piece, str) else piece for piece in pieces]
+    matrix = np.hstack(blocks + [constant_cells("\n", rows)])
+    return matrix[matrix != 0].tobytes().decode("ascii").split("\n")[:-1]
+
+def format_block(table, columns, style):
+    cells = [format_column(column, style) for column in columns]
+    rows = len(cells[0])
+    if not rows:
+        return []
+    if style == "sql" and table == "Trainer_Certification":
+        return join_rows(["UPDATE Trainers SET certification_id = ", cells[0], " WHERE trainer_id = ", cells[1], ";"],
+                         rows)
+    separator = {"sql": ", ", "tsv": "\t", "csv": ","}[style]
+    pieces = [cells[0]]
+    for cell in cells[1:]:
+        pieces += [separator, cell]
+    return join_rows(["("] + pieces + [")"] if style == "sql" else pieces, rows)
+
+def iter_row_blocks(table, counts, rng=None, start=0, stop=None, style="sql", key=None, block_rows=DEFAULT_CHUNK_SIZE):
+    """NumPy backend for dml_generation: same contract as dml_generation.iter_row_blocks"""
+    rng = rng if rng is not None else make_rng()
+    if table in PAIR_TABLES and key is None:
+        key = int(rng.integers(0, 2**63))
+
+    total = min(counts["Trainers"], counts["Certifications"]) if table == "Trainer_Certification" else counts[table]
+    rows = row_range(total, start, stop)
+    generate = COLUMN_GENERATORS[table]
+    for lo in range(rows.start, rows.stop, block_rows):
+        idx = np.arange(lo, min(lo + block_rows, rows.stop))
+        block = format_block(table, generate(counts, rng, idx, key), style)
+        # Trainer_Certification keeps only some rows, so a block can come out empty
+        if block:
+            yield block
@@ -0,0 +1,277 @@
+"""
+DuckDB Analytics Snapshot
+Loads the MySQL dump (through the SQLToMongoDBParser tokenizer) or the MongoDB
+JSON exports into an in-process DuckDB database, then runs the fitness.py
+analyses and the 15 queries in fitness_queries.sql against it - no MySQL
+server needed. Columns get their types from the CREATE TABLE statements in
+fitness.sql, and a few MySQL functions are provided as DuckDB macros so the
+query text runs unchanged.
+Usage: python fitness_duckdb.py [sql_file] [--source sql|json] [--database snapshot.duckdb]
+"""
+
+import gzip
+import json
+import os
+import re
+import sys
+import time
+
+import duckdb
+import pandas as pd
+
+from fitness_json import (CREATE_TABLE_PATTERN, SCHEMA_FILE, TABLE_MAPPING, SQLToMongoDBParser,
+                          split_definitions)
+
+PROJECT_DIR = os.path.dirname(os.path.abspath(__file__))
+JSON_DIR = os.path.join(PROJECT_DIR, 'json files')
+
+# The query catalog is shared with dma_python_application/index_advisor.py
+sys.path.append(os.path.join(PROJECT_DIR, 'dma_python_application'))
+from query_catalog import analytics_queries, sql_file_queries  # noqa: E402
+
+# Rows buffered per table before they are appended to DuckDB
+LOAD_BATCH_ROWS = 50000
+
+# MySQL column type -> DuckDB column type
+TYPE_MAPPING = [
+    (re.compile(r'^(?:TINY|SMALL|MEDIUM)?INT\b', re.IGNORECASE), 'INTEGER'),
+    (re.compile(r'^BIGINT\b', re.IGNORECASE), 'BIGINT'),
+    (re.compile(r'^DATETIME\b|^TIMESTAMP\b', re.IGNORECASE), 'TIMESTAMP'),
+    (re.compile(r'^DATE\b', re.IGNORECASE), 'DATE'),
+    (re.compile(r'^(?:VARCHAR|CHAR|TEXT)\b', re.IGNORECASE), 'VARCHAR'),
+    (re.compile(r'^(?:FLOAT|DOUBLE)\b', re.IGNORECASE), 'DOUBLE'),
+    (re.compile(r'^BOOL(?:EAN)?\b', re.IGNORECASE), 'BOOLEAN'),
+]
+DECIMAL_PATTERN = re.compile(r'^DECIMAL\s*\(\s*(\d+)\s*,\s*(\d+)\s*\)', re.IGNORECASE)
+
+# MySQL functions used by the queries, as DuckDB macros
+MYSQL_MACROS = [
+    "CREATE OR REPLACE MACRO curdate() AS current_date",
+    "CREATE OR REPLACE MACRO datediff(a, b) AS date_diff('day', CAST(b AS DATE), CAST(a AS DATE))",
+    "CREATE OR REPLACE MACRO date_sub(d, i) AS d - i",
+    "CREATE OR REPLACE MACRO date_format(d, f) AS strftime(d, replace(f, '%i', '%M'))",
+    # MySQL sorts NULLs first ascending and last descending
+    "SET default_null_order = 'nulls_first_on_asc_last_on_desc'",
+]
+
+# The summary tables fitness.py reads (see summary_tables.py), built in one pass
+SNAPSHOT_SUMMARIES = [
+    """
+    CREATE OR REPLACE TABLE Revenue_Daily_Summary AS
+    SELECT subscription_id, CAST(payment_date AS DATE) AS payment_day, COUNT(*) AS payment_count,
+           SUM(CASE WHEN status = 'Completed' THEN amount ELSE 0 END) AS completed_revenue
+    FROM Payments WHERE subscription_id IS NOT NULL
+    GROUP BY subscription_id, CAST(payment_date AS DATE)
+    """,
+    """
+    CREATE OR REPLACE TABLE Subscription_Subscribers AS
+    SELECT DISTINCT subscription_id, user_id FROM Payments WHERE subscription_id IS NOT NULL
+    """,
+    """
+    CREATE OR REPLACE TABLE Attendance_Summary AS
+    SELECT class_id, COALESCE(attendance_status, '') AS attendance_status, COUNT(*) AS enrolled_count
+    FROM User_Class GROUP BY class_id, COALESCE(attendance_status, '')
+    """,
+]
+
+UPDATE_PATTERN = re.compile(r'^\s*UPDATE\s+`?\w+`?\s+SET\b.*;\s*$', re.IGNORECASE)
+
+
+def duckdb_type(mysql_type):
+    decimal = DECIMAL_PATTERN.match(mysql_type)
+    if decimal:
+        return f"DECIMAL({decimal.group(1)},{decimal.group(2)})"
+    for pattern, mapped in TYPE_MAPPING:
+        if pattern.match(mysql_type):
+            return mapped
+    return 'VARCHAR'
+
+
+def load_column_types(ddl_path=SCHEMA_FILE):
+    """{table: [(column, DuckDB type)]} from the CREATE TABLE statements, lower-case table names"""
+    with open(ddl_path, 'r', encoding='utf-8') as f:
+        ddl = re.sub(r'--[^\n]*', '', f.read().split('INSERT INTO', 1)[0])
+    tables = {}
+    for table_name, body in CREATE_TABLE_PATTERN.findall(ddl):
+        columns = []
+        for definition in split_definitions(body):
+            parts = definition.split(None, 2)
+            if parts[0].upper() in ('PRIMARY', 'FOREIGN', 'CONSTRAINT', 'UNIQUE', 'KEY', 'INDEX', 'CHECK'):
+                continue
+            columns.append((parts[0].strip('`'), duckdb_type(parts[1])))
+        tables[table_name.lower()] = columns
+    return tables
+
+
+def create_tables(con, column_types):
+    for table, columns in column_types.items():
+        column_list = ", ".join(f'"{column}" {column_type}' for column, column_type in columns)
+        con.execute(f'CREATE OR REPLACE TABLE "{table}" ({column_list})')
+
+
+def append_rows(con, table, rows):
+    """Vectorized append of a batch of row dicts; columns matched by name"""
+    batch = pd.DataFrame.from_records(rows)
+    con.register('batch', batch)
+    try:
+        con.execute(f'INSERT INTO "{table}" BY NAME SELECT * FROM batch')
+    finally:
+        con.unregister('batch')
+
+
+def fill_primary_key(parser, table, row):
+    """Give a row its AUTO_INCREMENT id when the INSERT or export left it out"""
+    primary_key = parser.schema.get(table, {}).get("primary_key") or []
+    key = parser.row_key(table, row)
+    if len(primary_key) == 1 and row.get(primary_key[0]) is None:
+        row[primary_key[0]] = key
+    return row
+
+
+def load_batches(con, parser, rows, column_types):
+    """Buffer (table, row) pairs per table and append them in LOAD_BATCH_ROWS batches"""
+    buffers = {}
+    counts = {}
+    for table, row in rows:
+        if table not in column_types:
+            continue
+        buffer = buffers.setdefault(table, [])
+        buffer.append(fill_primary_key(parser, table, row))
+        if len(buffer) >= LOAD_BATCH_ROWS:
+            append_rows(con, table, buffer)
+            counts[table] = counts.get(table, 0) + len(buffer)
+            buffer.clear()
+    for table, buffer in buffers.items():
+        if buffer:
+            append_rows(con, table, buffer)
+            counts[table] = counts.get(table, 0) + len(buffer)
+    return counts
+
+
+def apply_updates(con, sql_file):
+    """Replay the dump's single-line UPDATE statements (e.g. Trainers.certification_id,
+    set after Certifications exist); the INSERT tokenizer skips them. Returns the count."""
+    applied = 0
+    with open(sql_file, 'r', encoding='utf-8') as f:
+        for line in f:
+            if UPDATE_PATTERN.match(line):
+                con.execute(line.strip().rstrip(';'))
+                applied += 1
+    return applied
+
+
+def from_extended_json(value):
+    """{"$date": ...} -> timestamp string; other values unchanged"""
+    if isinstance(value, dict) and '$date' in value:
+        return value['$date'].replace('T', ' ').rstrip('Z')
+    return value
+
+
+def iter_json_rows(json_dir=JSON_DIR):
+    """(table, row) pairs from the per-collection exports (.json arrays or NDJSON, optionally gzipped)"""
+    for table, collection in TABLE_MAPPING.items():
+        for suffix in ('.json', '.ndjson', '.json.gz', '.ndjson.gz'):
+            path = os.path.join(json_dir, collection + suffix)
+            if os.path.exists(path):
+                break
+        else:
+            continue
+        opener = gzip.open if path.endswith('.gz') else open
+        with opener(path, 'rt', encoding='utf-8') as f:
+            docs = json.load(f) if '.ndjson' not in path else (json.loads(line) for line in f if line.strip())
+            for doc in docs:
+                yield table, {field: from_extended_json(value) for field, value in doc.items()
+                              if field != '_id' and not field.endswith('_ref')}
+
+
+def build_snapshot(source='sql', sql_file='fitness_dml_insert.sql', json_dir=JSON_DIR, database=':memory:',
+                   schema_file=SCHEMA_FILE):
+    """Create a DuckDB database holding every table plus the report summary tables"""
+    con = duckdb.connect(database)
+    column_types = load_column_types(schema_file)
+    create_tables(con, column_types)
+    parser = SQLToMongoDBParser(sql_file, schema_file)
+    rows = parser.iter_sql_rows() if source == 'sql' else iter_json_rows(json_dir)
+
+    start = time.perf_counter()
+    counts = load_batches(con, parser, rows, column_types)
+    # The exports already carry the updated values; the dump applies them afterwards
+    if source == 'sql':
+        apply_updates(con, sql_file)
+    for sql in SNAPSHOT_SUMMARIES:
+        con.execute(sql)
+    print(f"✅ Loaded {sum(counts.values())} rows into {len(counts)} tables "
+          f"from {source} in {time.perf_counter() - start:.2f}s")
+    return con
+
+
+def open_snapshot(database):
+    """Connect to a snapshot built earlier"""
+    return duckdb.connect(database)
+
+
+def install_mysql_compat(con):
+    for statement in MYSQL_MACROS:
+        con.execute(statement)
+
+
+def run_queries(con, queries):
+    """Run each query; returns {name: (DataFrame or None, seconds, error)}"""
+    install_mysql_compat(con)
+    results = {}
+    for name, sql in queries:
+        start = time.perf_counter()
+        try:
+            df = con.sql(sql.strip().rstrip(';')).df()
+            results[name] = (df, time.perf_counter() - start, None)
+        except duckdb.Error as e:
+            results[name] = (None, time.perf_counter() - start, str(e).splitlines()[0])
+    return results
+
+
+# ============================================
+# MAIN EXECUTION
+# ============================================
+if __name__ == "__main__":
+    import argparse
+
+    arg_parser = argparse.ArgumentParser(description="Run the fitness analytics on an in-process DuckDB snapshot")
+    arg_parser.add_argument("sql_file", nargs="?", default="fitness_dml_insert.sql", help="SQL dump to load")
+    arg_parser.add_argument("--source", choices=["sql", "json"], default="sql",
+                            help="Load the SQL dump or the MongoDB JSON exports")
+    arg_parser.add_argument("--json-dir", default=JSON_DIR, help="Directory of per-collection JSON exports")
+    arg_parser.add_argument("--database", default=":memory:",
+                            help="DuckDB file to keep the snapshot in (reused unless --reload)")
+    arg_parser.add_argument("--reload", action="store_true", help="Rebuild an existing --database snapshot")
+    arg_parser.add_argument("--export", help="Directory to write each query result to as CSV")
+    arg_parser.add_argument("--rows", type=int, default=5, help="Rows of each result to print")
+    args = arg_parser.parse_args()
+
+    if args.database != ":memory:" and os.path.exists(args.database) and not args.reload:
+        con = open_snapshot(args.database)
+        print(f"✅ Using snapshot {args.database}")
+    else:
+        if args.database != ":memory:" and os.path.exists(args.database):
+            os.remove(args.database)
+        con = build_snapshot(args.source, args.sql_file, args.json_dir, args.database)
+
+    results = run_queries(con, analytics_queries() + sql_file_queries())
+    if args.export:
+        os.makedirs(args.export, exist_ok=True)
+
+    failed = 0
+    for name, (df, elapsed, error) in results.items():
+        print("=" * 75)
+        if error:
+            failed += 1
+            print(f"❌ {name}: {error}")
+            continue
+        print(f"{name}  ({len(df)} rows, {elapsed * 1000:.1f} ms)")
+        print(df.head(args.rows).to_string())
+        if args.export:
+            slug = re.sub(r'\W+', '_', name.split(':')[0]).strip('_').lower()
+            df.to_csv(os.path.join(args.export, f"{slug}.csv"), index=False)
+
+    print("=" * 75)
+    print(f"\n{'❌' if failed else '✅'} {len(results) - failed} of {len(results)} queries ran on DuckDB")
+    con.close()
@@ -0,0 +1,63 @@
+-- ============================================
+-- FITNESS MANAGEMENT SYSTEM - SECONDARY INDEX PACK
+-- Composite and covering indexes for the analytics in
+-- dma_python_application/fitness.py and fitness_queries.sql
+-- Apply after fitness.sql. Re-runnable through:
+--   python dma_python_application/index_advisor.py --apply
+-- An index whose leading column is a foreign key also takes over from the
+-- implicit FK index InnoDB created for it, which is then dropped.
+-- ============================================
+
+-- ============================================
+-- 1. PAYMENTS
+-- ============================================
+-- Revenue per plan (QUERY 5, summary_tables.py --rebuild): group by plan, sum completed amounts
+CREATE INDEX idx_payments_subscription_status_amount ON Payments (subscription_id, status, amount);
+
+-- One plan's payments on one day (summary_tables.py refresh of a changed plan and day)
+CREATE INDEX idx_payments_subscription_date ON Payments (subscription_id, payment_date, status, amount);
+
+-- Payments per user and their outcome (QUERY 8 engagement, QUERY 1 user details)
+CREATE INDEX idx_payments_user_status ON Payments (user_id, status);
+
+-- Payment method breakdown (QUERY 12) read entirely from the index
+CREATE INDEX idx_payments_method_status_amount ON Payments (payment_method, status, amount, user_id);
+
+-- ============================================
+-- 2. PROGRESS_TRACKING
+-- ============================================
+-- Per-user history in date order (fitness.py query 4, QUERY 4, QUERY 13 30-day window)
+CREATE INDEX idx_progress_user_date ON Progress_Tracking (user_id, date);
+
+-- ============================================
+-- 3. GOALS
+-- ============================================
+-- Goal type x status counts (fitness.py query 5) as an index-only scan
+CREATE INDEX idx_goals_type_status ON Goals (goal_type, status);
+
+-- Active / completed goals per user (QUERY 4, QUERY 15)
+CREATE INDEX idx_goals_user_status ON Goals (user_id, status);
+
+-- ============================================
+-- 4. FEEDBACK
+-- ============================================
+-- Feedback count and average rating per trainer (fitness.py query 2, QUERY 2)
+CREATE INDEX idx_feedback_trainer_rating ON Feedback (trainer_id, rating);
+
+-- ============================================
+-- 5. CLASSES AND USER_CLASS
+-- ============================================
+-- Classes and capacity per trainer (fitness.py query 2, QUERY 2, QUERY 7)
+CREATE INDEX idx_classes_trainer_capacity ON Classes (trainer_id, schedule_date, max_participants);
+
+-- Upcoming schedule in date order (QUERY 9)
+CREATE INDEX idx_classes_schedule ON Classes (schedule_date);
+
+-- Enrollment and attendance per class (summary_tables.py refresh of a changed class, QUERY 3, QUERY 9)
+CREATE INDEX idx_user_class_class_status ON User_Class (class_id, attendance_status);
+
+-- ============================================
+-- 6. CERTIFICATIONS
+-- ============================================
+-- Expired certifications (QUERY 7)
+CREATE INDEX idx_certifications_expiry ON Certifications (expiry_date);
@@ -4,20 +4,392 @@ Reads your exact SQL file and generates matching MongoDB JSON files
 Ensures 100% data match between MySQL and MongoDB
 """
 
+import os
 import re
+import gzip
+import hashlib
+import heapq
 import json
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 from datetime import datetime
-from bson import ObjectId
+from functools import lru_cache
+from bson import ObjectId, encode as bson_encode
+
+# SQL table -> MongoDB collection
+TABLE_MAPPING = {
+    'subscriptions': 'subscriptions',
+    'trainers': 'trainers',
+    'certifications': 'certifications',
+    'users': 'users',
+    'classes': 'classes',
+    'user_class': 'user_classes',
+    'payments': 'payments',
+    'progress_tracking': 'progress_tracking',
+    'goals': 'goals',
+    'workout_plan': 'workout_plans',
+    'exercises': 'exercises',
+    'workout_exercises': 'workout_exercises',
+    'feedback': 'feedback',
+    'devices': 'devices'
+}
+
+# Precompiled patterns for the fast tokenizer
+# Whole INSERT statement, up to the semicolon that ends a line. Written as runs
+# of non-semicolons so only semicolons are tested as the end, rather than
+# trying the end after every character as a lazy .*? does
+STATEMENT_PATTERN = re.compile(r'INSERT\s+INTO[^;]*(?:;(?![ \t\r]*$)[^;]*)*;[ \t\r]*$', re.IGNORECASE | re.MULTILINE)
+# INSERT INTO table (columns) VALUES - the tuples follow match.end()
+INSERT_PATTERN = re.compile(r'INSERT\s+INTO\s+`?(\w+)`?\s*\(([^)]+)\)\s*VALUES\s*', re.IGNORECASE)
+# One value of a VALUES list, with the "(" that opens and ")" that closes its row
+VALUE_PATTERN = re.compile(r"""
+    [\s,]* (\()? \s*
+    (?:
+        '([^'\\]*(?:(?:\\.|'')[^'\\]*)*)'     # quoted string, '' and backslash escapes
+      | (-?\d+)(?=[\s,)])                      # integer
+      | (-?\d+\.\d+)(?=[\s,)])                 # decimal
+      | (NULL)(?=[\s,)])                       # NULL
+      | ([^\s,()';]+(?:\(\))?)                 # anything else, e.g. NOW()
+    )
+    \s* (\))?
+""", re.VERBOSE | re.DOTALL | re.IGNORECASE)
+BARE_PATTERN = re.compile(r"[^\s,()';]+(?:\(\))?")
+STRING_END_PATTERN = re.compile(r'\s*(?:[,);]|$)')
+INT_PATTERN = re.compile(r'-?\d+')
+FLOAT_PATTERN = re.compile(r'-?\d+\.\d+')
+ESCAPE_PATTERN = re.compile(r"\\(.)|''", re.DOTALL)
+SQL_ESCAPES = {'0': '\0', 'b': '\b', 'n': '\n', 'r': '\r', 't': '\t', 'Z': '\x1a'}
+
+def unescape_sql_string(value):
+    """Undo MySQL string escaping: '' and backslash sequences"""
+    return ESCAPE_PATTERN.sub(
+        lambda m: "'" if m.group(1) is None else SQL_ESCAPES.get(m.group(1), m.group(1)),
+        value
+    )
+
+def convert_bare_value(token):
+    """Convert an unquoted SQL token the same way parse_values does"""
+    if token.upper() == 'NULL':
+        return None
+    if INT_PATTERN.fullmatch(token):
+        return int(token)
+    if FLOAT_PATTERN.fullmatch(token):
+        return float(token)
+    return token
+
+@lru_cache(maxsize=None)
+def split_columns(columns_str):
+    return [col.strip().strip('`') for col in columns_str.split(',')]
+
+def tokenize_values(sql, pos=0):
+    """Split the tuples of a (multi-row) VALUES clause into rows of Python values
+    with a single findall pass over the text"""
+    rows = []
+    row = []
+    for row_open, string, integer, decimal, null, bare, row_close in VALUE_PATTERN.findall(sql, pos):
+        if row_open:
+            row = []
+        if integer:
+            row.append(int(integer))
+        elif decimal:
+            row.append(float(decimal))
+        elif null:
+            row.append(None)
+        elif bare:
+            row.append(bare)
+        elif '\\' in string or "''" in string:
+            row.append(unescape_sql_string(string))
+        else:
+            row.append(string)
+        if row_close:
+            rows.append(row)
+    return rows
+
+def scan_values_lenient(sql, pos=0):
+    """Slow fallback for dumps with unescaped apostrophes: a quote only ends a
+    string when a separator follows it, so 'Beginner's Start' stays one value"""
+    rows = []
+    row = []
+    length = len(sql)
+    while pos < length:
+        char = sql[pos]
+        if char == "'":
+            chars = []
+            pos += 1
+            while pos < length:
+                char = sql[pos]
+                if char == '\\':
+                    chars.append(sql[pos:pos + 2])
+                    pos += 2
+                elif sql.startswith("''", pos):
+                    chars.append("''")
+                    pos += 2
+                elif char == "'" and STRING_END_PATTERN.match(sql, pos + 1):
+                    break
+                else:
+                    chars.append(char)
+                    pos += 1
+            row.append(unescape_sql_string(''.join(chars)))
+            pos += 1
+        elif char == '(':
+            row = []
+            pos += 1
+        elif char == ')':
+            rows.append(row)
+            pos += 1
+        elif char == ';':
+            break
+        elif char in ' \t\r\n,':
+            pos += 1
+        else:
+            token = BARE_PATTERN.match(sql, pos).group()
+            row.append(convert_bare_value(token))
+            pos += len(token)
+    return rows
+
+# Denormalized export (--embed): bounded arrays of child rows copied into their
+# parent documents, so the common per-user reads are single-document fetches.
+# parent table -> embeds, each with:
+#   field        array added to the parent ("<field>_count" holds the full count)
+#   table        child table, joined on child.foreign_key = parent primary key
+#   limit        keep at most this many children
+#   sort         optional child field; keeps the latest `limit` children
+#   snapshot     optional copy of selected fields of a row the child references
+EMBEDDING_SPEC = {
+    'users': [
+        {'field': 'devices', 'table': 'devices', 'foreign_key': 'user_id', 'limit': 10, 'sort': 'sync_date'},
+        {'field': 'recent_progress', 'table': 'progress_tracking', 'foreign_key': 'user_id', 'limit': 30, 'sort': 'date'},
+        {'field': 'recent_payments', 'table': 'payments', 'foreign_key': 'user_id', 'limit': 12, 'sort': 'payment_date'},
+        {'field': 'goals', 'table': 'goals', 'foreign_key': 'user_id', 'limit': 10, 'sort': 'start_date'},
+    ],
+    'trainers': [
+        {'field': 'certifications', 'table': 'certifications', 'foreign_key': 'trainer_id', 'limit': 20,
+         'sort': 'issue_date'},
+    ],
+    'workout_plan': [
+        {'field': 'exercises', 'table': 'workout_exercises', 'foreign_key': 'plan_id', 'limit': 50,
+         'snapshot': {'column': 'exercise_id', 'table': 'exercises', 'field': 'exercise',
+                      'fields': ['name', 'type', 'difficulty_level', 'calories_per_hour', 'muscle_group']}},
+    ],
+}
+
+# ============================================
+# SCHEMA (primary and foreign keys from the DDL)
+# ============================================
+
+SCHEMA_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fitness.sql")
+
+CREATE_TABLE_PATTERN = re.compile(r'CREATE\s+TABLE\s+(?:IF\s+NOT\s+EXISTS\s+)?`?(\w+)`?\s*\((.*?)\)[^;()]*;',
+                                  re.IGNORECASE | re.DOTALL)
+FOREIGN_KEY_PATTERN = re.compile(r'FOREIGN\s+KEY\s*\(`?(\w+)`?\)\s*REFERENCES\s+`?(\w+)`?\s*\(`?(\w+)`?\)',
+                                 re.IGNORECASE)
+PRIMARY_KEY_PATTERN = re.compile(r'PRIMARY\s+KEY\s*\(([^)]+)\)', re.IGNORECASE)
+ALTER_TABLE_PATTERN = re.compile(r'ALTER\s+TABLE\s+`?(\w+)`?\s+ADD\s+(?:CONSTRAINT\s+`?\w+`?\s+)?(FOREIGN\s+KEY[^;]+);',
+                                 re.IGNORECASE)
+
+def split_definitions(body):
+    """Split a CREATE TABLE body at the commas that are not inside parentheses"""
+    definitions = []
+    depth = 0
+    start = 0
+    for pos, char in enumerate(body):
+        if char == '(':
+            depth += 1
+        elif char == ')':
+            depth -= 1
+        elif char == ',' and depth == 0:
+            definitions.append(body[start:pos].strip())
+            start = pos + 1
+    definitions.append(body[start:].strip())
+    return [definition for definition in definitions if definition]
+
+def load_schema(ddl_path=SCHEMA_FILE):
+    """Read primary keys and foreign keys from the CREATE/ALTER TABLE statements.
+    
+    Returns {table: {"primary_key": [columns],
+    "foreign_keys": [(column, ref_table, ref_column)]}} with lower-case table
+    names. Stops reading at the first INSERT so a full dump can be passed.
+    """
+    lines = []
+    with open(ddl_path, 'r', encoding='utf-8') as f:
+        for line in f:
+            if line.lstrip()[:11].upper() == 'INSERT INTO':
+                break
+            lines.append(line)
+    ddl = re.sub(r'--[^\n]*', '', ''.join(lines))
+    
+    schema = {}
+    for table_name, body in CREATE_TABLE_PATTERN.findall(ddl):
+        table = {"primary_key": [], "foreign_keys": []}
+        for definition in split_definitions(body):
+            keyword = definition.split(None, 1)[0].upper()
+            if keyword in ('PRIMARY', 'FOREIGN', 'CONSTRAINT', 'UNIQUE', 'KEY', 'INDEX', 'CHECK'):
+                primary_key = PRIMARY_KEY_PATTERN.match(definition)
+                if primary_key:
+                    table["primary_key"] = [col.strip().strip('`') for col in primary_key.group(1).split(',')]
+                foreign_key = FOREIGN_KEY_PATTERN.search(definition)
+                if foreign_key:
+                    column, ref_table, ref_column = foreign_key.groups()
+                    table["foreign_keys"].append((column, ref_table.lower(), ref_column))
+                continue
+            column = definition.split(None, 1)[0].strip('`')
+            if re.search(r'\bPRIMARY\s+KEY\b', definition, re.IGNORECASE):
+                table["primary_key"] = [column]
+        schema[table_name.lower()] = table
+    
+    for table_name, definition in ALTER_TABLE_PATTERN.findall(ddl):
+        column, ref_table, ref_column = FOREIGN_KEY_PATTERN.match(definition).groups()
+        schema[table_name.lower()]["foreign_keys"].append((column, ref_table.lower(), ref_column))
+    
+    return schema
+
+def stable_object_id(table_name, key):
+    """ObjectId (hex) derived from the table name and primary key (a tuple for
+    composite keys), so a row gets the same _id in every run and process.
+    All 12 bytes are hash output: the id carries no creation time."""
+    parts = key if isinstance(key, tuple) else (key,)
+    name = ":".join([table_name.lower()] + [str(part) for part in parts])
+    return hashlib.blake2b(name.encode('utf-8'), digest_size=12).hexdigest()
+
+class DateTimeEncoder(json.JSONEncoder):
+    def default(self, obj):
+        if isinstance(obj, datetime):
+            return {"$date": obj.strftime('%Y-%m-%dT%H:%M:%S.000Z')}
+        return super().default(obj)
+
+def to_bson_value(value):
+    """Replace extended JSON {"$oid": ...} values with real ObjectIds for BSON output"""
+    if isinstance(value, dict):
+        if len(value) == 1 and "$oid" in value:
+            return ObjectId(value["$oid"])
+        return {key: to_bson_value(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [to_bson_value(item) for item in value]
+    return value
+
+# Output format -> (file extension, binary)
+OUTPUT_FORMATS = {
+    "json": (".json", False),      # pretty-printed array, mongoimport --jsonArray
+    "ndjson": (".ndjson", False),  # one compact document per line, mongoimport
+    "bson": (".bson", True),       # concatenated BSON documents, mongorestore
+}
+
+# Indexes built after a direct load, when building them once is cheaper than
+# maintaining them on every insert: (field, unique) per collection
+COLLECTION_INDEXES = {
+    'trainers': [('email', True), ('certification_ref', False)],
+    'certifications': [('trainer_ref', False)],
+    'users': [('email', True), ('subscription_ref', False), ('trainer_ref', False)],
+    'classes': [('trainer_ref', False)],
+    'user_classes': [('user_ref', False), ('class_ref', False)],
+    'payments': [('user_ref', False), ('subscription_ref', False)],
+    'progress_tracking': [('user_ref', False)],
+    'goals': [('user_ref', False)],
+    'workout_plans': [('user_ref', False), ('trainer_ref', False), ('goal_ref', False)],
+    'workout_exercises': [('plan_ref', False), ('exercise_ref', False)],
+    'feedback': [('user_ref', False), ('trainer_ref', False), ('class_ref', False)],
+    'devices': [('user_ref', False)],
+}
+
+def connect_mongodb(uri):
+    """MongoClient for uri; mongomock:// gives an in-process stand-in for testing"""
+    if uri.startswith("mongomock://"):
+        import mongomock
+        return mongomock.MongoClient()
+    from pymongo import MongoClient
+    return MongoClient(uri)
+
+class CollectionWriter:
+    """Append documents to one collection file as they are produced"""
+    
+    def __init__(self, collection_name, fmt="json", compress=False):
+        extension, binary = OUTPUT_FORMATS[fmt]
+        self.filename = f"{collection_name}{extension}" + (".gz" if compress else "")
+        self.fmt = fmt
+        self.count = 0
+        opener = gzip.open if compress else open
+        if binary:
+            self.file = opener(self.filename, 'wb')
+        else:
+            self.file = opener(self.filename, 'wt', encoding='utf-8')
+        if fmt == "json":
+            self.file.write("[")
+    
+    def write(self, doc):
+        if self.fmt == "bson":
+            self.file.write(bson_encode(to_bson_value(doc)))
+        elif self.fmt == "ndjson":
+            self.file.write(json.dumps(doc, separators=(',', ':'), cls=DateTimeEncoder) + "\n")
+        else:
+            # Same layout as json.dump(documents, f, indent=2)
+            self.file.write(("\n  " if self.count == 0 else ",\n  ") +
+                            json.dumps(doc, indent=2, cls=DateTimeEncoder).replace("\n", "\n  "))
+        self.count += 1
+    
+    def close(self):
+        if self.fmt == "json":
+            self.file.write("\n]" if self.count else "]")
+        self.file.close()
 
 class SQLToMongoDBParser:
-    def __init__(self, sql_file_path):
+    def __init__(self, sql_file_path, schema_file=SCHEMA_FILE, stable_ids=False):
         self.sql_file_path = sql_file_path
+        # Derive each _id from table and primary key instead of a random ObjectId
+        self.stable_ids = stable_ids
         self.collections = {}
-        self.object_ids = {}
-        
-    def generate_object_ids(self, table_name, count=30):
-        """Generate ObjectIds for a table"""
-        self.object_ids[table_name] = [str(ObjectId()) for _ in range(count)]
+        self.schema = load_schema(schema_file)
+        # table -> [(fk column, referenced table, reference field)], e.g.
+        # users: ('trainer_id', 'trainers', 'trainer_ref')
+        self.references = {
+            table_name: [(column, ref_table, re.sub(r'_id$', '', column) + '_ref')
+                         for column, ref_table, _ in table["foreign_keys"]]
+            for table_name, table in self.schema.items()
+        }
+        # Only rows some foreign key can point at need their ObjectId kept
+        self.referenced_tables = {ref_table for refs in self.references.values() for _, ref_table, _ in refs}
+        # referenced table -> {primary key value (tuple for composite keys): ObjectId}
+        self.id_index = {}
+        self.next_ids = {}
+        self.row_keys = {}
+        # Streaming mode keeps only counts and one sample per collection
+        self.streaming = False
+        self.document_counts = {}
+        self.samples = {}
+        # Collection -> file written by save_json_files / stream_json_files
+        self.output_files = {}
+        self.output_format = "json"
+        self.compress = False
+        
+    def row_key(self, table_name, row):
+        """Primary key of a row: a tuple for composite keys. AUTO_INCREMENT ids
+        left out of the INSERT are assigned the way MySQL does, max id + 1"""
+        primary_key = self.schema.get(table_name, {}).get("primary_key") or [None]
+        if len(primary_key) > 1:
+            return tuple(row.get(column) for column in primary_key)
+        
+        next_id = self.next_ids.get(table_name, 1)
+        key = row.get(primary_key[0])
+        if key is None:
+            key = next_id
+        if isinstance(key, int) and key >= next_id:
+            self.next_ids[table_name] = key + 1
+        return key
+    
+    def object_id(self, table_name, key):
+        """ObjectId for a primary key, allocated on first use. Lets streaming mode
+        reference rows that have not been parsed yet. Ids of tables no foreign
+        key references are not kept, so streaming memory grows with the
+        referenced tables only; stable_ids are recomputed from the key
+        (see stable_object_id) and never kept."""
+        if self.stable_ids:
+            return stable_object_id(table_name, key)
+        if table_name not in self.referenced_tables:
+            return str(ObjectId())
+        index = self.id_index.setdefault(table_name, {})
+        oid = index.get(key)
+        if oid is None:
+            oid = index[key] = str(ObjectId())
+        return oid
     
     def parse_insert_statement(self, statement):
         """Parse a single INSERT statement"""
@@ -45,6 +417,20 @@ class SQLToMongoDBParser:
         
         return table_name, dict(zip(columns, values))
     
+    def parse_insert_rows(self, statement):
+        """Parse an INSERT statement with one or more VALUES tuples.
+        Returns (table_name, [row_data, ...])"""
+        match = INSERT_PATTERN.search(statement)
+        if not match:
+            return None, []
+        
+        columns = split_columns(match.group(2))
+        rows = tokenize_values(statement, match.end())
+        if set(map(len, rows)) != {len(columns)}:
+            # An unescaped apostrophe shifted the values; rescan this statement
+            rows = scan_values_lenient(statement, match.end())
+        return match.group(1), [dict(zip(columns, row)) for row in rows]
+    
     def parse_values(self, values_str):
         """Parse VALUES clause handling strings, numbers, NULL, dates"""
         values = []
@@ -119,53 +505,86 @@ class SQLToMongoDBParser:
             content = f.read()
         
         # Split by INSERT statements
-        insert_statements = re.findall(
-            r'INSERT INTO[^;]+;',
-            content,
-            re.IGNORECASE | re.DOTALL
-        )
+        insert_statements = STATEMENT_PATTERN.findall(content)
         
         print(f"Found {len(insert_statements)} INSERT statements")
         
         # Parse each statement
         parsed_data = {}
         for statement in insert_statements:
-            table_name, row_data = self.parse_insert_statement(statement)
-            if table_name and row_data:
+            table_name, rows = self.parse_insert_rows(statement)
+            if table_name and rows:
                 table_name_lower = table_name.lower()
                 if table_name_lower not in parsed_data:
                     parsed_data[table_name_lower] = []
-                parsed_data[table_name_lower].append(row_data)
+                parsed_data[table_name_lower].extend(rows)
         
-        # Generate ObjectIds for all tables
+        # Index every referenced row's primary key before any reference is resolved
         for table_name, rows in parsed_data.items():
-            self.generate_object_ids(table_name, len(rows))
+            keys = self.row_keys[table_name] = [self.row_key(table_name, row) for row in rows]
+            if table_name in self.referenced_tables and not self.stable_ids:
+                for key in keys:
+                    self.object_id(table_name, key)
         
         return parsed_data
     
+    def iter_insert_statements(self):
+        """Yield INSERT statements one at a time, reading the file line by line"""
+        statement = []
+        with open(self.sql_file_path, 'r', encoding='utf-8') as f:
+            for line in f:
+                if not statement and not line.lstrip()[:11].upper() == 'INSERT INTO':
+                    continue
+                statement.append(line)
+                if line.rstrip().endswith(';'):
+                    yield ''.join(statement)
+                    statement = []
+    
+    def iter_sql_rows(self):
+        """Yield (table_name, row_data) in file order without holding the dump in memory"""
+        for statement in self.iter_insert_statements():
+            table_name, rows = self.parse_insert_rows(statement)
+            if table_name:
+                table_name_lower = table_name.lower()
+                for row_data in rows:
+                    yield table_name_lower, row_data
+    
+    def build_document(self, sql_table, row, key):
+        """Convert one parsed SQL row to a MongoDB document"""
+        doc = {
+            "_id": {"$oid": self.object_id(sql_table, key)}
+        }
+        # AUTO_INCREMENT ids left out of the INSERT are kept too, so documents
+        # can be found (and upserted) by their SQL key
+        primary_key = self.schema.get(sql_table, {}).get("primary_key") or []
+        if len(primary_key) == 1 and primary_key[0] not in row:
+            doc[primary_key[0]] = key
+        
+        # Add all fields from SQL
+        for key, value in row.items():
+            # Convert datetime strings
+            if isinstance(value, str) and re.match(r'\d{4}-\d{2}-\d{2}', value):
+                doc[key] = self.convert_to_datetime(value)
+            else:
+                doc[key] = value
+        
+        # Add reference fields for foreign keys
+        return self.add_references(sql_table, doc)
+    
+    def iter_documents(self):
+        """Yield (collection, document) pairs as rows are parsed (streaming mode)"""
+        self.streaming = True
+        for sql_table, row in self.iter_sql_rows():
+            mongo_collection = TABLE_MAPPING.get(sql_table)
+            if mongo_collection is None:
+                continue
+            yield mongo_collection, self.build_document(sql_table, row, self.row_key(sql_table, row))
+    
     def create_mongodb_documents(self, parsed_data):
         """Convert parsed SQL data to MongoDB documents"""
         
-        # Table name mapping
-        table_mapping = {
-            'subscriptions': 'subscriptions',
-            'trainers': 'trainers',
-            'certifications': 'certifications',
-            'users': 'users',
-            'classes': 'classes',
-            'user_class': 'user_classes',
-            'payments': 'payments',
-            'progress_tracking': 'progress_tracking',
-            'goals': 'goals',
-            'workout_plan': 'workout_plans',
-            'exercises': 'exercises',
-            'workout_exercises': 'workout_exercises',
-            'feedback': 'feedback',
-            'devices': 'devices'
-        }
-        
         # Process each table
-        for sql_table, mongo_collection in table_mapping.items():
+        for sql_table, mongo_collection in TABLE_MAPPING.items():
             if sql_table not in parsed_data:
                 print(f"Warning: {sql_table} not found in SQL data")
                 continue
@@ -173,132 +592,191 @@ class SQLToMongoDBParser:
             print(f"Processing {sql_table}...")
             documents = []
             
-            for idx, row in enumerate(parsed_data[sql_table]):
-                doc = {
-                    "_id": {"$oid": self.object_ids[sql_table][idx]}
-                }
-                
-                # Add all fields from SQL
-                for key, value in row.items():
-                    # Convert datetime strings
-                    if isinstance(value, str) and re.match(r'\d{4}-\d{2}-\d{2}', value):
-                        doc[key] = self.convert_to_datetime(value)
-                    else:
-                        doc[key] = value
-                
-                # Add reference fields for foreign keys
-                doc = self.add_references(sql_table, doc, idx)
-                
-                documents.append(doc)
+            for row, key in zip(parsed_data[sql_table], self.row_keys[sql_table]):
+                documents.append(self.build_document(sql_table, row, key))
             
             self.collections[mongo_collection] = documents
     
-    def add_references(self, table_name, doc, idx):
-        """Add MongoDB reference fields for foreign keys"""
-        
-        # Helper to get ObjectId for a reference
-        def get_ref_oid(ref_table, ref_id):
+    def documents_by_key(self, table_name):
+        """{primary key: document} for a table converted by create_mongodb_documents"""
+        documents = self.collections.get(TABLE_MAPPING.get(table_name), [])
+        return dict(zip(self.row_keys.get(table_name, []), documents))
+    
+    def embed_children(self, spec=EMBEDDING_SPEC):
+        """Copy bounded arrays of child documents into their parent documents.
+        Runs after create_mongodb_documents; the child collections are kept."""
+        for parent_table, embeds in spec.items():
+            parents = self.documents_by_key(parent_table)
+            print(f"Embedding into {TABLE_MAPPING.get(parent_table, parent_table)}: "
+                  f"{', '.join(embed['field'] for embed in embeds)}")
+            
+            for embed in embeds:
+                foreign_key = embed['foreign_key']
+                parent_ref = re.sub(r'_id$', '', foreign_key) + '_ref'
+                limit = embed.get('limit', 20)
+                sort_field = embed.get('sort')
+                snapshot = embed.get('snapshot')
+                sources = self.documents_by_key(snapshot['table']) if snapshot else {}
+                
+                children = {}
+                for child in self.collections.get(TABLE_MAPPING.get(embed['table']), []):
+                    children.setdefault(child.get(foreign_key), []).append(child)
+                
+                for key, parent in parents.items():
+                    rows = children.get(key, [])
+                    parent[embed['field'] + '_count'] = len(rows)
+                    if sort_field:
+                        # Latest first; NULLs sort last
+                        rows = heapq.nlargest(limit, rows, key=lambda row: (row.get(sort_field) is not None,
+                                                                            row.get(sort_field) or 0))
+                    else:
+                        rows = rows[:limit]
+                    
+                    items = []
+                    for row in rows:
+                        # The parent is implied by the nesting
+                        item = {k: v for k, v in row.items() if k != foreign_key and k != parent_ref}
+                        if snapshot:
+                            source = sources.get(row.get(snapshot['column']))
+                            item[snapshot['field']] = (
+                                {field: source.get(field) for field in snapshot['fields']} if source else None
+                            )
+                        items.append(item)
+                    parent[embed['field']] = items
+    
+    def add_references(self, table_name, doc):
+        """Add MongoDB reference fields for the table's foreign keys"""
+        for column, ref_table, ref_field in self.references.get(table_name, []):
+            ref_id = doc.get(column)
             if ref_id is None:
-                return None
-            try:
-                ref_idx = int(ref_id) - 1
-                if ref_idx >= 0 and ref_idx < len(self.object_ids.get(ref_table, [])):
-                    return {"$oid": self.object_ids[ref_table][ref_idx]}
-            except:
-                pass
-            return None
-        
-        # Add references based on table
-        if table_name == 'users':
-            if doc.get('subscription_id'):
-                doc['subscription_ref'] = get_ref_oid('subscriptions', doc['subscription_id'])
-            if doc.get('trainer_id'):
-                doc['trainer_ref'] = get_ref_oid('trainers', doc['trainer_id'])
-        
-        elif table_name == 'trainers':
-            if doc.get('certification_id'):
-                doc['certification_ref'] = get_ref_oid('certifications', doc['certification_id'])
-        
-        elif table_name == 'certifications':
-            if doc.get('trainer_id'):
-                doc['trainer_ref'] = get_ref_oid('trainers', doc['trainer_id'])
-        
-        elif table_name == 'classes':
-            if doc.get('trainer_id'):
-                doc['trainer_ref'] = get_ref_oid('trainers', doc['trainer_id'])
-        
-        elif table_name == 'user_class':
-            if doc.get('user_id'):
-                doc['user_ref'] = get_ref_oid('users', doc['user_id'])
-            if doc.get('class_id'):
-                doc['class_ref'] = get_ref_oid('classes', doc['class_id'])
-        
-        elif table_name == 'payments':
-            if doc.get('user_id'):
-                doc['user_ref'] = get_ref_oid('users', doc['user_id'])
-            if doc.get('subscription_id'):
-                doc['subscription_ref'] = get_ref_oid('subscriptions', doc['subscription_id'])
-        
-        elif table_name == 'progress_tracking':
-            if doc.get('user_id'):
-                doc['user_ref'] = get_ref_oid('users', doc['user_id'])
-        
-        elif table_name == 'goals':
-            if doc.get('user_id'):
-                doc['user_ref'] = get_ref_oid('users', doc['user_id'])
-        
-        elif table_name == 'workout_plan':
-            if doc.get('user_id'):
-                doc['user_ref'] = get_ref_oid('users', doc['user_id'])
-            if doc.get('trainer_id'):
-                doc['trainer_ref'] = get_ref_oid('trainers', doc['trainer_id'])
-            if doc.get('goal_id'):
-                doc['goal_ref'] = get_ref_oid('goals', doc['goal_id'])
-        
-        elif table_name == 'workout_exercises':
-            if doc.get('plan_id'):
-                doc['plan_ref'] = get_ref_oid('workout_plan', doc['plan_id'])
-            if doc.get('exercise_id'):
-                doc['exercise_ref'] = get_ref_oid('exercises', doc['exercise_id'])
-        
-        elif table_name == 'feedback':
-            if doc.get('user_id'):
-                doc['user_ref'] = get_ref_oid('users', doc['user_id'])
-            if doc.get('trainer_id'):
-                doc['trainer_ref'] = get_ref_oid('trainers', doc['trainer_id'])
-            if doc.get('class_id'):
-                doc['class_ref'] = get_ref_oid('classes', doc['class_id'])
-        
-        elif table_name == 'devices':
-            if doc.get('user_id'):
-                doc['user_ref'] = get_ref_oid('users', doc['user_id'])
-        
+                continue
+            if self.streaming or self.stable_ids:
+                # The referenced row may not have been parsed yet; stable ids need no index
+                doc[ref_field] = {"$oid": self.object_id(ref_table, ref_id)}
+            else:
+                oid = self.id_index.get(ref_table, {}).get(ref_id)
+                doc[ref_field] = {"$oid": oid} if oid else None
         return doc
     
-    def save_json_files(self):
-        """Save MongoDB collections as JSON files"""
-        
-        class DateTimeEncoder(json.JSONEncoder):
-            def default(self, obj):
-                if isinstance(obj, datetime):
-                    return {"$date": obj.strftime('%Y-%m-%dT%H:%M:%S.000Z')}
-                return super().default(obj)
-        
+    def save_json_files(self, fmt="json", compress=False):
+        """Save MongoDB collections as json, ndjson or bson files, optionally gzipped"""
+        self.output_format = fmt
+        self.compress = compress
         for collection_name, documents in self.collections.items():
-            filename = f"{collection_name}.json"
-            with open(filename, 'w', encoding='utf-8') as f:
-                json.dump(documents, f, indent=2, cls=DateTimeEncoder)
-            print(f"✅ Created: {filename} ({len(documents)} documents)")
+            writer = CollectionWriter(collection_name, fmt, compress)
+            try:
+                for doc in documents:
+                    writer.write(doc)
+            finally:
+                writer.close()
+            self.output_files[collection_name] = writer.filename
+            print(f"✅ Created: {writer.filename} ({len(documents)} documents)")
+    
+    def stream_json_files(self, fmt="json", compress=False):
+        """Parse the SQL file and write each document to its collection's
+        file as soon as it is built, so memory does not grow with the dump"""
+        self.output_format = fmt
+        self.compress = compress
+        writers = {}
+        try:
+            for collection_name, doc in self.iter_documents():
+                writer = writers.get(collection_name)
+                if writer is None:
+                    writer = writers[collection_name] = CollectionWriter(collection_name, fmt, compress)
+                    self.output_files[collection_name] = writer.filename
+                    self.samples[collection_name] = doc
+                writer.write(doc)
+        finally:
+            for collection_name, writer in writers.items():
+                writer.close()
+                self.document_counts[collection_name] = writer.count
+        
+        for collection_name, count in self.document_counts.items():
+            print(f"✅ Created: {self.output_files[collection_name]} ({count} documents)")
+    
+    def load_to_mongodb(self, db, documents=None, batch_size=1000, workers=4):
+        """Insert documents straight into MongoDB with unordered insert_many batches.
+        
+        documents is an iterable of (collection, document) pairs, e.g.
+        iter_documents() when streaming; defaults to the in-memory collections.
+        Up to `workers` batches are in flight at once, across collections, and
+        indexes are built after all data is in. Returns {collection: count}.
+        """
+        if documents is None:
+            documents = ((name, doc) for name, docs in self.collections.items() for doc in docs)
+        
+        def insert_batch(collection_name, batch):
+            db[collection_name].insert_many(batch, ordered=False)
+        
+        counts = {}
+        batches = {}
+        pending = set()
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            def submit(collection_name, batch):
+                # Keep at most two batches per worker in memory
+                while len(pending) >= workers * 2:
+                    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        future.result()
+                        pending.discard(future)
+                pending.add(pool.submit(insert_batch, collection_name, batch))
+            
+            for collection_name, doc in documents:
+                batch = batches.get(collection_name)
+                if batch is None:
+                    db.drop_collection(collection_name)
+                    batch = batches[collection_name] = []
+                    counts[collection_name] = 0
+                    self.samples[collection_name] = doc
+                batch.append(to_bson_value(doc))
+                counts[collection_name] += 1
+                if len(batch) >= batch_size:
+                    submit(collection_name, batch)
+                    batches[collection_name] = []
+            
+            for collection_name, batch in batches.items():
+                if batch:
+                    submit(collection_name, batch)
+            for future in pending:
+                future.result()
+            
+            index_jobs = [
+                pool.submit(db[collection_name].create_index, field, unique=unique)
+                for collection_name in counts
+                for field, unique in COLLECTION_INDEXES.get(collection_name, [])
+            ]
+            for future in index_jobs:
+                future.result()
+        
+        self.document_counts = counts
+        return counts
+    
+    def import_command(self, collection, filename):
+        """Shell command that loads one collection file in the current output format"""
+        if self.output_format == "bson":
+            gzip_flag = "--gzip " if self.compress else ""
+            return (f"mongorestore {gzip_flag}--db $DATABASE --collection {collection} --drop "
+                    f"--numInsertionWorkersPerCollection $WORKERS {filename}")
+        
+        options = "--jsonArray" if self.output_format == "json" else "--numInsertionWorkers $WORKERS"
+        # Stable _ids match the documents of an earlier import, so they can be
+        # upserted in place instead of dropping the collection
+        options += " --mode=upsert" if self.stable_ids else " --drop"
+        if self.compress:
+            # mongoimport reads stdin when --file is omitted
+            return f"gunzip -c {filename} | mongoimport --db $DATABASE --collection {collection} {options}"
+        return f"mongoimport --db $DATABASE --collection {collection} --file {filename} {options}"
     
     def create_import_script(self):
         """Create MongoDB import script"""
-        collections = list(self.collections.keys())
+        collections = list(self.collections.keys()) or list(self.document_counts.keys())
         
         script_content = """#!/bin/bash
 # MongoDB Import Script - Exact SQL Match
-# Usage: ./import_exact_mongodb.sh [database_name]
+# Usage: ./import_exact_mongodb.sh [database_name] [insertion_workers]
 
 DATABASE=${1:-fitness_db}
+WORKERS=${2:-4}
 
 echo "Importing exact SQL data to MongoDB database: $DATABASE"
 echo "============================================"
@@ -306,9 +784,10 @@ echo "============================================"
 """
         
         for collection in collections:
+            filename = self.output_files.get(collection, f"{collection}.json")
             script_content += f"""
 echo "Importing {collection}..."
-mongoimport --db $DATABASE --collection {collection} --file {collection}.json --jsonArray --drop
+{self.import_command(collection, filename)}
 """
         
         script_content += """
@@ -321,7 +800,6 @@ echo "Data now matches exactly with MySQL!"
         with open("import_exact_mongodb.sh", 'w') as f:
             f.write(script_content)
         
-        import os
         os.chmod("import_exact_mongodb.sh", 0o755)
         
         print("✅ Created: import_exact_mongodb.sh")
@@ -332,11 +810,16 @@ echo "Data now matches exactly with MySQL!"
         print("DATA VERIFICATION SUMMARY")
         print("="*70)
         
-        for collection_name, documents in self.collections.items():
-            if documents:
-                sample = documents[0]
+        if self.collections:
+            summary = [(name, len(documents), documents[0] if documents else None)
+                       for name, documents in self.collections.items()]
+        else:
+            summary = [(name, count, self.samples[name]) for name, count in self.document_counts.items()]
+        
+        for collection_name, count, sample in summary:
+            if sample:
                 print(f"\n{collection_name.upper()}:")
-                print(f"  Total documents: {len(documents)}")
+                print(f"  Total documents: {count}")
                 print(f"  Sample ID 1:")
                 for key, value in list(sample.items())[:5]:
                     if key != '_id' and not key.endswith('_ref'):
@@ -346,63 +829,128 @@ echo "Data now matches exactly with MySQL!"
 # MAIN EXECUTION
 # ============================================
 if __name__ == "__main__":
+    import argparse
     import sys
     
+    arg_parser = argparse.ArgumentParser(description="Convert a MySQL INSERT dump into MongoDB import files")
+    arg_parser.add_argument("sql_file", nargs="?", default="fitness1.sql", help="SQL file to convert")
+    arg_parser.add_argument("--schema", default=SCHEMA_FILE,
+                            help="DDL file with the CREATE TABLE primary and foreign keys (default: fitness.sql)")
+    arg_parser.add_argument("--stream", action="store_true",
+                            help="Convert the dump row by row instead of loading it into memory")
+    arg_parser.add_argument("--format", choices=list(OUTPUT_FORMATS), default="json",
+                            help="json (pretty array), ndjson (one document per line) or bson (mongorestore)")
+    arg_parser.add_argument("--gzip", action="store_true", help="gzip-compress the output files")
+    arg_parser.add_argument("--load", action="store_true",
+                            help="Insert directly into MongoDB instead of writing files and an import script")
+    arg_parser.add_argument("--uri", default="mongodb://localhost:27017",
+                            help="MongoDB connection URI for --load (mongomock:// for an in-process test database)")
+    arg_parser.add_argument("--database", default="fitness_db", help="Database name for --load")
+    arg_parser.add_argument("--batch-size", type=int, default=1000, help="Documents per insert_many call")
+    arg_parser.add_argument("--workers", type=int, default=4, help="Concurrent insert_many batches")
+    arg_parser.add_argument("--embed", action="store_true",
+                            help="Embed bounded child arrays (devices, progress, certifications, ...) in parent documents")
+    arg_parser.add_argument("--embed-spec", help="JSON file with a custom embedding spec (implies --embed)")
+    arg_parser.add_argument("--stable-ids", action="store_true",
+                            help="Derive every _id from table name and primary key, so re-exports keep their "
+                                 "ids and the import script upserts instead of dropping")
+    args = arg_parser.parse_args()
+    embed_spec = None
+    if args.embed_spec:
+        with open(args.embed_spec, 'r', encoding='utf-8') as f:
+            embed_spec = json.load(f)
+    elif args.embed:
+        embed_spec = EMBEDDING_SPEC
+    if embed_spec and args.stream:
+        arg_parser.error("--embed needs every child row before writing its parent; drop --stream")
+    sql_file = args.sql_file
+    
     print("="*70)
     print("SQL TO MONGODB PARSER - EXACT MATCH")
     print("="*70)
     print()
     
-    # Check if SQL file path provided
-    sql_file = "fitness1.sql"  # Default file name
-    if len(sys.argv) > 1:
-        sql_file = sys.argv[1]
-    
     print(f"Reading SQL file: {sql_file}")
     print()
     
     try:
         # Create parser
-        parser = SQLToMongoDBParser(sql_file)
-        
-        # Parse SQL file
-        print("Step 1: Parsing SQL file...")
-        parsed_data = parser.parse_sql_file()
-        
-        print()
-        print("Step 2: Converting to MongoDB documents...")
-        parser.create_mongodb_documents(parsed_data)
+        parser = SQLToMongoDBParser(sql_file, args.schema, args.stable_ids)
+        
+        if args.load:
+            db = connect_mongodb(args.uri)[args.database]
+            start = time.perf_counter()
+            if args.stream:
+                if not os.path.exists(sql_file):
+                    raise FileNotFoundError(sql_file)
+                print(f"Steps 1-3: Streaming SQL rows into MongoDB database: {args.database}...")
+                counts = parser.load_to_mongodb(db, parser.iter_documents(), args.batch_size, args.workers)
+            else:
+                print("Step 1: Parsing SQL file...")
+                parser.create_mongodb_documents(parser.parse_sql_file())
+                if embed_spec:
+                    parser.embed_children(embed_spec)
+                print()
+                print(f"Steps 2-3: Loading into MongoDB database: {args.database}...")
+                counts = parser.load_to_mongodb(db, None, args.batch_size, args.workers)
+            elapsed = time.perf_counter() - start
+            for collection_name, count in counts.items():
+                print(f"✅ Loaded: {collection_name} ({count} documents)")
+            total = sum(counts.values())
+            print(f"✅ {total} documents in {elapsed:.2f}s ({total / max(elapsed, 1e-9):,.0f} docs/sec), indexes built")
+        elif args.stream:
+            # Parse, convert and save in a single pass over the file
+            if not os.path.exists(sql_file):
+                raise FileNotFoundError(sql_file)
+            print(f"Steps 1-3: Streaming SQL rows into {args.format.upper()} files...")
+            parser.stream_json_files(args.format, args.gzip)
+        else:
+            # Parse SQL file
+            print("Step 1: Parsing SQL file...")
+            parsed_data = parser.parse_sql_file()
+            
+            print()
+            print("Step 2: Converting to MongoDB documents...")
+            parser.create_mongodb_documents(parsed_data)
+            if embed_spec:
+                parser.embed_children(embed_spec)
+            
+            print()
+            print(f"Step 3: Saving {args.format.upper()} files...")
+            parser.save_json_files(args.format, args.gzip)
         
-        print()
-        print("Step 3: Saving JSON files...")
-        parser.save_json_files()
-        
-        print()
-        print("Step 4: Creating import script...")
-        parser.create_import_script()
+        if not args.load:
+            print()
+            print("Step 4: Creating import script...")
+            parser.create_import_script()
         
         print()
         parser.verify_data()
         
         print()
         print("="*70)
-        print("✅ SUCCESS! MongoDB JSON files match your SQL data exactly!")
-        print("="*70)
-        print()
-        print("Generated Files:")
-        print(f"  - {len(parser.collections)} JSON files (one per collection)")
-        print("  - import_exact_mongodb.sh (import script)")
-        print()
-        print("To import into MongoDB:")
-        print("  ./import_exact_mongodb.sh fitness_db")
-        print()
+        if args.load:
+            print(f"✅ SUCCESS! MongoDB database '{args.database}' matches your SQL data exactly!")
+            print("="*70)
+            print()
+        else:
+            print("✅ SUCCESS! MongoDB JSON files match your SQL data exactly!")
+            print("="*70)
+            print()
+            print("Generated Files:")
+            print(f"  - {len(parser.output_files)} {args.format.upper()} files (one per collection)")
+            print("  - import_exact_mongodb.sh (import script)")
+            print()
+            print("To import into MongoDB:")
+            print("  ./import_exact_mongodb.sh fitness_db")
+            print()
         print("To verify data matches:")
         print("  MySQL:   SELECT * FROM Users WHERE user_id = 1;")
         print("  MongoDB: db.users.findOne({user_id: 1})")
         print()
         
-    except FileNotFoundError:
-        print(f"❌ ERROR: File '{sql_file}' not found!")
+    except FileNotFoundError as e:
+        print(f"❌ ERROR: File '{e.filename or sql_file}' not found!")
         print()
         print("Usage:")
         print(f"  python3 {sys.argv[0]} your_sql_file.sql")
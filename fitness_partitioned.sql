@@ -0,0 +1,149 @@
+-- ============================================
+-- FITNESS MANAGEMENT SYSTEM - MONTHLY PARTITIONING
+-- Converts the append-only Payments and Progress_Tracking tables to
+-- RANGE COLUMNS partitions, one per calendar month, so date-bounded
+-- analytics prune to the months they read and retention drops whole
+-- partitions instead of running DELETE scans.
+-- Apply after fitness.sql (and fitness_indexes.sql). Run
+--   python dma_python_application/partition_maintenance.py
+-- monthly to add future partitions and archive expired ones.
+--
+-- MySQL partitioning rules this relies on:
+--   * every unique key must contain the partitioning column, so the
+--     primary keys become (payment_id, payment_date) and (progress_id, date)
+--   * partitioned InnoDB tables cannot have foreign keys, so the user and
+--     subscription FKs are dropped here; ON DELETE CASCADE from Users no
+--     longer reaches these tables and orphan checks (QUERY 10 in
+--     fitness_queries.sql) cover them instead
+-- ============================================
+
+-- ============================================
+-- 1. PAYMENTS
+-- ============================================
+-- The FK names are looked up rather than assumed to be MySQL's generated
+-- Payments_ibfk_N; once none are left (a re-run) the step is a DO 0 no-op
+SELECT COALESCE(CONCAT('ALTER TABLE Payments ',
+                       GROUP_CONCAT(CONCAT('DROP FOREIGN KEY `', CONSTRAINT_NAME, '`') SEPARATOR ', ')),
+                'DO 0')
+INTO @drop_foreign_keys
+FROM information_schema.REFERENTIAL_CONSTRAINTS
+WHERE CONSTRAINT_SCHEMA = DATABASE() AND TABLE_NAME = 'Payments';
+PREPARE drop_foreign_keys FROM @drop_foreign_keys;
+EXECUTE drop_foreign_keys;
+DEALLOCATE PREPARE drop_foreign_keys;
+
+-- One rebuild: new primary key and partitioning in the same statement
+ALTER TABLE Payments
+    DROP PRIMARY KEY,
+    ADD PRIMARY KEY (payment_id, payment_date)
+PARTITION BY RANGE COLUMNS (payment_date) (
+    PARTITION p_history VALUES LESS THAN ('2024-01-01'),
+    PARTITION p202401 VALUES LESS THAN ('2024-02-01'),
+    PARTITION p202402 VALUES LESS THAN ('2024-03-01'),
+    PARTITION p202403 VALUES LESS THAN ('2024-04-01'),
+    PARTITION p202404 VALUES LESS THAN ('2024-05-01'),
+    PARTITION p202405 VALUES LESS THAN ('2024-06-01'),
+    PARTITION p202406 VALUES LESS THAN ('2024-07-01'),
+    PARTITION p202407 VALUES LESS THAN ('2024-08-01'),
+    PARTITION p202408 VALUES LESS THAN ('2024-09-01'),
+    PARTITION p202409 VALUES LESS THAN ('2024-10-01'),
+    PARTITION p202410 VALUES LESS THAN ('2024-11-01'),
+    PARTITION p202411 VALUES LESS THAN ('2024-12-01'),
+    PARTITION p202412 VALUES LESS THAN ('2025-01-01'),
+    PARTITION p202501 VALUES LESS THAN ('2025-02-01'),
+    PARTITION p202502 VALUES LESS THAN ('2025-03-01'),
+    PARTITION p202503 VALUES LESS THAN ('2025-04-01'),
+    PARTITION p202504 VALUES LESS THAN ('2025-05-01'),
+    PARTITION p202505 VALUES LESS THAN ('2025-06-01'),
+    PARTITION p202506 VALUES LESS THAN ('2025-07-01'),
+    PARTITION p202507 VALUES LESS THAN ('2025-08-01'),
+    PARTITION p202508 VALUES LESS THAN ('2025-09-01'),
+    PARTITION p202509 VALUES LESS THAN ('2025-10-01'),
+    PARTITION p202510 VALUES LESS THAN ('2025-11-01'),
+    PARTITION p202511 VALUES LESS THAN ('2025-12-01'),
+    PARTITION p202512 VALUES LESS THAN ('2026-01-01'),
+    PARTITION p202601 VALUES LESS THAN ('2026-02-01'),
+    PARTITION p202602 VALUES LESS THAN ('2026-03-01'),
+    PARTITION p202603 VALUES LESS THAN ('2026-04-01'),
+    PARTITION p202604 VALUES LESS THAN ('2026-05-01'),
+    PARTITION p202605 VALUES LESS THAN ('2026-06-01'),
+    PARTITION p202606 VALUES LESS THAN ('2026-07-01'),
+    PARTITION p202607 VALUES LESS THAN ('2026-08-01'),
+    PARTITION p202608 VALUES LESS THAN ('2026-09-01'),
+    PARTITION p202609 VALUES LESS THAN ('2026-10-01'),
+    PARTITION p202610 VALUES LESS THAN ('2026-11-01'),
+    PARTITION p202611 VALUES LESS THAN ('2026-12-01'),
+    PARTITION p202612 VALUES LESS THAN ('2027-01-01'),
+    PARTITION p_future VALUES LESS THAN (MAXVALUE)
+);
+
+-- ============================================
+-- 2. PROGRESS_TRACKING
+-- ============================================
+SELECT COALESCE(CONCAT('ALTER TABLE Progress_Tracking ',
+                       GROUP_CONCAT(CONCAT('DROP FOREIGN KEY `', CONSTRAINT_NAME, '`') SEPARATOR ', ')),
+                'DO 0')
+INTO @drop_foreign_keys
+FROM information_schema.REFERENTIAL_CONSTRAINTS
+WHERE CONSTRAINT_SCHEMA = DATABASE() AND TABLE_NAME = 'Progress_Tracking';
+PREPARE drop_foreign_keys FROM @drop_foreign_keys;
+EXECUTE drop_foreign_keys;
+DEALLOCATE PREPARE drop_foreign_keys;
+
+-- One rebuild: new primary key and partitioning in the same statement
+ALTER TABLE Progress_Tracking
+    DROP PRIMARY KEY,
+    ADD PRIMARY KEY (progress_id, date)
+PARTITION BY RANGE COLUMNS (date) (
+    PARTITION p_history VALUES LESS THAN ('2024-01-01'),
+    PARTITION p202401 VALUES LESS THAN ('2024-02-01'),
+    PARTITION p202402 VALUES LESS THAN ('2024-03-01'),
+    PARTITION p202403 VALUES LESS THAN ('2024-04-01'),
+    PARTITION p202404 VALUES LESS THAN ('2024-05-01'),
+    PARTITION p202405 VALUES LESS THAN ('2024-06-01'),
+    PARTITION p202406 VALUES LESS THAN ('2024-07-01'),
+    PARTITION p202407 VALUES LESS THAN ('2024-08-01'),
+    PARTITION p202408 VALUES LESS THAN ('2024-09-01'),
+    PARTITION p202409 VALUES LESS THAN ('2024-10-01'),
+    PARTITION p202410 VALUES LESS THAN ('2024-11-01'),
+    PARTITION p202411 VALUES LESS THAN ('2024-12-01'),
+    PARTITION p202412 VALUES LESS THAN ('2025-01-01'),
+    PARTITION p202501 VALUES LESS THAN ('2025-02-01'),
+    PARTITION p202502 VALUES LESS THAN ('2025-03-01'),
+    PARTITION p202503 VALUES LESS THAN ('2025-04-01'),
+    PARTITION p202504 VALUES LESS THAN ('2025-05-01'),
+    PARTITION p202505 VALUES LESS THAN ('2025-06-01'),
+    PARTITION p202506 VALUES LESS THAN ('2025-07-01'),
+    PARTITION p202507 VALUES LESS THAN ('2025-08-01'),
+    PARTITION p202508 VALUES LESS THAN ('2025-09-01'),
+    PARTITION p202509 VALUES LESS THAN ('2025-10-01'),
+    PARTITION p202510 VALUES LESS THAN ('2025-11-01'),
+    PARTITION p202511 VALUES LESS THAN ('2025-12-01'),
+    PARTITION p202512 VALUES LESS THAN ('2026-01-01'),
+    PARTITION p202601 VALUES LESS THAN ('2026-02-01'),
+    PARTITION p202602 VALUES LESS THAN ('2026-03-01'),
+    PARTITION p202603 VALUES LESS THAN ('2026-04-01'),
+    PARTITION p202604 VALUES LESS THAN ('2026-05-01'),
+    PARTITION p202605 VALUES LESS THAN ('2026-06-01'),
+    PARTITION p202606 VALUES LESS THAN ('2026-07-01'),
+    PARTITION p202607 VALUES LESS THAN ('2026-08-01'),
+    PARTITION p202608 VALUES LESS THAN ('2026-09-01'),
+    PARTITION p202609 VALUES LESS THAN ('2026-10-01'),
+    PARTITION p202610 VALUES LESS THAN ('2026-11-01'),
+    PARTITION p202611 VALUES LESS THAN ('2026-12-01'),
+    PARTITION p202612 VALUES LESS THAN ('2027-01-01'),
+    PARTITION p_future VALUES LESS THAN (MAXVALUE)
+);
+
+-- ============================================
+-- 3. VERIFY PRUNING
+-- ============================================
+-- The partitions column should list only p202501..p202503
+EXPLAIN SELECT COUNT(*), SUM(amount)
+FROM Payments
+WHERE payment_date >= '2025-01-01' AND payment_date < '2025-04-01';
+
+SELECT TABLE_NAME, PARTITION_NAME, PARTITION_DESCRIPTION, TABLE_ROWS
+FROM information_schema.PARTITIONS
+WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME IN ('Payments', 'Progress_Tracking')
+ORDER BY TABLE_NAME, PARTITION_ORDINAL_POSITION;
@@ -37,6 +37,8 @@ ORDER BY u.user_id;
 -- JOINS: Trainers -> Classes, Trainers -> Feedback, Trainers -> Certifications
 -- AGGREGATION: COUNT, AVG
 -- ============================================
+-- Classes and Feedback are aggregated per trainer before the join, since joining
+-- both raw tables multiplied rows and inflated total_capacity
 SELECT 
     t.trainer_id,
     t.full_name AS trainer_name,
@@ -45,17 +47,22 @@ SELECT
     t.rating AS overall_rating,
     c.certification_name,
     c.issued_by,
-    COUNT(DISTINCT cl.class_id) AS total_classes,
-    COUNT(DISTINCT f.feedback_id) AS feedback_count,
-    AVG(f.rating) AS avg_feedback_rating,
-    SUM(cl.max_participants) AS total_capacity
+    cl.total_classes,
+    COALESCE(f.feedback_count, 0) AS feedback_count,
+    f.avg_feedback_rating,
+    cl.total_capacity
 FROM Trainers t
 LEFT JOIN Certifications c ON t.certification_id = c.certification_id
-LEFT JOIN Classes cl ON t.trainer_id = cl.trainer_id
-LEFT JOIN Feedback f ON t.trainer_id = f.trainer_id
-GROUP BY t.trainer_id, t.full_name, t.specialization, t.experience_years, 
-         t.rating, c.certification_name, c.issued_by
-HAVING total_classes > 0
+INNER JOIN (
+    SELECT trainer_id, COUNT(*) AS total_classes, SUM(max_participants) AS total_capacity
+    FROM Classes
+    GROUP BY trainer_id
+) cl ON t.trainer_id = cl.trainer_id
+LEFT JOIN (
+    SELECT trainer_id, COUNT(*) AS feedback_count, AVG(rating) AS avg_feedback_rating
+    FROM Feedback
+    GROUP BY trainer_id
+) f ON t.trainer_id = f.trainer_id
 ORDER BY avg_feedback_rating DESC, total_classes DESC;
 
 
@@ -197,26 +204,43 @@ ORDER BY days_expired DESC;
 -- USE CASE: Calculate user engagement based on class attendance, payments, and progress
 -- JOINS: Users -> User_Class -> Payments -> Progress_Tracking -> Devices
 -- ============================================
+-- Each child table is aggregated per user before the join, so the joins
+-- stay one row per user instead of classes x payments x progress x devices
 SELECT 
     u.user_id,
     u.full_name,
     u.email,
-    COUNT(DISTINCT uc.class_id) AS classes_enrolled,
-    SUM(CASE WHEN uc.attendance_status = 'Attended' THEN 1 ELSE 0 END) AS classes_attended,
-    COUNT(DISTINCT p.payment_id) AS total_payments,
-    SUM(CASE WHEN p.status = 'Completed' THEN 1 ELSE 0 END) AS successful_payments,
-    COUNT(DISTINCT pt.progress_id) AS progress_entries,
-    COUNT(DISTINCT d.device_id) AS synced_devices,
-    (COUNT(DISTINCT uc.class_id) * 2 + 
-     SUM(CASE WHEN uc.attendance_status = 'Attended' THEN 1 ELSE 0 END) * 5 +
-     COUNT(DISTINCT pt.progress_id) * 3 +
-     COUNT(DISTINCT d.device_id) * 2) AS engagement_score
+    COALESCE(uc.classes_enrolled, 0) AS classes_enrolled,
+    COALESCE(uc.classes_attended, 0) AS classes_attended,
+    COALESCE(p.total_payments, 0) AS total_payments,
+    COALESCE(p.successful_payments, 0) AS successful_payments,
+    COALESCE(pt.progress_entries, 0) AS progress_entries,
+    COALESCE(d.synced_devices, 0) AS synced_devices,
+    (COALESCE(uc.classes_enrolled, 0) * 2 + 
+     COALESCE(uc.classes_attended, 0) * 5 +
+     COALESCE(pt.progress_entries, 0) * 3 +
+     COALESCE(d.synced_devices, 0) * 2) AS engagement_score
 FROM Users u
-LEFT JOIN User_Class uc ON u.user_id = uc.user_id
-LEFT JOIN Payments p ON u.user_id = p.user_id
-LEFT JOIN Progress_Tracking pt ON u.user_id = pt.user_id
-LEFT JOIN Devices d ON u.user_id = d.user_id
-GROUP BY u.user_id, u.full_name, u.email
+LEFT JOIN (
+    SELECT user_id,
+           COUNT(*) AS classes_enrolled,
+           SUM(CASE WHEN attendance_status = 'Attended' THEN 1 ELSE 0 END) AS classes_attended
+    FROM User_Class
+    GROUP BY user_id
+) uc ON u.user_id = uc.user_id
+LEFT JOIN (
+    SELECT user_id,
+           COUNT(*) AS total_payments,
+           SUM(CASE WHEN status = 'Completed' THEN 1 ELSE 0 END) AS successful_payments
+    FROM Payments
+    GROUP BY user_id
+) p ON u.user_id = p.user_id
+LEFT JOIN (
+    SELECT user_id, COUNT(*) AS progress_entries FROM Progress_Tracking GROUP BY user_id
+) pt ON u.user_id = pt.user_id
+LEFT JOIN (
+    SELECT user_id, COUNT(*) AS synced_devices FROM Devices GROUP BY user_id
+) d ON u.user_id = d.user_id
 ORDER BY engagement_score DESC
 LIMIT 20;
 
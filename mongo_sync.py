@@ -0,0 +1,423 @@
+"""
+Incremental MySQL to MongoDB Sync
+Keeps the collections built by fitness_json.py current without the --drop
+reload. --setup installs AFTER INSERT/UPDATE/DELETE triggers on every
+synced table that queue the primary key of each changed row in
+Sync_Changes, whose AUTO_INCREMENT change_id only grows. Each sync reads
+the queued keys, re-reads just those rows, upserts them by SQL primary key
+(so every document keeps its _id) and deletes the documents whose row is
+gone, then removes the changes it applied: the work is proportional to
+the changes, and backdated or out-of-order rows are seen like any other.
+With --stable-ids, new documents get the same table+key derived _id as
+fitness_json.py --stable-ids gives them, and references need no lookup.
+Triggers do not fire for foreign key cascades; --reconcile also compares
+CRC32 checksums of fixed key ranges over whole tables (computed inside
+MySQL, kept in the _sync_state collection) with the previous run's and
+re-reads the ranges that changed - run it occasionally, e.g. nightly.
+Usage: python mongo_sync.py [--setup] [--uri URI] [--database DB] [--reconcile] [--stable-ids] [--dry-run]
+"""
+
+import os
+import time
+from datetime import date, datetime
+from decimal import Decimal
+
+import mysql.connector
+from bson import ObjectId
+from pymongo import DeleteOne, UpdateOne
+
+from fitness_json import SCHEMA_FILE, TABLE_MAPPING, SQLToMongoDBParser, connect_mongodb, stable_object_id
+
+# MySQL connection settings, the same environment variables as dma_python_application/db_pool.py
+MYSQL_CONFIG = {
+    'host': os.environ.get('FITNESS_DB_HOST', 'localhost'),
+    'port': int(os.environ.get('FITNESS_DB_PORT', '3306')),
+    'database': os.environ.get('FITNESS_DB_NAME', 'fitness'),
+    'user': os.environ.get('FITNESS_DB_USER', 'root'),
+    'password': os.environ.get('FITNESS_DB_PASSWORD', ''),
+}
+
+STATE_COLLECTION = '_sync_state'
+CHANGES_TABLE = 'Sync_Changes'
+# Queued changes applied per batch; rows per bulk_write and per fetchmany
+BATCH_SIZE = 1000
+# Width of the key ranges checksummed by --reconcile
+CHECKSUM_RANGE = 1000
+
+# Every synced primary key is one or two integer columns; key_2 is 0 for single keys
+CHANGES_DDL = f"""
+    CREATE TABLE IF NOT EXISTS {CHANGES_TABLE} (
+        change_id BIGINT PRIMARY KEY AUTO_INCREMENT,
+        table_name VARCHAR(64) NOT NULL,
+        key_1 BIGINT NOT NULL,
+        key_2 BIGINT NOT NULL DEFAULT 0
+    )
+"""
+
+def quote(column):
+    return f"`{column}`"
+
+def change_values(table, primary_key, row):
+    """VALUES tuple queuing the key of the OLD or NEW row"""
+    keys = [f"{row}.{quote(column)}" for column in primary_key] + ["0"] * (2 - len(primary_key))
+    return f"('{table}', {', '.join(keys)})"
+
+def trigger_statements(table, mysql_table, primary_key):
+    """DROP/CREATE statements for the three triggers queuing a table's changed keys.
+    Updates queue the old and the new key, since a primary key can change."""
+    insert = f"INSERT INTO {CHANGES_TABLE} (table_name, key_1, key_2) VALUES "
+    bodies = {
+        'INSERT': insert + change_values(table, primary_key, 'NEW'),
+        'UPDATE': insert + f"{change_values(table, primary_key, 'OLD')}, {change_values(table, primary_key, 'NEW')}",
+        'DELETE': insert + change_values(table, primary_key, 'OLD'),
+    }
+    statements = []
+    for event, body in bodies.items():
+        trigger = f"trg_{table}_sync_{event.lower()}"
+        statements += [f"DROP TRIGGER IF EXISTS {trigger}",
+                       f"CREATE TRIGGER {trigger} AFTER {event} ON {mysql_table} FOR EACH ROW {body}"]
+    return statements
+
+def to_document_value(value):
+    """MySQL connector value -> BSON-encodable value"""
+    if isinstance(value, Decimal):
+        return float(value)
+    if isinstance(value, date) and not isinstance(value, datetime):
+        return datetime(value.year, value.month, value.day)
+    return value
+
+def iter_row_batches(connection, sql, params=()):
+    """Rows of a query as lists of dicts, read through an unbuffered cursor"""
+    cursor = connection.cursor(dictionary=True, buffered=False)
+    try:
+        cursor.execute(sql, params)
+        while True:
+            batch = cursor.fetchmany(BATCH_SIZE)
+            if not batch:
+                break
+            yield batch
+    finally:
+        cursor.close()
+
+def checksum_sql(table, columns, lead_column):
+    """Row count and XOR of per-row CRC32s for every CHECKSUM_RANGE-wide key range"""
+    values = ", ".join(quote(column) for column in columns)
+    # CONCAT_WS skips NULLs, so their positions are appended separately
+    nulls = ", ".join(f"{quote(column)} IS NULL" for column in columns)
+    return (f"SELECT FLOOR({quote(lead_column)} / {CHECKSUM_RANGE}) AS range_no, COUNT(*) AS row_count, "
+            f"BIT_XOR(CRC32(CONCAT_WS('#', {values}, CONCAT({nulls})))) AS checksum "
+            f"FROM {table} GROUP BY range_no")
+
+def mysql_table_names(connection):
+    """{lower-case name: name as created}; table names are case-sensitive on Linux"""
+    cursor = connection.cursor()
+    try:
+        cursor.execute("SELECT TABLE_NAME FROM information_schema.TABLES WHERE TABLE_SCHEMA = DATABASE()")
+        return {name.lower(): name for name, in cursor.fetchall()}
+    finally:
+        cursor.close()
+
+def table_columns(connection, table):
+    cursor = connection.cursor()
+    try:
+        cursor.execute(f"SELECT * FROM {table} LIMIT 0")
+        cursor.fetchall()
+        return list(cursor.column_names)
+    finally:
+        cursor.close()
+
+def range_checksums(connection, table, columns, lead_column):
+    """{range number (as a string): [row count, checksum]}"""
+    cursor = connection.cursor()
+    try:
+        cursor.execute(checksum_sql(table, columns, lead_column))
+        return {str(int(range_no)): [int(count), int(checksum)] for range_no, count, checksum in cursor.fetchall()}
+    finally:
+        cursor.close()
+
+class MongoSync:
+    """Incremental sync of every table in TABLE_MAPPING, parents first"""
+
+    def __init__(self, connection, db, schema_file=SCHEMA_FILE, dry_run=False, stable_ids=False):
+        self.connection = connection
+        self.db = db
+        self.parser = SQLToMongoDBParser(None, schema_file, stable_ids)
+        self.schema = self.parser.schema
+        self.dry_run = dry_run
+        self.table_names = mysql_table_names(connection)
+        # (collection, filter, ref field, referenced table, key) whose parent
+        # document did not exist yet when the row was written
+        self.unresolved = []
+
+    def key_filter(self, table, row):
+        return {column: row[column] for column in self.schema[table]["primary_key"]}
+
+    def stable_id(self, table, row):
+        primary_key = self.schema[table]["primary_key"]
+        key = row[primary_key[0]] if len(primary_key) == 1 else tuple(row[column] for column in primary_key)
+        return ObjectId(stable_object_id(table, key))
+
+    def resolve_references(self, table, documents):
+        """Set each <fk>_ref to the _id of the referenced document, looked up by its SQL key"""
+        for column, ref_table, ref_field in self.parser.references.get(table, []):
+            if self.parser.stable_ids:
+                for doc in documents:
+                    key = doc.get(column)
+                    doc[ref_field] = ObjectId(stable_object_id(ref_table, key)) if key is not None else None
+                continue
+            keys = {doc[column] for doc in documents if doc.get(column) is not None}
+            ref_key = self.schema[ref_table]["primary_key"][0]
+            found = {}
+            if keys:
+                found = {parent[ref_key]: parent["_id"] for parent in
+                         self.db[TABLE_MAPPING[ref_table]].find({ref_key: {"$in": list(keys)}}, {ref_key: 1})}
+            for doc in documents:
+                key = doc.get(column)
+                doc[ref_field] = found.get(key)
+                if key is not None and doc[ref_field] is None:
+                    self.unresolved.append((TABLE_MAPPING[table], self.key_filter(table, doc),
+                                            ref_field, ref_table, key))
+
+    def upsert(self, table, rows):
+        """Insert or overwrite the documents for rows; returns how many were written"""
+        documents = [{column: to_document_value(value) for column, value in row.items()} for row in rows]
+        self.resolve_references(table, documents)
+        if not self.dry_run and documents:
+            # _id is only ever set on insert: an existing document keeps its own
+            self.db[TABLE_MAPPING[table]].bulk_write(
+                [UpdateOne(self.key_filter(table, doc),
+                           {"$set": doc, "$setOnInsert": {"_id": self.stable_id(table, doc)}}
+                           if self.parser.stable_ids else {"$set": doc}, upsert=True)
+                 for doc in documents],
+                ordered=False)
+        return len(documents)
+
+    def synced_tables(self):
+        """Tables in TABLE_MAPPING (parents first) that exist in both the schema and MySQL"""
+        return [table for table in TABLE_MAPPING if table in self.schema and table in self.table_names]
+
+    def install_triggers(self):
+        """Create the change queue and (re)create every table's triggers; returns the trigger count"""
+        cursor = self.connection.cursor()
+        count = 0
+        try:
+            cursor.execute(CHANGES_DDL)
+            for table in self.synced_tables():
+                for statement in trigger_statements(table, self.table_names[table],
+                                                    self.schema[table]["primary_key"]):
+                    cursor.execute(statement)
+                    count += statement.startswith("CREATE")
+            self.connection.commit()
+        finally:
+            cursor.close()
+        return count
+
+    def next_changes(self, after, high):
+        """The next BATCH_SIZE queued changes with after < change_id <= high"""
+        cursor = self.connection.cursor()
+        try:
+            cursor.execute(f"SELECT change_id, table_name, key_1, key_2 FROM {CHANGES_TABLE} "
+                           f"WHERE change_id > %s AND change_id <= %s ORDER BY change_id LIMIT {BATCH_SIZE}",
+                           (after, high))
+            return cursor.fetchall()
+        finally:
+            cursor.close()
+
+    def apply_keys(self, table, keys):
+        """Upsert the rows behind the changed keys and delete the documents whose
+        row is gone; returns (upserted, deleted)"""
+        primary_key = self.schema[table]["primary_key"]
+        keys = sorted(keys)
+        if len(primary_key) == 1:
+            condition = f"{quote(primary_key[0])} IN ({', '.join(['%s'] * len(keys))})"
+            params = [key[0] for key in keys]
+        else:
+            row = "(" + ", ".join(["%s"] * len(primary_key)) + ")"
+            condition = (f"({', '.join(quote(column) for column in primary_key)}) "
+                         f"IN ({', '.join([row] * len(keys))})")
+            params = [value for key in keys for value in key]
+
+        written = 0
+        found = set()
+        for batch in iter_row_batches(self.connection, f"SELECT * FROM {self.table_names[table]} WHERE {condition}",
+                                      params):
+            written += self.upsert(table, batch)
+            found.update(tuple(row[column] for column in primary_key) for row in batch)
+        gone = [key for key in keys if key not in found]
+        if gone and not self.dry_run:
+            self.db[TABLE_MAPPING[table]].bulk_write(
+                [DeleteOne(dict(zip(primary_key, key))) for key in gone], ordered=False)
+        return written, len(gone)
+
+    def sync_changes(self):
+        """Apply every change queued when the sync started; returns {table: (upserted, deleted)}.
+
+        Applied changes are deleted by change_id, so a change that commits
+        late with a lower id than one already applied stays queued for the
+        next run rather than being skipped.
+        """
+        cursor = self.connection.cursor()
+        try:
+            cursor.execute(f"SELECT MAX(change_id) FROM {CHANGES_TABLE}")
+            high = cursor.fetchone()[0]
+        finally:
+            cursor.close()
+        report = {table: (0, 0) for table in self.synced_tables()}
+        after = 0
+        while high is not None:
+            changes = self.next_changes(after, high)
+            if not changes:
+                break
+            after = changes[-1][0]
+            keys = {}
+            for _, table, key_1, key_2 in changes:
+                if table in report:
+                    keys.setdefault(table, set()).add((key_1, key_2)[:len(self.schema[table]["primary_key"])])
+            # Parents first, so their documents exist when children look them up
+            for table in report:
+                if table in keys:
+                    written, deleted = self.apply_keys(table, keys[table])
+                    report[table] = (report[table][0] + written, report[table][1] + deleted)
+            if not self.dry_run:
+                cursor = self.connection.cursor()
+                try:
+                    ids = [change[0] for change in changes]
+                    cursor.execute(f"DELETE FROM {CHANGES_TABLE} WHERE change_id IN ({', '.join(['%s'] * len(ids))})",
+                                   ids)
+                finally:
+                    cursor.close()
+            # A fresh snapshot for the next batch
+            self.connection.commit()
+        return report
+
+    def sync_changed_ranges(self, table, state):
+        """Re-read every key range whose checksum moved since the last sync.
+        Returns (rows upserted, documents deleted, new checksums)."""
+        primary_key = self.schema[table]["primary_key"]
+        lead_column = primary_key[0]
+        mysql_table = self.table_names[table]
+        columns = table_columns(self.connection, mysql_table)
+        checksums = range_checksums(self.connection, mysql_table, columns, lead_column)
+        previous = state.get("checksums", {})
+        changed = sorted({range_no for range_no in checksums.keys() | previous.keys()
+                          if checksums.get(range_no) != previous.get(range_no)}, key=int)
+
+        collection = self.db[TABLE_MAPPING[table]]
+        written = deleted = 0
+        for range_no in changed:
+            low = int(range_no) * CHECKSUM_RANGE
+            high = low + CHECKSUM_RANGE
+            keys = set()
+            for batch in iter_row_batches(self.connection,
+                                          f"SELECT * FROM {mysql_table} WHERE {quote(lead_column)} >= %s "
+                                          f"AND {quote(lead_column)} < %s", (low, high)):
+                written += self.upsert(table, batch)
+                keys.update(tuple(row[column] for column in primary_key) for row in batch)
+            # Documents in the range whose row is gone were deleted in MySQL
+            stale = [doc["_id"] for doc in collection.find({lead_column: {"$gte": low, "$lt": high}},
+                                                           {column: 1 for column in primary_key})
+                     if tuple(doc.get(column) for column in primary_key) not in keys]
+            if stale and not self.dry_run:
+                collection.delete_many({"_id": {"$in": stale}})
+            deleted += len(stale)
+        return written, deleted, checksums
+
+    def resolve_pending(self):
+        """Fill references whose parent arrived later in the same sync"""
+        resolved = 0
+        for collection, key_filter, ref_field, ref_table, key in self.unresolved:
+            ref_key = self.schema[ref_table]["primary_key"][0]
+            parent = self.db[TABLE_MAPPING[ref_table]].find_one({ref_key: key}, {"_id": 1})
+            if parent and not self.dry_run:
+                self.db[collection].update_one(key_filter, {"$set": {ref_field: parent["_id"]}})
+            resolved += bool(parent)
+        self.unresolved = []
+        return resolved
+
+    def check_key_fields(self):
+        """Refuse collections whose documents lack their SQL primary key: every
+        upsert would insert a duplicate and no delete would find its document.
+        Collections exported before fitness_json.py kept the keys need re-exporting."""
+        missing = []
+        for table in self.synced_tables():
+            # Matches documents without the field; served by the primary key index
+            if self.db[TABLE_MAPPING[table]].find_one({self.schema[table]["primary_key"][0]: None}, {"_id": 1}):
+                missing.append(TABLE_MAPPING[table])
+        if missing:
+            raise ValueError(f"documents without their primary key field in {', '.join(missing)}; "
+                             "re-export them with fitness_json.py before syncing")
+
+    def sync(self, reconcile=False):
+        """Sync every table; returns {table: (upserted, deleted)}"""
+        if not self.dry_run:
+            for table in self.synced_tables():
+                self.db[TABLE_MAPPING[table]].create_index(
+                    [(column, 1) for column in self.schema[table]["primary_key"]])
+        self.check_key_fields()
+        report = self.sync_changes()
+
+        states = self.db[STATE_COLLECTION]
+        for table in self.synced_tables():
+            update = {"synced_at": datetime.now()}
+            if reconcile:
+                written, deleted, update["checksums"] = self.sync_changed_ranges(
+                    table, states.find_one({"_id": table}) or {})
+                report[table] = (report[table][0] + written, report[table][1] + deleted)
+            if not self.dry_run:
+                states.update_one({"_id": table}, {"$set": update}, upsert=True)
+        self.resolve_pending()
+        return report
+
+# ============================================
+# MAIN EXECUTION
+# ============================================
+if __name__ == "__main__":
+    import argparse
+    import sys
+
+    arg_parser = argparse.ArgumentParser(description="Upsert rows changed since the last sync into MongoDB")
+    arg_parser.add_argument("--uri", default="mongodb://localhost:27017",
+                            help="MongoDB connection URI (mongomock:// for an in-process test database)")
+    arg_parser.add_argument("--database", default="fitness_db", help="MongoDB database name")
+    arg_parser.add_argument("--schema", default=SCHEMA_FILE,
+                            help="DDL file with the CREATE TABLE primary and foreign keys (default: fitness.sql)")
+    arg_parser.add_argument("--setup", action="store_true",
+                            help="Create the Sync_Changes queue and the change triggers first (re-runnable); "
+                                 "do this before the fitness_json.py export the sync continues from")
+    arg_parser.add_argument("--reconcile", action="store_true",
+                            help="Also compare whole-table key range checksums to catch changes the triggers "
+                                 "miss, such as foreign key cascades (reads every row; run occasionally)")
+    arg_parser.add_argument("--stable-ids", action="store_true",
+                            help="Give new documents table+key derived _ids (for collections "
+                                 "loaded with fitness_json.py --stable-ids)")
+    arg_parser.add_argument("--dry-run", action="store_true", help="Count the changes without writing them")
+    args = arg_parser.parse_args()
+
+    print("=" * 70)
+    print(f"MYSQL TO MONGODB SYNC: {MYSQL_CONFIG['database']} -> {args.database}")
+    print("=" * 70)
+
+    start = time.perf_counter()
+    try:
+        connection = mysql.connector.connect(**MYSQL_CONFIG)
+    except mysql.connector.Error as e:
+        print(f"❌ Error connecting to MySQL: {e}")
+        sys.exit(1)
+    try:
+        syncer = MongoSync(connection, connect_mongodb(args.uri)[args.database], args.schema, args.dry_run,
+                           args.stable_ids)
+        if args.setup:
+            print(f"✅ Installed {syncer.install_triggers()} change triggers")
+        report = syncer.sync(args.reconcile)
+    except ValueError as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+    finally:
+        connection.close()
+
+    for table, (written, deleted) in report.items():
+        if written or deleted:
+            print(f"✅ {TABLE_MAPPING[table]}: {written} upserted, {deleted} deleted")
+    total = sum(written + deleted for written, deleted in report.values())
+    action = "would change" if args.dry_run else "changed"
+    print(f"\n✅ {total} documents {action} in {time.perf_counter() - start:.2f}s")